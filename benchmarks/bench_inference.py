@@ -0,0 +1,81 @@
+"""
+Microbenchmark for single-row inference latency.
+
+Compares the reference DataFrame path (predict + predict_proba) against the
+fused NumPy fast path of HeartDiseaseInference.predict_single, on both the
+sklearn and the compiled forest backends.
+
+Usage:
+    python benchmarks/bench_inference.py [--model-uri URI] [--iterations N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from config import config  # noqa: E402
+from inference_pipeline import HeartDiseaseInference  # noqa: E402
+
+SAMPLE = {
+    "age": 54.0, "sex": 1.0, "cp": 0.0, "trestbps": 130.0, "chol": 246.0,
+    "fbs": 0.0, "restecg": 1.0, "thalach": 150.0, "exang": 0.0,
+    "oldpeak": 1.2, "slope": 2.0, "ca": 0.0, "thal": 2.0
+}
+
+
+def time_calls(fn, iterations, warmup=20):
+    """Returns per-call latencies in microseconds."""
+    for _ in range(warmup):
+        fn(SAMPLE)
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(SAMPLE)
+        timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def summarize(name, timings):
+    timings = sorted(timings)
+    p50 = statistics.median(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"{name:<28} mean={statistics.fmean(timings):9.1f}us  p50={p50:9.1f}us  p99={p99:9.1f}us")
+    return p50
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-uri", default=None,
+                        help="Model to load (default: production model dir, else latest mlruns model)")
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    model_uri = args.model_uri
+    if model_uri is None and os.path.exists(config.PRODUCTION_MODEL_DIR):
+        model_uri = config.PRODUCTION_MODEL_DIR
+
+    engine = HeartDiseaseInference(model_uri=model_uri, backend="sklearn")
+    if not engine.fast_path:
+        print("Fast path is not available for this model; nothing to compare.")
+        return
+
+    reference = engine._predict_single_frame(SAMPLE)
+    fast = engine.predict_single(SAMPLE)
+    assert reference["prediction"] == fast["prediction"]
+    assert abs(reference["confidence"] - fast["confidence"]) < 1e-12
+
+    print(f"Single-row latency over {args.iterations} calls")
+    baseline = summarize("DataFrame (predict+proba)", time_calls(engine._predict_single_frame, args.iterations))
+    fused = summarize("NumPy fused fast path", time_calls(engine.predict_single, args.iterations))
+    print(f"Speedup (p50): {baseline / fused:.2f}x")
+
+    compiled_engine = HeartDiseaseInference(model_uri=model_uri, backend="compiled")
+    if compiled_engine.backend == "compiled":
+        compiled = summarize("Compiled forest backend", time_calls(compiled_engine.predict_single, args.iterations))
+        print(f"Speedup vs DataFrame (p50): {baseline / compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Shared helpers for the benchmark scripts: latency summaries and the JSON
+result format read by compare.py.
+
+A result file looks like:
+    {
+      "suite": "microbench",
+      "metadata": {"timestamp": ..., "git_commit": ..., "python": ..., "platform": ..., "cpus": ...},
+      "results": {"predict_single": {"unit": "ms", "n": 500, "mean": ..., "p50": ..., "p95": ..., "p99": ...}}
+    }
+"""
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+SAMPLE = {
+    "age": 54.0, "sex": 1.0, "cp": 0.0, "trestbps": 130.0, "chol": 246.0,
+    "fbs": 0.0, "restecg": 1.0, "thalach": 150.0, "exang": 0.0,
+    "oldpeak": 1.2, "slope": 2.0, "ca": 0.0, "thal": 2.0
+}
+
+# Metrics where a larger value is an improvement; everything else is a latency
+HIGHER_IS_BETTER = {"throughput_rps"}
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, int(round(q / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(timings, unit="ms"):
+    """Summary statistics of per-call timings given in seconds."""
+    scale = {"s": 1.0, "ms": 1e3, "us": 1e6}[unit]
+    values = sorted(t * scale for t in timings)
+    return {
+        "unit": unit,
+        "n": len(values),
+        "mean": statistics.fmean(values) if values else float("nan"),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+    }
+
+
+def describe(name, summary):
+    unit = summary["unit"]
+    line = (f"{name:<24} n={summary['n']:<6} mean={summary['mean']:10.3f}{unit}  "
+            f"p50={summary['p50']:10.3f}{unit}  p95={summary['p95']:10.3f}{unit}  p99={summary['p99']:10.3f}{unit}")
+    if "throughput_rps" in summary:
+        line += f"  {summary['throughput_rps']:10.1f} req/s"
+    print(line)
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(path, suite, results, **extra_metadata):
+    """Writes results with enough metadata to tell whether two runs are comparable."""
+    payload = {
+        "suite": suite,
+        "metadata": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            **extra_metadata,
+        },
+        "results": results,
+    }
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(f"Results written to {path}")
@@ -0,0 +1,84 @@
+"""
+Compares a benchmark result file against a stored baseline and flags
+regressions larger than a relative threshold.
+
+Latency metrics regress when they grow; throughput_rps regresses when it
+drops. Exits with status 1 if any metric regressed, so it can gate CI.
+
+Usage:
+    python benchmarks/compare.py benchmarks/baselines/microbench.json current.json [--threshold 0.10]
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from bench_utils import HIGHER_IS_BETTER  # noqa: E402
+
+DEFAULT_METRICS = ["p50", "p95", "p99", "throughput_rps"]
+
+
+def compare(baseline, current, threshold=0.10, metrics=None):
+    """
+    Returns one row per (case, metric) present in both result sets:
+    (case, metric, baseline value, current value, relative change, regressed).
+    A positive relative change is always a slowdown.
+    """
+    metrics = metrics or DEFAULT_METRICS
+    rows = []
+    for case, base in baseline["results"].items():
+        cur = current["results"].get(case)
+        if cur is None:
+            continue
+        for metric in metrics:
+            if metric not in base or metric not in cur or not base[metric]:
+                continue
+            if metric in HIGHER_IS_BETTER:
+                change = (base[metric] - cur[metric]) / base[metric]
+            else:
+                change = (cur[metric] - base[metric]) / base[metric]
+            rows.append((case, metric, base[metric], cur[metric], change, change > threshold))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown tolerated before flagging (0.10 = 10%%)")
+    parser.add_argument("--metrics", default=",".join(DEFAULT_METRICS))
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    if baseline.get("suite") != current.get("suite"):
+        parser.error(f"Cannot compare suite '{baseline.get('suite')}' with '{current.get('suite')}'")
+    for key in ("cpus", "platform", "python"):
+        if baseline["metadata"].get(key) != current["metadata"].get(key):
+            print(f"Warning: {key} differs ({baseline['metadata'].get(key)} vs {current['metadata'].get(key)}); "
+                  "results may not be comparable")
+
+    missing = sorted(set(baseline["results"]) - set(current["results"]))
+    if missing:
+        print(f"Warning: not in current results: {', '.join(missing)}")
+
+    rows = compare(baseline, current, args.threshold, args.metrics.split(","))
+    print(f"{'case':<24} {'metric':<15} {'baseline':>12} {'current':>12} {'change':>9}")
+    for case, metric, base, cur, change, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{case:<24} {metric:<15} {base:12.3f} {cur:12.3f} {change:+9.1%}{flag}")
+
+    regressions = [row for row in rows if row[5]]
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Load generator that replays recorded API requests at a fixed concurrency and
+reports throughput and latency percentiles per endpoint.
+
+Each line of the replay file is a JSON object {"path": "/predict", "body": {...}};
+a line without "body" is taken as a /predict body. Requests are replayed in
+order and the file wraps around until --requests have been sent (or
+--duration seconds have passed).
+
+By default the app is driven in-process through its ASGI interface, with the
+normal startup (model load and warm-up) run first. Pass --url to load-test a
+running server instead.
+
+Usage:
+    python benchmarks/loadtest.py [--requests-file benchmarks/requests.jsonl]
+                                  [--concurrency 16] [--requests 2000] [--url http://localhost:8000]
+                                  [--save benchmarks/results/loadtest.json]
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from bench_utils import describe, save_results, summarize  # noqa: E402
+
+import httpx  # noqa: E402
+
+DEFAULT_REQUESTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "requests.jsonl")
+
+
+def load_requests(path):
+    requests = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if "body" in entry:
+                requests.append((entry.get("path", "/predict"), entry["body"]))
+            else:
+                requests.append(("/predict", entry))
+    if not requests:
+        raise ValueError(f"No requests found in {path}")
+    return requests
+
+
+async def replay(client, requests, concurrency, total, duration=None):
+    """
+    Sends requests from concurrency workers. Returns per-path latencies (s),
+    per-path error counts and the elapsed wall time.
+    """
+    counter = itertools.count()
+    deadline = time.perf_counter() + duration if duration else None
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+
+    async def worker():
+        while True:
+            i = next(counter)
+            if i >= total or (deadline and time.perf_counter() >= deadline):
+                return
+            path, body = requests[i % len(requests)]
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=body)
+                ok = response.status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            latencies[path].append(time.perf_counter() - start)
+            if not ok:
+                errors[path] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def build_results(latencies, errors, elapsed):
+    results = {}
+    everything = []
+    for path, timings in sorted(latencies.items()):
+        everything.extend(timings)
+        results[path] = {
+            **summarize(timings, unit="ms"),
+            "throughput_rps": len(timings) / elapsed,
+            "errors": errors.get(path, 0),
+        }
+    results["overall"] = {
+        **summarize(everything, unit="ms"),
+        "throughput_rps": len(everything) / elapsed,
+        "errors": sum(errors.values()),
+    }
+    return results
+
+
+@contextlib.asynccontextmanager
+async def make_client(url):
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=30.0) as client:
+            yield client
+        return
+
+    from app import app
+    # Run the app's own startup/shutdown so the model is loaded and warmed up
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=30.0) as client:
+            yield client
+
+
+async def run(args):
+    requests = load_requests(args.requests_file)
+    async with make_client(args.url) as client:
+        if args.warmup:
+            await replay(client, requests, args.concurrency, args.warmup)
+        latencies, errors, elapsed = await replay(
+            client, requests, args.concurrency, args.requests, args.duration
+        )
+    return build_results(latencies, errors, elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests-file", default=DEFAULT_REQUESTS_FILE)
+    parser.add_argument("--url", default=None, help="Base URL of a running API (default: in-process)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000, help="Measured requests to send")
+    parser.add_argument("--duration", type=float, default=None, help="Stop after this many seconds")
+    parser.add_argument("--warmup", type=int, default=100, help="Unmeasured requests sent first")
+    parser.add_argument("--save", default=None, help="Write results as a JSON baseline to this path")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"\nConcurrency {args.concurrency} against {args.url or 'in-process app'}")
+    for name, summary in results.items():
+        describe(name, summary)
+        if summary["errors"]:
+            print(f"{'':<24} errors={summary['errors']}")
+
+    if args.save:
+        save_results(args.save, "loadtest", results, concurrency=args.concurrency,
+                     target=args.url or "in-process", requests_file=os.path.basename(args.requests_file))
+
+
+if __name__ == "__main__":
+    main()
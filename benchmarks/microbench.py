@@ -0,0 +1,113 @@
+"""
+Microbenchmarks for the hot spots of training and serving.
+
+Cases:
+    predict_single   HeartDiseaseInference.predict_single, one row
+    predict_batch    HeartDiseaseInference.predict_batch, --batch-size rows
+    clean_dataset    preprocessing.clean_dataset on the dataset replicated to --rows rows
+    model_load       HeartDiseaseInference construction (MLflow load + setup)
+    train_models     train.train_models, full training incl. grid search (slow)
+
+Usage:
+    python benchmarks/microbench.py [--only predict_single,predict_batch] [--skip train_models]
+                                    [--save benchmarks/results/microbench.json]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from bench_utils import SAMPLE, describe, save_results, summarize  # noqa: E402
+
+import pandas as pd  # noqa: E402
+
+from config import config  # noqa: E402
+from inference_pipeline import HeartDiseaseInference  # noqa: E402
+from preprocessing import clean_dataset  # noqa: E402
+
+CASES = ["predict_single", "predict_batch", "clean_dataset", "model_load", "train_models"]
+
+
+def time_calls(fn, iterations, warmup=0, setup=None):
+    """Per-call wall times in seconds; setup() output (if any) is passed to fn and not timed."""
+    timings = []
+    for i in range(warmup + iterations):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        fn(*args)
+        if i >= warmup:
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def resolve_model_uri(model_uri):
+    if model_uri is None and os.path.exists(config.PRODUCTION_MODEL_DIR):
+        return config.PRODUCTION_MODEL_DIR
+    return model_uri  # None lets HeartDiseaseInference discover the latest model
+
+
+def run(cases, args):
+    model_uri = resolve_model_uri(args.model_uri)
+    results = {}
+    engine = None
+    if {"predict_single", "predict_batch"} & set(cases):
+        engine = HeartDiseaseInference(model_uri=model_uri)
+
+    if "predict_single" in cases:
+        timings = time_calls(lambda: engine.predict_single(SAMPLE), args.iterations, warmup=20)
+        results["predict_single"] = summarize(timings, unit="us")
+
+    if "predict_batch" in cases:
+        records = [dict(SAMPLE) for _ in range(args.batch_size)]
+        timings = time_calls(lambda: engine.predict_batch(records), max(args.iterations // 10, 10), warmup=3)
+        results["predict_batch"] = summarize(timings, unit="ms")
+
+    if "clean_dataset" in cases:
+        raw = pd.read_csv(config.CSV_PATH, header=None)
+        raw = pd.concat([raw] * (args.rows // len(raw) + 1), ignore_index=True).head(args.rows)
+        timings = time_calls(lambda: clean_dataset(raw), 10, warmup=1)
+        results["clean_dataset"] = summarize(timings, unit="ms")
+
+    if "model_load" in cases:
+        timings = time_calls(lambda: HeartDiseaseInference(model_uri=model_uri), 5, warmup=1)
+        results["model_load"] = summarize(timings, unit="ms")
+
+    if "train_models" in cases:
+        from train import train_models
+        timings = time_calls(train_models, args.train_iterations)
+        results["train_models"] = summarize(timings, unit="s")
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-uri", default=None,
+                        help="Model to load (default: production model dir, else latest mlruns model)")
+    parser.add_argument("--only", default=",".join(CASES), help="Comma-separated cases to run")
+    parser.add_argument("--skip", default="", help="Comma-separated cases to leave out")
+    parser.add_argument("--iterations", type=int, default=500, help="Calls for predict_single")
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--rows", type=int, default=10000, help="Rows fed to clean_dataset")
+    parser.add_argument("--train-iterations", type=int, default=1)
+    parser.add_argument("--save", default=None, help="Write results as a JSON baseline to this path")
+    args = parser.parse_args()
+
+    skip = set(filter(None, args.skip.split(",")))
+    cases = [c for c in filter(None, args.only.split(",")) if c not in skip]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"Unknown cases: {', '.join(sorted(unknown))} (choose from {', '.join(CASES)})")
+
+    results = run(cases, args)
+    print()
+    for name, summary in results.items():
+        describe(name, summary)
+
+    if args.save:
+        save_results(args.save, "microbench", results, batch_size=args.batch_size, rows=args.rows)
+
+
+if __name__ == "__main__":
+    main()
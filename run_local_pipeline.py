@@ -2,41 +2,127 @@
 """
 Cross-platform pipeline runner for Heart Disease MLOps project.
 Works on Windows, Linux, and Mac.
+
+Stages run in this process as a dependency graph (see src/pipeline_dag.py):
+stages whose inputs are unchanged since their last successful run are skipped,
+and independent stages (training, experiment tracking, packaging) run in
+parallel. Per-stage wall times are printed at the end and kept in
+.pipeline_state.json.
+
+Usage:
+    python run_local_pipeline.py [--force] [--jobs N] [--skip-tests]
 """
+import argparse
+import logging
+import os
 import subprocess
 import sys
 
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+os.chdir(PROJECT_ROOT)
+sys.path.insert(0, os.path.join(PROJECT_ROOT, "src"))
+# Stages may plot from worker threads; never pick an interactive backend
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from config import config  # noqa: E402
+from pipeline_dag import Stage, StageFailedError, run_pipeline  # noqa: E402
+
+STATE_PATH = os.path.join(PROJECT_ROOT, ".pipeline_state.json")
+
+
+def src(*names):
+    return [os.path.join("src", name) for name in names]
+
+
+def acquire_data():
+    from data_acquisition import download_dataset
+    download_dataset()
+
+
+def preprocess():
+    from dataset_cache import load_training_data
+    X, y, _ = load_training_data()
+    print(f"Cleaned dataset: {X.shape[0]} rows, {X.shape[1]} features")
+
+
+def train():
+    from train import train_models
+    train_models()
 
-def run_step(step_num, total_steps, description, command):
-    """Run a pipeline step and handle errors."""
-    print(f"\n[{step_num}/{total_steps}] {description}...")
-    result = subprocess.run(command, shell=True)
+
+def track_experiment():
+    from experiment_tracking import run_experiment
+    run_experiment()
+
+
+def package_model():
+    from model_packaging import save_final_model
+    save_final_model()
+
+
+def unit_tests():
+    # Separate interpreter: tests patch modules and need a clean import state
+    result = subprocess.run([sys.executable, "-m", "pytest", "tests/"])
     if result.returncode != 0:
-        print(f"\nError: {description} failed with exit code {result.returncode}")
-        sys.exit(result.returncode)
+        raise RuntimeError(f"pytest exited with code {result.returncode}")
+
+
+def build_stages(skip_tests=False):
+    training_code = src("config.py", "preprocessing.py", "dataset_cache.py", "model_utils.py")
+    stages = [
+        Stage("data_acquisition", acquire_data,
+              inputs=src("data_acquisition.py", "config.py"),
+              outputs=[config.CSV_PATH]),
+        Stage("preprocessing", preprocess,
+              inputs=[config.CSV_PATH] + src("config.py", "preprocessing.py", "dataset_cache.py"),
+              deps=["data_acquisition"]),
+        Stage("train", train,
+              inputs=[config.CSV_PATH] + training_code + src("train.py"),
+              deps=["preprocessing"]),
+        Stage("experiment_tracking", track_experiment,
+              inputs=[config.CSV_PATH] + training_code + src("experiment_tracking.py", "model_registry.py",
+                                                             "drift_monitor.py"),
+              outputs=[config.MLRUNS_DIR],
+              deps=["preprocessing"]),
+        Stage("model_packaging", package_model,
+              inputs=[config.CSV_PATH] + training_code + src("model_packaging.py", "model_registry.py",
+                                                             "model_compression.py", "forest_compiler.py",
+                                                             "drift_monitor.py"),
+              outputs=[config.PRODUCTION_MODEL_DIR],
+              deps=["preprocessing"]),
+    ]
+    if not skip_tests:
+        stages.append(Stage("unit_tests", unit_tests,
+                            inputs=["src", "tests"],
+                            deps=["train", "experiment_tracking", "model_packaging"]))
+    return stages
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--force", action="store_true", help="Rerun every stage even if its inputs are unchanged")
+    parser.add_argument("--jobs", type=int, default=None, help="Stages run at the same time (default: all ready)")
+    parser.add_argument("--skip-tests", action="store_true", help="Leave out the unit test stage")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
     print("=" * 50)
     print("Starting Local Heart Disease MLOps Pipeline")
     print("=" * 50)
 
-    steps = [
-        (1, 6, "Running Data Acquisition", "python src/data_acquisition.py"),
-        (2, 6, "Running Preprocessing", "python src/preprocessing.py"),
-        (3, 6, "Running Model Training", "python src/train.py"),
-        (4, 6, "Running Experiment Tracking (MLflow)", "python src/experiment_tracking.py"),
-        (5, 6, "Running Model Packaging", "python src/model_packaging.py"),
-        (6, 6, "Running Unit Tests", "python -m pytest tests/"),
-    ]
-
-    for step in steps:
-        run_step(*step)
+    try:
+        results = run_pipeline(build_stages(args.skip_tests), STATE_PATH, max_workers=args.jobs, force=args.force)
+    except StageFailedError as e:
+        print(f"\nError: {e}")
+        sys.exit(1)
 
     print("\n" + "=" * 50)
     print("Pipeline Completed Successfully!")
     print("=" * 50)
-    print("To view MLflow results, run: mlflow ui")
+    print(f"{'Stage':<22}{'Status':<10}{'Seconds':>10}")
+    for name, result in results.items():
+        print(f"{name:<22}{result['status']:<10}{result['seconds']:>10.2f}")
+    print("\nTo view MLflow results, run: mlflow ui")
     print("To run the API locally, run: uvicorn src.app:app --reload")
 
 
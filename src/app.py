@@ -1,14 +1,48 @@
-from fastapi import FastAPI, Request
-from pydantic import BaseModel
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from typing import Any, Dict, List, Optional
+import hmac
+import json
 import logging
-import os
+import time
+import numpy as np
 from prometheus_client import Counter, generate_latest
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 
 from config import config
-from inference_pipeline import HeartDiseaseInference
-from experiment_tracking import run_experiment
+from model_manager import ModelManager, ReloadInProgressError, allowed_model_uri
+from batching import MicroBatcher, QueueFullError
+from prediction_cache import PredictionCache
+from audit_log import AuditLog
+from drift_monitor import DriftMonitor, ReferenceProfile
+from streaming import FullDuplexStreamingResponse, iter_lines
+from wire_formats import (
+    COLUMNAR_JSON,
+    COMPACT_TYPES,
+    FLOAT32_MATRIX,
+    JSON,
+    RESPONSE_TYPES,
+    WireFormatError,
+    columns_to_results,
+    decode,
+    encode,
+    media_type,
+    negotiate,
+    results_to_columns,
+)
+from metrics import (
+    BATCH_SIZE,
+    INFERENCE_STAGE,
+    PREDICTION_ERRORS,
+    PrometheusMiddleware,
+    SERIALIZATION_STAGE,
+    VALIDATION_STAGE,
+    metrics_registry,
+)
 
 # --------------------------
 # Logging Setup
@@ -27,13 +61,40 @@ REQUEST_COUNT = Counter(
     "Total API Requests Count"
 )
 
+
 # --------------------------
 # FastAPI App
 # --------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if model_manager.phase != "starting":
+        pass  # Loaded (or being loaded) by serve.py before the workers were forked
+    elif config.STARTUP_MODE == "background":
+        model_manager.start_background_load()
+    else:
+        await run_in_threadpool(model_manager.load)
+    if config.MODEL_WATCH_PATH:
+        model_manager.start_watching(config.MODEL_WATCH_PATH, config.MODEL_WATCH_INTERVAL_SECONDS)
+    if config.MODEL_SYNC_FILE:
+        model_manager.start_following(config.MODEL_SYNC_FILE, config.MODEL_SYNC_INTERVAL_SECONDS)
+    if audit_log is not None:
+        audit_log.start()
+    if drift_monitor is not None:
+        drift_monitor.start()
+    yield
+    model_manager.stop_watching()
+    if audit_log is not None:
+        audit_log.close()
+    if drift_monitor is not None:
+        drift_monitor.close()
+    await micro_batcher.stop()
+
+
 app = FastAPI(
     title=config.API_TITLE,
     description=config.API_DESCRIPTION,
-    version=config.API_VERSION
+    version=config.API_VERSION,
+    lifespan=lifespan
 )
 
 # --------------------------
@@ -47,81 +108,154 @@ app.add_middleware(
     allow_headers=config.CORS_ALLOW_HEADERS,
 )
 
+# --------------------------
+# Latency / In-flight Middleware
+# --------------------------
+app.add_middleware(PrometheusMiddleware)
+
 
 # --------------------------
-# MLflow model loader
+# Model lifecycle
 # --------------------------
-# Determine the absolute path to the project root (one level up from src/)
-current_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(current_dir)
+# Importing this module has no side effects: the model is resolved, loaded and
+# warmed up at startup, before serving ("eager") or on a background thread
+# ("background", never trains).
+model_manager = ModelManager(allow_training=config.STARTUP_MODE == "eager")
 
-import mlflow
 
-# Path to the models directory for the specific experiment
-# Dynamically resolve experiment ID by name
-experiment_name = config.EXPERIMENT_NAME
-mlflow.set_tracking_uri(config.MLFLOW_TRACKING_URI)
-experiment = mlflow.get_experiment_by_name(experiment_name)
+def get_engine():
+    """Returns the serving inference engine, or 503 while the model is not ready."""
+    engine = model_manager.engine
+    if engine is None:
+        raise HTTPException(status_code=503, detail=f"Model not ready ({model_manager.phase})")
+    return engine
 
-if experiment:
-    experiment_id = experiment.experiment_id
-    models_dir = os.path.join(project_root, "mlruns", experiment_id, "models")
-else:
-    # If experiment doesn't exist, we can't find models, so we'll treat it as empty
-    experiment_id = None
-    models_dir = ""
 
-def get_latest_model_uri():
+def current_model_version():
+    engine = model_manager.engine
+    return engine.model_version if engine is not None else "none"
+
+
+def count_error(stage, model_version=None):
+    PREDICTION_ERRORS.labels(model_version=model_version or current_model_version(), stage=stage).inc()
+
+
+def response_type_for(request: Request):
+    """Media type negotiated from the Accept header, or 406."""
+    response_type = negotiate(request.headers.get("accept"))
+    if response_type is None:
+        raise HTTPException(status_code=406, detail=f"Supported response types: {', '.join(RESPONSE_TYPES)}")
+    return response_type
+
+
+def render_columns(response_type, preds, probs, errors, single=False):
     """
-    Finds the latest model artifact in the specified directory.
+    Renders predictions in the negotiated format. Rendering happens here
+    (not in FastAPI) so serialization time is measured.
     """
-    try:
-        # Check if the directory exists
-        if not os.path.exists(models_dir):
-            logger.error(f"Models directory not found: {models_dir}")
-            return None
-
-        # Get all subdirectories in the models folder
-        subdirs = [os.path.join(models_dir, d) for d in os.listdir(models_dir) 
-                   if os.path.isdir(os.path.join(models_dir, d))]
-        
-        if not subdirs:
-            logger.error(f"No model directories found in {models_dir}")
-            return None
-
-        # Sort by modification time (latest first)
-        latest_model_dir = max(subdirs, key=os.path.getmtime)
-        
-        # Construct path to artifacts
-        artifact_path = os.path.join(latest_model_dir, "artifacts")
-        
-        if os.name == 'nt':
-            artifact_path = artifact_path.replace("\\", "/")
-            
-        return f"file:///{artifact_path}"
+    start = time.perf_counter()
+    if response_type == JSON:
+        results = columns_to_results(preds, probs, errors)
+        response = JSONResponse(results[0] if single else {"predictions": results})
+    else:
+        response = Response(encode(response_type, preds, probs, errors), media_type=response_type)
+    SERIALIZATION_STAGE.observe(time.perf_counter() - start)
+    return response
+
+
+def render(response_type, results, single=False):
+    """render_columns for per-row result dicts."""
+    if response_type == JSON:
+        start = time.perf_counter()
+        response = JSONResponse(results[0] if single else {"predictions": results})
+        SERIALIZATION_STAGE.observe(time.perf_counter() - start)
+        return response
+    return render_columns(response_type, *results_to_columns(results), single=single)
+
+
+def score_matrix(engine, X):
+    """
+    Scores a decoded compact body; rows with missing or non-finite values, or
+    categorical codes the model's encoding never produces, get an error.
+    """
+    start = time.perf_counter()
+    finite = np.isfinite(X).all(axis=1)
+    preds = np.full(len(X), np.nan)
+    probs = np.full(len(X), np.nan)
+    errors = [None if ok else "Missing or non-finite feature value" for ok in finite.tolist()]
+    for i, error in enumerate(engine.check_codes(X)):
+        if error is not None and errors[i] is None:
+            errors[i] = error
+    valid = np.array([error is None for error in errors], dtype=bool)
+    if valid.any():
+        preds[valid], probs[valid] = engine.predict_matrix(X[valid])
+    INFERENCE_STAGE.observe(time.perf_counter() - start)
+    return preds, probs, errors
 
-    except Exception as e:
-        logger.error(f"Error finding latest model: {e}")
-        return None
 
-# Get dynamic model URI
-dynamic_model_uri = get_latest_model_uri()
+# Repeated payloads are answered from cache; entries are tied to the model version
+prediction_cache = (
+    PredictionCache(config.PREDICTION_CACHE_SIZE, config.PREDICTION_CACHE_TTL_SECONDS)
+    if config.PREDICTION_CACHE_SIZE > 0 else None
+)
+
+
+# Predictions are audited write-behind: handlers only append to a ring buffer
+audit_log = AuditLog(
+    config.AUDIT_LOG_DIR,
+    buffer_size=config.AUDIT_LOG_BUFFER_SIZE,
+    sample_rate=config.AUDIT_LOG_SAMPLE_RATE,
+    flush_interval=config.AUDIT_LOG_FLUSH_INTERVAL_SECONDS,
+    max_bytes=config.AUDIT_LOG_MAX_BYTES,
+    backup_count=config.AUDIT_LOG_BACKUP_COUNT
+) if config.AUDIT_LOG_ENABLED else None
+
 
-if not dynamic_model_uri:
-    logger.info("No model found. Starting auto-train pipeline...")
-    # This expects run_experiment to return the model_uri or we find it again
-    # We rely on run_experiment returning the model URI now.
-    dynamic_model_uri = run_experiment()
-    logger.info(f"Auto-training completed. New Model URI: {dynamic_model_uri}")
+def serving_drift_profile():
+    profile = getattr(model_manager.engine, "drift_profile", None)
+    return profile if isinstance(profile, ReferenceProfile) else None
 
-# Fallback or Environment Override
-MODEL_URI = os.getenv("MLFLOW_MODEL_URI", dynamic_model_uri)
 
-if not MODEL_URI:
-    raise RuntimeError("Could not determine MODEL_URI. Please set MLFLOW_MODEL_URI or ensure models exist in mlruns.")
+# Live feature distributions are summarized write-behind, like the audit log
+drift_monitor = DriftMonitor(
+    serving_drift_profile,
+    buffer_size=config.DRIFT_BUFFER_SIZE,
+    flush_interval=config.DRIFT_FLUSH_INTERVAL_SECONDS
+) if config.DRIFT_MONITORING_ENABLED else None
 
-logger.info(f"Using Model URI: {MODEL_URI}")
-inference_engine = HeartDiseaseInference(model_uri=MODEL_URI)
+
+def record_prediction(endpoint, model_version, features, result, cached=False):
+    """Hands a served row to the audit log and the drift monitor; both only buffer it."""
+    if audit_log is not None:
+        audit_log.record(endpoint, model_version, features, result, cached=cached)
+    if drift_monitor is not None:
+        drift_monitor.observe(features)
+
+
+def score_micro_batch(items):
+    """
+    Scores (engine, record) pairs with the engine each request started on, so a
+    reload between submit and flush cannot attribute a new model's result to
+    the old version. Normally all pairs share one engine and this is one call.
+    """
+    BATCH_SIZE.labels(source="microbatch").observe(len(items))
+    groups = {}
+    for i, (engine, _) in enumerate(items):
+        groups.setdefault(id(engine), (engine, []))[1].append(i)
+    results = [None] * len(items)
+    for engine, rows in groups.values():
+        for i, result in zip(rows, engine.predict_batch([items[i][1] for i in rows])):
+            results[i] = result
+    return results
+
+
+# Groups concurrent /predict calls into one vectorized call off the event loop
+micro_batcher = MicroBatcher(
+    score_micro_batch,
+    max_batch_size=config.MICROBATCH_MAX_SIZE,
+    max_wait_ms=config.MICROBATCH_MAX_WAIT_MS,
+    max_queue_size=config.MICROBATCH_MAX_QUEUE
+)
 
 
 # --------------------------
@@ -143,20 +277,378 @@ class PatientData(BaseModel):
     thal: float
 
 
+class BatchPatientData(BaseModel):
+    records: List[Dict[str, Any]]
+
+
+class ReloadRequest(BaseModel):
+    model_uri: Optional[str] = None
+    force: bool = False
+
+
+# Compact request bodies (see wire_formats) documented next to the JSON schema
+COMPACT_REQUEST_CONTENT = {
+    COLUMNAR_JSON: {"schema": {
+        "type": "object",
+        "properties": {
+            "columns": {"type": "array", "items": {"type": "string"}},
+            "data": {"type": "array", "items": {"type": "array", "items": {"type": "number"}}}
+        },
+        "required": ["columns", "data"]
+    }},
+    FLOAT32_MATRIX: {"schema": {"type": "string", "format": "binary"}},
+}
+
+
+def invalid_body(msg):
+    return RequestValidationError([{"type": "value_error", "loc": ["body"], "msg": msg}])
+
+
+async def predict_compact(request: Request, content_type, response_type, endpoint):
+    """
+    Scores a columnar JSON or float32 body as one matrix: no per-row model
+    validation, no result cache. /predict takes exactly one row.
+    """
+    start = time.perf_counter()
+    try:
+        X = decode(content_type, await request.body())
+    except WireFormatError as e:
+        count_error("validation")
+        raise invalid_body(str(e))
+    single = endpoint == "/predict"
+    if single and len(X) != 1:
+        count_error("validation")
+        raise invalid_body(f"/predict takes exactly one row, got {len(X)}; use /predict/batch")
+    if len(X) > config.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(X)} records exceeds MAX_BATCH_SIZE={config.MAX_BATCH_SIZE}"
+        )
+    VALIDATION_STAGE.observe(time.perf_counter() - start)
+
+    engine = get_engine()
+    model_version = engine.model_version
+    if not single:
+        BATCH_SIZE.labels(source="batch_endpoint").observe(len(X))
+    try:
+        preds, probs, errors = await run_in_threadpool(score_matrix, engine, X)
+    except Exception:
+        count_error("inference", model_version)
+        raise
+
+    for features, pred, prob, error in zip(X.tolist(), preds.tolist(), probs.tolist(), errors):
+        if error is not None:
+            count_error("validation", model_version)
+        else:
+            record_prediction(endpoint, model_version, features, {"prediction": int(pred), "confidence": prob})
+    if single and errors[0] is not None:
+        raise HTTPException(status_code=422, detail=errors[0])
+
+    return render_columns(response_type, preds, probs, errors, single=single)
+
+
 # --------------------------
 # Prediction Endpoint
 # --------------------------
-@app.post("/predict")
-async def predict(data: PatientData, request: Request):
+# The body is parsed and validated in the handler (not by FastAPI) so the
+# validation stage can be timed; the OpenAPI schema is declared explicitly.
+@app.post(
+    "/predict",
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": PatientData.schema()}, **COMPACT_REQUEST_CONTENT}
+    }}
+)
+async def predict(request: Request):
     REQUEST_COUNT.inc()
+    response_type = response_type_for(request)
+    content_type = media_type(request.headers.get("content-type"))
+    if content_type in COMPACT_TYPES:
+        return await predict_compact(request, content_type, response_type, "/predict")
 
-    input_dict = data.dict()
-    logger.info(f"Received request: {input_dict}")
+    start = time.perf_counter()
+    try:
+        payload = await request.json()
+        input_dict = PatientData(**payload).dict()
+    except ValidationError as e:
+        count_error("validation")
+        raise RequestValidationError(e.errors())
+    except (ValueError, TypeError):
+        count_error("validation")
+        raise RequestValidationError(
+            [{"type": "json_invalid", "loc": ["body"], "msg": "Body must be a JSON object"}]
+        )
+    VALIDATION_STAGE.observe(time.perf_counter() - start)
 
-    result = inference_engine.predict_single(input_dict)
-    logger.info(f"Prediction: {result}")
+    engine = get_engine()
+    model_version = engine.model_version
+    if prediction_cache is not None:
+        cached = prediction_cache.get(model_version, input_dict)
+        if cached is not None:
+            record_prediction("/predict", model_version, input_dict, cached, cached=True)
+            return render(response_type, [cached], single=True)
 
-    return result
+    try:
+        if config.MICROBATCH_ENABLED:
+            result = await micro_batcher.submit((engine, input_dict))
+        else:
+            result = await run_in_threadpool(engine.predict_single, input_dict)
+    except QueueFullError as e:
+        count_error("overload", model_version)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception:
+        count_error("inference", model_version)
+        raise
+    if "error" in result:
+        count_error("inference", model_version)
+        raise HTTPException(status_code=422, detail=result["error"])
+    record_prediction("/predict", model_version, input_dict, result)
+
+    if prediction_cache is not None:
+        prediction_cache.put(model_version, input_dict, result)
+
+    return render(response_type, [result], single=True)
+
+
+# --------------------------
+# Batch Prediction Endpoint
+# --------------------------
+@app.post(
+    "/predict/batch",
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": BatchPatientData.schema()}, **COMPACT_REQUEST_CONTENT}
+    }}
+)
+async def predict_batch(request: Request):
+    REQUEST_COUNT.inc()
+    response_type = response_type_for(request)
+    content_type = media_type(request.headers.get("content-type"))
+    if content_type in COMPACT_TYPES:
+        return await predict_compact(request, content_type, response_type, "/predict/batch")
+
+    try:
+        batch = BatchPatientData(**await request.json())
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    except (ValueError, TypeError):
+        raise RequestValidationError(
+            [{"type": "json_invalid", "loc": ["body"], "msg": "Body must be a JSON object"}]
+        )
+
+    n_records = len(batch.records)
+    if n_records > config.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {n_records} records exceeds MAX_BATCH_SIZE={config.MAX_BATCH_SIZE}"
+        )
+
+    # Validate rows individually so one bad record does not reject the batch
+    # Only rows that are valid and not cached are sent to the model
+    engine = get_engine()
+    model_version = engine.model_version
+    start = time.perf_counter()
+    results = [None] * n_records
+    valid_rows = []
+    valid_positions = []
+    for i, record in enumerate(batch.records):
+        try:
+            row = PatientData(**record).dict()
+        except ValidationError as e:
+            err = e.errors()[0]
+            results[i] = {"error": err["msg"], "field": ".".join(str(p) for p in err["loc"])}
+            count_error("validation", model_version)
+            continue
+        cached = prediction_cache.get(model_version, row) if prediction_cache is not None else None
+        if cached is not None:
+            results[i] = cached
+            record_prediction("/predict/batch", model_version, row, cached, cached=True)
+        else:
+            valid_rows.append(row)
+            valid_positions.append(i)
+    VALIDATION_STAGE.observe(time.perf_counter() - start)
+
+    if valid_rows:
+        BATCH_SIZE.labels(source="batch_endpoint").observe(len(valid_rows))
+        try:
+            scored = await run_in_threadpool(engine.predict_batch, valid_rows)
+        except Exception:
+            count_error("inference", model_version)
+            raise
+        for pos, row, result in zip(valid_positions, valid_rows, scored):
+            results[pos] = result
+            record_prediction("/predict/batch", model_version, row, result)
+            if prediction_cache is not None:
+                prediction_cache.put(model_version, row, result)
+
+    return render(response_type, results)
+
+
+# --------------------------
+# Streaming Prediction Endpoint
+# --------------------------
+def encode_stream_results(pending, scored):
+    """
+    Renders one batch of stream output in input order. pending holds
+    (line, row, error) entries; scored has one result per entry with a row.
+    """
+    scored = iter(scored)
+    lines = []
+    for line_number, row, error in pending:
+        result = error if row is None else next(scored)
+        lines.append(json.dumps({"line": line_number, **result}, separators=(",", ":")))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+async def score_stream(request: Request, engine):
+    """
+    Reads NDJSON lines as they arrive and yields scored NDJSON chunks, one per
+    STREAM_BATCH_SIZE lines. Input is only pulled when the previous chunk has
+    been sent, so memory is bounded by one batch and a slow client throttles
+    the upload.
+    """
+    model_version = engine.model_version
+    pending = []
+    rows = []
+
+    async def flush():
+        results = []
+        if rows:
+            BATCH_SIZE.labels(source="stream").observe(len(rows))
+            try:
+                results = await run_in_threadpool(engine.predict_batch, rows)
+            except Exception as e:
+                # Headers are already sent; report the batch and keep going
+                count_error("inference", model_version)
+                results = [{"error": f"Inference failed: {e}"}] * len(rows)
+        for row, result in zip(rows, results):
+            if "error" not in result:
+                record_prediction("/predict/stream", model_version, row, result)
+        chunk = encode_stream_results(pending, results)
+        pending.clear()
+        rows.clear()
+        return chunk
+
+    async for line_number, line in iter_lines(request.stream(), config.STREAM_MAX_LINE_BYTES):
+        if line is not None and not line.strip():
+            continue
+        row = None
+        error = None
+        if line is None:
+            error = {"error": f"Line exceeds STREAM_MAX_LINE_BYTES={config.STREAM_MAX_LINE_BYTES}"}
+        else:
+            try:
+                row = PatientData(**json.loads(line)).dict()
+            except ValidationError as e:
+                err = e.errors()[0]
+                error = {"error": err["msg"], "field": ".".join(str(p) for p in err["loc"])}
+            except (ValueError, TypeError):
+                error = {"error": "Line is not a JSON object"}
+        if error is not None:
+            count_error("validation", model_version)
+        else:
+            rows.append(row)
+        pending.append((line_number, row, error))
+
+        if len(pending) >= config.STREAM_BATCH_SIZE:
+            yield await flush()
+
+    if pending:
+        yield await flush()
+
+
+@app.post(
+    "/predict/stream",
+    openapi_extra={"requestBody": {
+        "required": True,
+        "content": {"application/x-ndjson": {"schema": PatientData.schema()}}
+    }}
+)
+async def predict_stream(request: Request):
+    REQUEST_COUNT.inc()
+    engine = get_engine()
+    return FullDuplexStreamingResponse(score_stream(request, engine), media_type="application/x-ndjson")
+
+
+# --------------------------
+# Model Admin Endpoints
+# --------------------------
+def check_admin_token(request: Request):
+    # Reload unpickles models and rollback swaps them: never serve these unauthenticated
+    if not config.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API disabled: set ADMIN_TOKEN to enable it")
+    token = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(token.encode(), config.ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+def describe_engine(engine):
+    return {"model_version": engine.model_version, "model_uri": engine.model_uri}
+
+
+def publish_serving_model():
+    """Hands this worker's serving model to the other workers (serve.py multi-worker mode)."""
+    if config.MODEL_SYNC_FILE:
+        model_manager.publish(config.MODEL_SYNC_FILE)
+
+
+@app.get("/admin/models")
+async def admin_models(request: Request):
+    check_admin_token(request)
+    return {
+        "current": describe_engine(model_manager.engine) if model_manager.engine else None,
+        "history": [describe_engine(engine) for engine in reversed(model_manager.history)]
+    }
+
+
+@app.get("/admin/drift")
+async def admin_drift(request: Request):
+    check_admin_token(request)
+    if drift_monitor is None:
+        raise HTTPException(status_code=404, detail="Drift monitoring is disabled")
+    # Fold in what is buffered so the answer is current
+    await run_in_threadpool(drift_monitor.flush)
+    return drift_monitor.snapshot()
+
+
+@app.post("/admin/reload")
+async def admin_reload(request: Request, body: Optional[ReloadRequest] = None):
+    check_admin_token(request)
+    body = body or ReloadRequest()
+    previous = model_manager.engine
+    model_uri = None
+    if body.model_uri:
+        try:
+            model_uri = await run_in_threadpool(allowed_model_uri, body.model_uri)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # Load + warm-up run off the event loop; requests keep using the current model
+    try:
+        swapped = await run_in_threadpool(model_manager.reload, model_uri, body.force)
+    except ReloadInProgressError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed, current model kept: {e}")
+    if swapped:
+        publish_serving_model()
+
+    return {
+        "status": "reloaded" if swapped else "unchanged",
+        "model_version": model_manager.engine.model_version,
+        "previous_version": previous.model_version if previous else None
+    }
+
+
+@app.post("/admin/rollback")
+async def admin_rollback(request: Request):
+    check_admin_token(request)
+    try:
+        engine = model_manager.rollback()
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    publish_serving_model()
+    return {"status": "rolled_back", "model_version": engine.model_version}
 
 
 # --------------------------
@@ -164,7 +656,7 @@ async def predict(data: PatientData, request: Request):
 # --------------------------
 @app.get("/metrics", response_class=PlainTextResponse)
 async def metrics():
-    return generate_latest()
+    return generate_latest(metrics_registry())
 
 
 # --------------------------
@@ -173,3 +665,22 @@ async def metrics():
 @app.get("/")
 def health():
     return {"status": "ok", "message": "Heart Disease Prediction API is running"}
+
+
+# --------------------------
+# Liveness / Readiness
+# --------------------------
+@app.get("/healthz")
+def liveness():
+    # Process is up and serving HTTP; says nothing about the model
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def readiness():
+    if not model_manager.ready:
+        return JSONResponse(
+            status_code=503,
+            content={"status": model_manager.phase, "error": model_manager.error}
+        )
+    return {"status": "ready", "model_version": model_manager.engine.model_version}
@@ -0,0 +1,153 @@
+"""
+Write-behind audit log of predictions.
+
+Request handlers only append a tuple to an in-memory ring buffer; a background
+thread drains it on a schedule and writes compact JSONL in bulk to size-rotated
+files. When the buffer is full, records are dropped and counted rather than
+blocking the request.
+"""
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from prometheus_client import Counter
+
+from preprocessing import FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+AUDIT_RECORDS = Counter(
+    "api_audit_records_total",
+    "Prediction audit records by outcome",
+    ["outcome"]
+)
+_WRITTEN = AUDIT_RECORDS.labels(outcome="written")
+_DROPPED = AUDIT_RECORDS.labels(outcome="dropped")
+
+
+class AuditLog:
+    """
+    Buffered, sampled prediction audit log.
+
+    Args:
+        log_dir: Directory for predictions.jsonl and its rotated backups.
+        buffer_size: Records held in memory before new ones are dropped.
+        sample_rate: Fraction of predictions recorded (0.0 - 1.0).
+        flush_interval: Seconds between background flushes.
+        max_bytes: Rotate the active file once it would exceed this size.
+        backup_count: Rotated files kept (predictions.jsonl.1 is the newest).
+    """
+
+    FILENAME = "predictions.jsonl"
+
+    def __init__(self, log_dir, buffer_size=100000, sample_rate=1.0, flush_interval=1.0,
+                 max_bytes=50 * 1024 * 1024, backup_count=5):
+        self.log_dir = log_dir
+        self.path = os.path.join(log_dir, self.FILENAME)
+        self.buffer_size = buffer_size
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._buffer = deque()
+        self._stop = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._file = None
+        self._file_size = 0
+
+    def use_worker_file(self, worker_id):
+        """
+        Writes to predictions.worker<N>.jsonl instead, so forked workers never
+        interleave lines in or rotate each other's files. Call before start().
+        """
+        base, ext = os.path.splitext(self.FILENAME)
+        self.path = os.path.join(self.log_dir, f"{base}.worker{worker_id}{ext}")
+
+    def record(self, endpoint, model_version, features, result, cached=False):
+        """
+        Hot path: sample, then append one tuple. No formatting or I/O.
+        features is the validated input dict (or a list in FEATURE_COLUMNS order)
+        and must not be mutated afterwards.
+        """
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        if len(self._buffer) >= self.buffer_size:
+            _DROPPED.inc()
+            return
+        self._buffer.append((time.time(), endpoint, model_version, features, result, cached))
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                logger.error(f"Audit log flush failed: {e}")
+
+    def flush(self):
+        """Drains the buffer and writes everything in one bulk write."""
+        with self._write_lock:
+            n = len(self._buffer)
+            if n == 0:
+                return 0
+            lines = []
+            for _ in range(n):
+                ts, endpoint, version, features, result, cached = self._buffer.popleft()
+                entry = {
+                    "ts": round(ts, 6),
+                    "endpoint": endpoint,
+                    "model_version": version,
+                    "features": features if isinstance(features, list) else [features[col] for col in FEATURE_COLUMNS],
+                    **result,
+                }
+                if cached:
+                    entry["cached"] = True
+                lines.append(json.dumps(entry, separators=(",", ":")))
+            self._write(("\n".join(lines) + "\n").encode("utf-8"))
+            _WRITTEN.inc(n)
+            return n
+
+    def _write(self, data):
+        if self._file is None:
+            os.makedirs(self.log_dir, exist_ok=True)
+            self._file = open(self.path, "ab")
+            self._file_size = self._file.tell()
+        if self._file_size > 0 and self._file_size + len(data) > self.max_bytes:
+            self._rotate()
+        self._file.write(data)
+        self._file.flush()
+        self._file_size += len(data)
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = f"{self.path}.{i}"
+                if os.path.exists(src):
+                    os.replace(src, f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._file = open(self.path, "ab")
+        self._file_size = 0
+
+    def close(self):
+        """Stops the writer and flushes whatever is still buffered."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
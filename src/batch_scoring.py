@@ -0,0 +1,264 @@
+"""
+Offline batch scoring of large CSV or Parquet extracts.
+
+The input is read in chunks, encoded with the preprocessor saved in the model
+(see preprocessing.HeartDiseasePreprocessor) and scored across a process pool
+in which every worker loads the model once. Predictions are appended to a CSV in input order
+as chunks complete, and progress is checkpointed after each chunk so a crashed
+run can resume where it stopped.
+
+Usage:
+    python src/batch_scoring.py --input cohort.csv --output predictions.csv
+    python src/batch_scoring.py --input cohort.parquet --output predictions.csv --workers 8 --resume
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import mlflow
+import numpy as np
+import pandas as pd
+
+from config import config
+from inference_pipeline import HeartDiseaseInference, load_model_metadata
+from model_registry import get_latest_model_uri
+from preprocessing import FEATURE_COLUMNS, HeartDiseasePreprocessor
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_HEADER = "row,prediction,confidence\n"
+
+# Per-process state, set once by _init_worker
+_engine = None
+_preprocessor = None
+
+
+def iter_chunks(path, chunk_size, skip_rows=0, header=False):
+    """
+    Yields raw DataFrame chunks of path, skipping the first skip_rows data rows.
+    Each chunk is indexed by its data row numbers in the file (0-based). In a
+    CSV every line after the header is a row, blank ones included (as all-NaN
+    rows), so row numbers are line offsets and resuming from one is exact.
+    """
+    if path.endswith((".parquet", ".pq")):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet requires pyarrow: pip install pyarrow")
+
+        offset = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            n = batch.num_rows
+            if offset + n > skip_rows:
+                df = batch.to_pandas()
+                start = max(offset, skip_rows)
+                df = df.iloc[start - offset:]
+                df.index = range(start, offset + n)
+                yield df
+            offset += n
+        return
+
+    # Everything is read as text so categorical values look the same in every chunk
+    names = None
+    skip = skip_rows
+    if header:
+        names = list(pd.read_csv(path, nrows=0).columns)
+        skip += 1
+    start = skip_rows
+    for df in pd.read_csv(path, header=None, names=names, skiprows=skip, chunksize=chunk_size, dtype=str,
+                          skip_blank_lines=False):
+        df.index = range(start, start + len(df))
+        start += len(df)
+        yield df
+
+
+def _init_worker(model_uri, preprocessor_state, backend):
+    global _engine, _preprocessor
+    _engine = HeartDiseaseInference(model_uri, backend=backend)
+    _preprocessor = HeartDiseasePreprocessor.from_dict(preprocessor_state)
+
+
+def _score_chunk(df):
+    """
+    Cleans and scores one chunk; returns (rows, predictions, confidences,
+    lines read, rows read). Blank lines count as lines read, not as rows.
+    """
+    lines = len(df)
+    df = df.dropna(how="all")
+    clean = _preprocessor.transform(df)
+    if clean.empty:
+        return np.empty(0, dtype=np.int64), np.empty(0), np.empty(0), lines, len(df)
+    preds, probs = _engine.predict_matrix(clean[FEATURE_COLUMNS].to_numpy(dtype=np.float64))
+    return clean.index.to_numpy(), preds, probs, lines, len(df)
+
+
+def _format_chunk(rows, preds, probs):
+    out = pd.DataFrame({"row": rows, "prediction": preds.astype(int), "confidence": probs})
+    return out.to_csv(header=False, index=False).encode("utf-8")
+
+
+def _save_progress(path, state):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def score_file(input_path, output_path, model_uri=None, chunk_size=None, workers=None,
+               resume=False, header=False, backend="sklearn", fit_levels=False):
+    """
+    Scores input_path into output_path (CSV: row, prediction, confidence).
+
+    Args:
+        model_uri: Model to score with; defaults to MLFLOW_MODEL_URI, then the latest model.
+        chunk_size: Input rows per chunk (config.SCORING_CHUNK_SIZE).
+        workers: Scoring processes (config.SCORING_WORKERS, 0 = one per CPU); 1 scores in-process.
+        resume: Continue from the last completed chunk recorded in <output>.progress.json.
+        header: The CSV input has a header row (the raw UCI data does not).
+        backend: Inference backend. sklearn by default: the compiled backend is tuned
+                 for small serving batches and is slower on large chunks.
+        fit_levels: For a model saved without its preprocessor, fit the category
+                    levels on the input file. Its codes only match training if the
+                    file has exactly the training levels, so this must be asked for.
+
+    Returns:
+        Summary dict with row counts, elapsed seconds and rows per second for this run.
+
+    Raises:
+        ValueError: The model has no saved preprocessor and fit_levels is not set.
+    """
+    chunk_size = chunk_size or config.SCORING_CHUNK_SIZE
+    workers = workers or config.SCORING_WORKERS or os.cpu_count() or 1
+    progress_path = f"{output_path}.progress.json"
+
+    state = None
+    if resume and os.path.exists(progress_path) and os.path.exists(output_path):
+        with open(progress_path) as f:
+            state = json.load(f)
+        if state["input"] != os.path.abspath(input_path) or state["chunk_size"] != chunk_size:
+            raise ValueError(f"{progress_path} belongs to a different input or chunk size; rerun without --resume")
+        model_uri = state["model_uri"]
+        logger.info(f"Resuming after chunk {state['chunks_done']} ({state['lines_read']} lines read)")
+    else:
+        model_uri = model_uri or os.getenv("MLFLOW_MODEL_URI") or get_latest_model_uri()
+        if not model_uri:
+            raise ValueError("Could not determine model URI. Set MLFLOW_MODEL_URI or pass --model-uri.")
+        metadata = load_model_metadata(mlflow.artifacts.download_artifacts(artifact_uri=model_uri))
+        preprocessor = HeartDiseasePreprocessor.from_metadata(metadata)
+        if preprocessor is None:
+            if not fit_levels:
+                raise ValueError(
+                    f"{model_uri} has no saved preprocessor, so the training category codes are unknown. "
+                    "Retrain the model, or pass --fit-levels to fit the levels on the input "
+                    "(codes shift if the input lacks any training level)."
+                )
+            # Fit the encoding on the whole file, as clean_dataset would have at training time
+            logger.warning("Model has no saved preprocessor: fitting category levels on the input. "
+                           "Predictions are wrong if its levels differ from the training data's.")
+            preprocessor = HeartDiseasePreprocessor()
+            for chunk in iter_chunks(input_path, chunk_size, header=header):
+                preprocessor.partial_fit(chunk.dropna(how="all"))
+        state = {
+            "input": os.path.abspath(input_path),
+            "chunk_size": chunk_size,
+            "model_uri": model_uri,
+            "preprocessor": preprocessor.to_dict(),
+            "chunks_done": 0,
+            "lines_read": 0,
+            "rows_read": 0,
+            "rows_scored": 0,
+            "output_bytes": len(OUTPUT_HEADER),
+        }
+        with open(output_path, "wb") as f:
+            f.write(OUTPUT_HEADER.encode("utf-8"))
+        _save_progress(progress_path, state)
+
+    logger.info(f"Scoring {input_path} with {model_uri} ({workers} workers, {chunk_size} rows per chunk)")
+    start = time.perf_counter()
+    rows_read = rows_scored = 0
+    chunks = iter_chunks(input_path, chunk_size, skip_rows=state["lines_read"], header=header)
+
+    with open(output_path, "r+b") as out:
+        # Drop anything written after the last checkpoint
+        out.truncate(state["output_bytes"])
+        out.seek(state["output_bytes"])
+
+        def write(result):
+            nonlocal rows_read, rows_scored
+            rows, preds, probs, n_lines, n_read = result
+            out.write(_format_chunk(rows, preds, probs))
+            out.flush()
+            rows_read += n_read
+            rows_scored += len(rows)
+            state["chunks_done"] += 1
+            state["lines_read"] += n_lines
+            state["rows_read"] += n_read
+            state["rows_scored"] += len(rows)
+            state["output_bytes"] = out.tell()
+            _save_progress(progress_path, state)
+
+            elapsed = time.perf_counter() - start
+            logger.info(f"Chunk {state['chunks_done']}: {state['rows_read']} rows read, "
+                        f"{state['rows_scored']} scored, {rows_read / elapsed:,.0f} rows/s")
+
+        if workers == 1:
+            _init_worker(model_uri, state["preprocessor"], backend)
+            for chunk in chunks:
+                write(_score_chunk(chunk))
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                     initargs=(model_uri, state["preprocessor"], backend)) as pool:
+                # Bounded window keeps memory constant and output in input order
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(_score_chunk, chunk))
+                    if len(pending) >= 2 * workers:
+                        write(pending.popleft().result())
+                while pending:
+                    write(pending.popleft().result())
+
+    os.remove(progress_path)
+    elapsed = time.perf_counter() - start
+    summary = {
+        "rows_read": rows_read,
+        "rows_scored": rows_scored,
+        "rows_dropped": rows_read - rows_scored,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(rows_read / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+    logger.info(f"Scored {rows_scored} of {rows_read} rows in {elapsed:.2f}s "
+                f"({summary['rows_per_second']:,.0f} rows/s) -> {output_path}")
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", required=True, help="CSV or Parquet file to score")
+    parser.add_argument("--output", required=True, help="CSV file for predictions")
+    parser.add_argument("--model-uri", help="Model URI (default: MLFLOW_MODEL_URI or latest model)")
+    parser.add_argument("--chunk-size", type=int, default=config.SCORING_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=config.SCORING_WORKERS,
+                        help="Scoring processes (0 = one per CPU)")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run")
+    parser.add_argument("--header", action="store_true", help="CSV input has a header row")
+    parser.add_argument("--backend", choices=["sklearn", "compiled"], default="sklearn",
+                        help="Inference backend (compiled only pays off for small chunks)")
+    parser.add_argument("--fit-levels", action="store_true",
+                        help="Fit category levels on the input for a model saved without them")
+    args = parser.parse_args()
+
+    summary = score_file(
+        args.input, args.output,
+        model_uri=args.model_uri,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        resume=args.resume,
+        header=args.header,
+        backend=args.backend,
+        fit_levels=args.fit_levels
+    )
+    print(json.dumps(summary, indent=2))
@@ -0,0 +1,125 @@
+"""
+In-process micro-batching for single-row prediction requests.
+
+Concurrent callers enqueue one record each; a background task groups them into
+a batch that is flushed when it reaches max_batch_size or when max_wait_ms has
+passed since the first queued record. Each batch is scored with one vectorized
+call in a worker thread, keeping the event loop free, and every caller's
+future is resolved with its own result.
+
+The queue is bounded: once max_queue_size records are waiting, submit() raises
+QueueFullError at once instead of letting an overload grow memory.
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(RuntimeError):
+    """Raised by submit() when max_queue_size records are already waiting."""
+
+
+class MicroBatcher:
+    """
+    Collects concurrent single-row requests into batches.
+
+    Args:
+        predict_batch: Callable taking a list of records and returning a list
+                       of results in the same order.
+        max_batch_size: Flush as soon as this many records are queued.
+        max_wait_ms: Flush at most this long after the first record of a batch arrived.
+        max_queue_size: Records allowed to wait for a batch (0: unbounded).
+    """
+
+    def __init__(self, predict_batch, max_batch_size=64, max_wait_ms=2.0, max_queue_size=0):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue_size = max_queue_size
+        self._executor = None
+        self._loop = None
+        self._queue = None
+        self._worker = None
+
+    def _ensure_started(self):
+        """Binds the queue and worker task to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="microbatch")
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, record):
+        """
+        Queues one record and waits for its prediction.
+
+        Raises:
+            QueueFullError: max_queue_size records are already waiting.
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        try:
+            self._queue.put_nowait((record, future))
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Micro-batch queue is full ({self.max_queue_size} waiting)") from None
+        return await future
+
+    async def _collect(self):
+        """Waits for the first record, then fills the batch until it is full or the wait expires."""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            records = [record for record, _ in batch]
+            try:
+                results = await self._loop.run_in_executor(self._executor, self.predict_batch, records)
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as e:
+                logger.error(f"Micro-batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def stop(self):
+        """Cancels the worker task, fails queued requests and releases the worker thread."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._worker = None
@@ -22,11 +22,22 @@ class Config:
     DATA_DIR: str = os.getenv("DATA_DIR", "data")
     CSV_FILENAME: str = os.getenv("CSV_FILENAME", "heart.csv")
     TARGET_DATA_FILE: str = os.getenv("TARGET_DATA_FILE", "processed.cleveland.data")
+    # Expected SHA-256 of the downloaded archive (empty: not verified)
+    DATA_SHA256: str = os.getenv("DATA_SHA256", "")
+    DATA_DOWNLOAD_TIMEOUT_SECONDS: float = float(os.getenv("DATA_DOWNLOAD_TIMEOUT_SECONDS", "60"))
     
     @property
     def CSV_PATH(self) -> str:
         """Full path to the CSV file."""
         return os.path.join(self.DATA_DIR, self.CSV_FILENAME)
+
+    # Cache of the cleaned dataset shared by the training stages (see dataset_cache.py)
+    DATASET_CACHE_ENABLED: bool = os.getenv("DATASET_CACHE_ENABLED", "true").lower() == "true"
+
+    @property
+    def DATASET_CACHE_DIR(self) -> str:
+        """Directory of cleaned dataset cache entries."""
+        return os.getenv("DATASET_CACHE_DIR", os.path.join(self.DATA_DIR, "cache"))
     
     # ======================
     # Dataset Schema
@@ -45,6 +56,13 @@ class Config:
     # ======================
     EXPERIMENT_NAME: str = os.getenv("MLFLOW_EXPERIMENT_NAME", "heart-disease-experiment")
     MLRUNS_DIR: str = os.getenv("MLRUNS_DIR", "mlruns")
+
+    # Training runs log params/metrics/artifacts through tracking_logger.RunLogger:
+    # buffered and sent in bulk from a background thread, with retries
+    MLFLOW_ASYNC_LOGGING: bool = os.getenv("MLFLOW_ASYNC_LOGGING", "true").lower() == "true"
+    MLFLOW_LOG_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("MLFLOW_LOG_FLUSH_INTERVAL_SECONDS", "1.0"))
+    MLFLOW_LOG_MAX_RETRIES: int = int(os.getenv("MLFLOW_LOG_MAX_RETRIES", "3"))
+    MLFLOW_LOG_RETRY_BACKOFF_SECONDS: float = float(os.getenv("MLFLOW_LOG_RETRY_BACKOFF_SECONDS", "0.5"))
     
     @property
     def MLFLOW_TRACKING_URI(self) -> str:
@@ -66,6 +84,21 @@ class Config:
     
     # Production model output path
     PRODUCTION_MODEL_DIR: str = os.getenv("PRODUCTION_MODEL_DIR", "models/production_model")
+
+    # Model index written by experiment_tracking/model_packaging (see model_registry.py).
+    # MODEL_ALIAS picks the served model: "candidate" (latest experiment),
+    # "production" (packaged model) or "latest" (newest registered)
+    MODEL_REGISTRY_PATH: str = os.getenv("MODEL_REGISTRY_PATH", "models/registry.db")
+    MODEL_ALIAS: str = os.getenv("MODEL_ALIAS", "candidate")
+
+    # Optional compression of the packaged forest (see model_compression.py): keeps the
+    # smallest variant whose validation ROC AUC is within the tolerance of the full model
+    MODEL_COMPRESSION: bool = os.getenv("MODEL_COMPRESSION", "false").lower() == "true"
+    COMPRESSION_AUC_TOLERANCE: float = float(os.getenv("COMPRESSION_AUC_TOLERANCE", "0.005"))
+    COMPRESSION_VALIDATION_SIZE: float = float(os.getenv("COMPRESSION_VALIDATION_SIZE", "0.2"))
+    COMPRESSION_TREE_COUNTS: List[int] = [10, 25, 50]
+    COMPRESSION_MAX_DEPTHS: List[int] = [4, 6, 8]
+    COMPRESSION_CCP_ALPHAS: List[float] = [0.002, 0.005, 0.01]
     
     # Logistic Regression hyperparameters
     LOGREG_MAX_ITER: int = int(os.getenv("LOGREG_MAX_ITER", "1000"))
@@ -80,6 +113,20 @@ class Config:
     GRID_MAX_DEPTH: List = [None, 6, 10]
     GRID_MIN_SAMPLES_SPLIT: List[int] = [2, 5]
     GRID_N_JOBS: int = int(os.getenv("GRID_N_JOBS", "-1"))
+
+    # Processes training the candidate models in experiment_tracking.py
+    # (0 = one per candidate, up to the CPU count; 1 = train in-process)
+    EXPERIMENT_WORKERS: int = int(os.getenv("EXPERIMENT_WORKERS", "0"))
+
+    # Random Forest search in train.py: "grid" (exhaustive GridSearchCV) or
+    # "halving" (successive halving, see hyperparameter_search.py)
+    HPARAM_SEARCH: str = os.getenv("HPARAM_SEARCH", "grid")
+    HALVING_RESOURCE: str = os.getenv("HALVING_RESOURCE", "n_estimators")  # or "n_samples"
+    HALVING_FACTOR: int = int(os.getenv("HALVING_FACTOR", "3"))
+    HALVING_SAMPLING: str = os.getenv("HALVING_SAMPLING", "grid")  # or "random"
+    HALVING_N_CANDIDATES: int = int(os.getenv("HALVING_N_CANDIDATES", "0"))  # 0 = whole grid
+    HALVING_MAX_FITS: int = int(os.getenv("HALVING_MAX_FITS", "0"))  # 0 = no limit
+    HALVING_MAX_SECONDS: float = float(os.getenv("HALVING_MAX_SECONDS", "0"))  # 0 = no limit
     
     # ======================
     # API Configuration
@@ -92,6 +139,23 @@ class Config:
     API_VERSION: str = os.getenv("API_VERSION", "1.0")
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
     API_PORT: int = int(os.getenv("API_PORT", "8000"))
+    API_WORKERS: int = int(os.getenv("API_WORKERS", "1"))  # 0 = one per available CPU
+
+    # "eager": load (and auto-train if no model exists) before serving.
+    # "background": bind the port immediately, load the model on a thread, never train.
+    STARTUP_MODE: str = os.getenv("STARTUP_MODE", "eager")
+
+    # Hot model reload: directory polled for changes (empty disables the watcher),
+    # previous versions kept for rollback, and the token /admin endpoints require
+    # (unset: the admin API refuses every request)
+    MODEL_WATCH_PATH: str = os.getenv("MODEL_WATCH_PATH", "")
+    MODEL_WATCH_INTERVAL_SECONDS: float = float(os.getenv("MODEL_WATCH_INTERVAL_SECONDS", "10"))
+    MODEL_HISTORY_SIZE: int = int(os.getenv("MODEL_HISTORY_SIZE", "2"))
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    # File through which worker processes share admin reloads and rollbacks
+    # (set by serve.py in multi-worker mode; empty: single process)
+    MODEL_SYNC_FILE: str = os.getenv("MODEL_SYNC_FILE", "")
+    MODEL_SYNC_INTERVAL_SECONDS: float = float(os.getenv("MODEL_SYNC_INTERVAL_SECONDS", "1"))
     
     # CORS Configuration
     CORS_ALLOW_ORIGINS: List[str] = os.getenv(
@@ -101,6 +165,39 @@ class Config:
     CORS_ALLOW_CREDENTIALS: bool = os.getenv("CORS_ALLOW_CREDENTIALS", "true").lower() == "true"
     CORS_ALLOW_METHODS: List[str] = ["*"]
     CORS_ALLOW_HEADERS: List[str] = ["*"]
+
+    # Batch prediction
+    MAX_BATCH_SIZE: int = int(os.getenv("MAX_BATCH_SIZE", "1000"))
+
+    # Streaming NDJSON scoring (/predict/stream)
+    STREAM_BATCH_SIZE: int = int(os.getenv("STREAM_BATCH_SIZE", "256"))
+    STREAM_MAX_LINE_BYTES: int = int(os.getenv("STREAM_MAX_LINE_BYTES", "65536"))
+
+    # Micro-batching of concurrent /predict requests
+    MICROBATCH_ENABLED: bool = os.getenv("MICROBATCH_ENABLED", "true").lower() == "true"
+    MICROBATCH_MAX_SIZE: int = int(os.getenv("MICROBATCH_MAX_SIZE", "64"))
+    MICROBATCH_MAX_WAIT_MS: float = float(os.getenv("MICROBATCH_MAX_WAIT_MS", "2"))
+    MICROBATCH_MAX_QUEUE: int = int(os.getenv("MICROBATCH_MAX_QUEUE", "4096"))
+
+    # Prediction result cache (size 0 disables it; TTL 0 means no expiry)
+    PREDICTION_CACHE_SIZE: int = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+    PREDICTION_CACHE_TTL_SECONDS: float = float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "0"))
+
+    # Inference backend: "sklearn" or "compiled" (flat-array forest evaluator)
+    INFERENCE_BACKEND: str = os.getenv("INFERENCE_BACKEND", "sklearn")
+
+    # Online feature-drift monitoring against the profile saved with the model
+    # (see drift_monitor.py); DRIFT_BINS is applied when the profile is built at training
+    DRIFT_MONITORING_ENABLED: bool = os.getenv("DRIFT_MONITORING_ENABLED", "true").lower() == "true"
+    DRIFT_BUFFER_SIZE: int = int(os.getenv("DRIFT_BUFFER_SIZE", "100000"))
+    DRIFT_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("DRIFT_FLUSH_INTERVAL_SECONDS", "5.0"))
+    DRIFT_BINS: int = int(os.getenv("DRIFT_BINS", "10"))
+
+    # ======================
+    # Offline Batch Scoring
+    # ======================
+    SCORING_CHUNK_SIZE: int = int(os.getenv("SCORING_CHUNK_SIZE", "100000"))
+    SCORING_WORKERS: int = int(os.getenv("SCORING_WORKERS", "0"))  # 0 = one per CPU
     
     # ======================
     # Logging Configuration
@@ -108,6 +205,15 @@ class Config:
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     LOG_FORMAT: str = os.getenv("LOG_FORMAT", "%(asctime)s — %(levelname)s — %(message)s")
 
+    # Prediction audit log (write-behind JSONL with size-based rotation)
+    AUDIT_LOG_ENABLED: bool = os.getenv("AUDIT_LOG_ENABLED", "true").lower() == "true"
+    AUDIT_LOG_DIR: str = os.getenv("AUDIT_LOG_DIR", "logs/audit")
+    AUDIT_LOG_SAMPLE_RATE: float = float(os.getenv("AUDIT_LOG_SAMPLE_RATE", "1.0"))
+    AUDIT_LOG_BUFFER_SIZE: int = int(os.getenv("AUDIT_LOG_BUFFER_SIZE", "100000"))
+    AUDIT_LOG_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL_SECONDS", "1.0"))
+    AUDIT_LOG_MAX_BYTES: int = int(os.getenv("AUDIT_LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+    AUDIT_LOG_BACKUP_COUNT: int = int(os.getenv("AUDIT_LOG_BACKUP_COUNT", "5"))
+
 
 # Create a singleton instance
 config = Config()
@@ -128,16 +234,33 @@ if __name__ == "__main__":
     print(f"  DATA_DIR: {config.DATA_DIR}")
     print(f"  CSV_PATH: {config.CSV_PATH}")
     print(f"  TARGET_DATA_FILE: {config.TARGET_DATA_FILE}")
+    print(f"  DATA_SHA256: {config.DATA_SHA256}")
+    print(f"  DATA_DOWNLOAD_TIMEOUT_SECONDS: {config.DATA_DOWNLOAD_TIMEOUT_SECONDS}")
+    print(f"  DATASET_CACHE_ENABLED: {config.DATASET_CACHE_ENABLED}")
+    print(f"  DATASET_CACHE_DIR: {config.DATASET_CACHE_DIR}")
     
     print("\n[MLflow Configuration]")
     print(f"  EXPERIMENT_NAME: {config.EXPERIMENT_NAME}")
     print(f"  MLFLOW_TRACKING_URI: {config.MLFLOW_TRACKING_URI}")
+    print(f"  MLFLOW_ASYNC_LOGGING: {config.MLFLOW_ASYNC_LOGGING}")
+    print(f"  MLFLOW_LOG_FLUSH_INTERVAL_SECONDS: {config.MLFLOW_LOG_FLUSH_INTERVAL_SECONDS}")
+    print(f"  MLFLOW_LOG_MAX_RETRIES: {config.MLFLOW_LOG_MAX_RETRIES}")
+    print(f"  MLFLOW_LOG_RETRY_BACKOFF_SECONDS: {config.MLFLOW_LOG_RETRY_BACKOFF_SECONDS}")
     
     print("\n[Model Configuration]")
     print(f"  RANDOM_STATE: {config.RANDOM_STATE}")
     print(f"  TEST_SIZE: {config.TEST_SIZE}")
     print(f"  CV_FOLDS: {config.CV_FOLDS}")
     print(f"  PRODUCTION_MODEL_DIR: {config.PRODUCTION_MODEL_DIR}")
+    print(f"  MODEL_REGISTRY_PATH: {config.MODEL_REGISTRY_PATH}")
+    print(f"  MODEL_ALIAS: {config.MODEL_ALIAS}")
+    print(f"  MODEL_COMPRESSION: {config.MODEL_COMPRESSION}")
+    print(f"  COMPRESSION_AUC_TOLERANCE: {config.COMPRESSION_AUC_TOLERANCE}")
+    print(f"  COMPRESSION_VALIDATION_SIZE: {config.COMPRESSION_VALIDATION_SIZE}")
+    print(f"  COMPRESSION_TREE_COUNTS: {config.COMPRESSION_TREE_COUNTS}")
+    print(f"  COMPRESSION_MAX_DEPTHS: {config.COMPRESSION_MAX_DEPTHS}")
+    print(f"  COMPRESSION_CCP_ALPHAS: {config.COMPRESSION_CCP_ALPHAS}")
+    print(f"  EXPERIMENT_WORKERS: {config.EXPERIMENT_WORKERS}")
     
     print("\n[Logistic Regression]")
     print(f"  MAX_ITER: {config.LOGREG_MAX_ITER}")
@@ -146,13 +269,50 @@ if __name__ == "__main__":
     print(f"  N_ESTIMATORS: {config.RF_N_ESTIMATORS}")
     print(f"  MAX_DEPTH: {config.RF_MAX_DEPTH}")
     print(f"  MIN_SAMPLES_SPLIT: {config.RF_MIN_SAMPLES_SPLIT}")
+
+    print("\n[Hyperparameter Search]")
+    print(f"  HPARAM_SEARCH: {config.HPARAM_SEARCH}")
+    print(f"  HALVING_RESOURCE: {config.HALVING_RESOURCE}")
+    print(f"  HALVING_FACTOR: {config.HALVING_FACTOR}")
+    print(f"  HALVING_SAMPLING: {config.HALVING_SAMPLING}")
+    print(f"  HALVING_N_CANDIDATES: {config.HALVING_N_CANDIDATES}")
+    print(f"  HALVING_MAX_FITS: {config.HALVING_MAX_FITS}")
+    print(f"  HALVING_MAX_SECONDS: {config.HALVING_MAX_SECONDS}")
     
     print("\n[API Configuration]")
     print(f"  API_TITLE: {config.API_TITLE}")
     print(f"  API_VERSION: {config.API_VERSION}")
     print(f"  API_HOST: {config.API_HOST}")
     print(f"  API_PORT: {config.API_PORT}")
+    print(f"  API_WORKERS: {config.API_WORKERS}")
     print(f"  CORS_ALLOW_ORIGINS: {config.CORS_ALLOW_ORIGINS}")
+    print(f"  STARTUP_MODE: {config.STARTUP_MODE}")
+    print(f"  MODEL_WATCH_PATH: {config.MODEL_WATCH_PATH}")
+    print(f"  MODEL_WATCH_INTERVAL_SECONDS: {config.MODEL_WATCH_INTERVAL_SECONDS}")
+    print(f"  MODEL_HISTORY_SIZE: {config.MODEL_HISTORY_SIZE}")
+    print(f"  MODEL_SYNC_FILE: {config.MODEL_SYNC_FILE}")
+    print(f"  MODEL_SYNC_INTERVAL_SECONDS: {config.MODEL_SYNC_INTERVAL_SECONDS}")
+    print(f"  MAX_BATCH_SIZE: {config.MAX_BATCH_SIZE}")
+    print(f"  STREAM_BATCH_SIZE: {config.STREAM_BATCH_SIZE}")
+    print(f"  STREAM_MAX_LINE_BYTES: {config.STREAM_MAX_LINE_BYTES}")
+    print(f"  INFERENCE_BACKEND: {config.INFERENCE_BACKEND}")
+    print(f"  DRIFT_MONITORING_ENABLED: {config.DRIFT_MONITORING_ENABLED}")
+    print(f"  DRIFT_BUFFER_SIZE: {config.DRIFT_BUFFER_SIZE}")
+    print(f"  DRIFT_FLUSH_INTERVAL_SECONDS: {config.DRIFT_FLUSH_INTERVAL_SECONDS}")
+    print(f"  DRIFT_BINS: {config.DRIFT_BINS}")
+    print(f"  PREDICTION_CACHE_SIZE: {config.PREDICTION_CACHE_SIZE}")
+    print(f"  PREDICTION_CACHE_TTL_SECONDS: {config.PREDICTION_CACHE_TTL_SECONDS}")
+    print(f"  MICROBATCH_ENABLED: {config.MICROBATCH_ENABLED}")
+    print(f"  MICROBATCH_MAX_SIZE: {config.MICROBATCH_MAX_SIZE}")
+    print(f"  MICROBATCH_MAX_WAIT_MS: {config.MICROBATCH_MAX_WAIT_MS}")
+    print(f"  MICROBATCH_MAX_QUEUE: {config.MICROBATCH_MAX_QUEUE}")
+
+    print("\n[Batch Scoring]")
+    print(f"  SCORING_CHUNK_SIZE: {config.SCORING_CHUNK_SIZE}")
+    print(f"  SCORING_WORKERS: {config.SCORING_WORKERS}")
     
     print("\n[Logging]")
     print(f"  LOG_LEVEL: {config.LOG_LEVEL}")
+    print(f"  AUDIT_LOG_ENABLED: {config.AUDIT_LOG_ENABLED}")
+    print(f"  AUDIT_LOG_DIR: {config.AUDIT_LOG_DIR}")
+    print(f"  AUDIT_LOG_SAMPLE_RATE: {config.AUDIT_LOG_SAMPLE_RATE}")
@@ -1,57 +1,227 @@
+"""
+Downloads the UCI Heart Disease archive and extracts the Cleveland data file.
+
+The archive is streamed to DATA_DIR/heart.zip in chunks and hashed on the way.
+A sidecar heart.zip.meta.json remembers its SHA-256 and the server's ETag /
+Last-Modified, so later runs skip the fetch when:
+
+    - DATA_SHA256 is set and the local archive already matches it, or
+    - the server answers the conditional request with 304 Not Modified.
+
+Only TARGET_DATA_FILE is extracted, byte for byte, straight to CSV_PATH, and
+only when the archive or the CSV changed. DATA_URL may also be a file:// URL
+(or a plain path) to a local mirror of the archive, for offline use; its size
+and modification time stand in for the ETag.
+"""
+import hashlib
+import json
+import logging
 import os
-import pandas as pd
+import tempfile
+import zipfile
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
 import requests
+
 from config import config
 
-DATA_URL = config.DATA_URL
-OUTPUT_DIR = config.DATA_DIR
-CSV_PATH = config.CSV_PATH
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_meta(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
 
-def download_dataset():
+def _save_meta(path, meta):
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(meta, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def _write_stream(chunks, dest, expected_sha256=None):
     """
-    Downloads Heart Disease dataset from UCI Repository.
-    Extracts and saves as heart.csv.
-    Returns path to CSV.
+    Writes chunks to dest through a temporary file; returns the SHA-256 of the bytes.
+    dest is only replaced once the bytes match expected_sha256 (if given).
+
+    Raises:
+        ValueError: The bytes do not match expected_sha256; dest is left as it was.
+    """
+    digest = hashlib.sha256()
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(dest)}-", dir=os.path.dirname(dest) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                f.write(chunk)
+        if expected_sha256 and digest.hexdigest() != expected_sha256:
+            raise ValueError(f"Checksum mismatch: expected {expected_sha256}, got {digest.hexdigest()}")
+        os.replace(tmp, dest)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    return digest.hexdigest()
+
+
+def _local_source(url):
+    """Path of a file:// URL or plain path; None for remote URLs."""
+    parsed = urlparse(url)
+    if parsed.scheme == "file":
+        return url2pathname(parsed.netloc + parsed.path)
+    if parsed.scheme == "" or (len(parsed.scheme) == 1 and os.name == "nt"):  # drive letter
+        return url
+    return None
+
+
+def _fetch_local(source, dest, meta, expected_sha256=None):
+    """Copies a local mirror unless its size and mtime match the recorded ones."""
+    st = os.stat(source)
+    etag = f"{st.st_size}-{st.st_mtime_ns}"
+    if meta.get("etag") == etag and os.path.exists(dest):
+        return None
+    with open(source, "rb") as f:
+        sha256 = _write_stream(iter(lambda: f.read(CHUNK_SIZE), b""), dest, expected_sha256)
+    return {"etag": etag, "sha256": sha256}
+
+
+def _fetch_remote(url, dest, meta, timeout, expected_sha256=None):
+    """Streams url to dest; conditional on the recorded ETag / Last-Modified."""
+    headers = {}
+    if os.path.exists(dest):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+    with requests.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        sha256 = _write_stream(response.iter_content(chunk_size=CHUNK_SIZE), dest, expected_sha256)
+        return {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "sha256": sha256,
+        }
+
+
+def fetch(url, dest, expected_sha256=None, timeout=None):
+    """
+    Makes dest a current copy of url, downloading only when needed.
+
+    Returns:
+        True if dest was (re)written, False if the local copy was kept.
+
+    Raises:
+        ValueError: The downloaded file does not match expected_sha256. A
+                    previous dest is kept.
     """
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
+    meta_path = f"{dest}.meta.json"
+    meta = _load_meta(meta_path)
+    if meta.get("url") != url:
+        meta = {}
+
+    if expected_sha256 and os.path.exists(dest):
+        local_sha256 = _sha256(dest)
+        if local_sha256 == expected_sha256:
+            logger.info(f"{dest} matches the expected checksum; not downloading")
+            if meta.get("url") != url or meta.get("sha256") != local_sha256:
+                _save_meta(meta_path, {**meta, "url": url, "sha256": local_sha256})
+            return False
+        # Revalidating would keep the bad copy on a 304 / unchanged mirror
+        logger.warning(f"{dest} does not match the expected checksum; downloading it again")
+        meta = {}
+
+    source = _local_source(url)
+    try:
+        if source is not None:
+            fetched = _fetch_local(source, dest, meta, expected_sha256)
+        else:
+            fetched = _fetch_remote(url, dest, meta, timeout or config.DATA_DOWNLOAD_TIMEOUT_SECONDS,
+                                    expected_sha256)
+    except ValueError as e:
+        raise ValueError(f"{e} for {url}") from e
+    if fetched is None:
+        if expected_sha256 and _sha256(dest) != expected_sha256:
+            raise ValueError(f"Checksum mismatch for {url}: {dest} is unchanged at the source "
+                             f"but does not match {expected_sha256}")
+        logger.info(f"{dest} is up to date with {url}")
+        return False
+
+    _save_meta(meta_path, {"url": url, **fetched})
+    return True
 
-    zip_path = os.path.join(OUTPUT_DIR, "heart.zip")
 
-    # Download
-    print("Downloading dataset...")
-    r = requests.get(DATA_URL)
-    with open(zip_path, "wb") as f:
-        f.write(r.content)
+def _pick_member(archive, target_file):
+    """Archive member named target_file (in any folder), else the first .data file."""
+    names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    for name in names:
+        if os.path.basename(name) == target_file:
+            return name
+    print(f"Warning: {target_file} not found. Searching for .data files...")
+    for name in names:
+        if name.endswith(".data"):
+            print(f"Used fallback file: {name}")
+            return name
+    raise FileNotFoundError(f"No {target_file} or other .data file in the archive")
 
-    # Unzip
-    import zipfile
-    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(OUTPUT_DIR)
+
+def extract_member(zip_path, target_file, csv_path):
+    """Copies one archive member, unchanged, to csv_path; returns the member name."""
+    with zipfile.ZipFile(zip_path) as archive:
+        member = _pick_member(archive, target_file)
+        with archive.open(member) as src:
+            _write_stream(iter(lambda: src.read(CHUNK_SIZE), b""), csv_path)
+    return member
+
+
+def download_dataset(url=None, output_dir=None, csv_path=None):
+    """
+    Downloads Heart Disease dataset from UCI Repository (or a file:// mirror).
+    Extracts TARGET_DATA_FILE as heart.csv, skipping work that is already done.
+    Returns path to CSV.
+    """
+    url = url or config.DATA_URL
+    output_dir = output_dir or config.DATA_DIR
+    csv_path = csv_path or config.CSV_PATH
+    os.makedirs(output_dir, exist_ok=True)
+
+    zip_path = os.path.join(output_dir, "heart.zip")
+    print(f"Fetching dataset from {url}...")
+    downloaded = fetch(url, zip_path, expected_sha256=config.DATA_SHA256 or None)
+
+    # The CSV is current if it was extracted from this archive and not modified since
+    meta_path = f"{zip_path}.meta.json"
+    meta = _load_meta(meta_path)
+    extracted = meta.get("extracted", {})
+    if (not downloaded and extracted.get("target") == config.TARGET_DATA_FILE
+            and os.path.exists(csv_path) and extracted.get("csv_sha256") == _sha256(csv_path)):
+        print(f"Dataset already up to date at {csv_path}")
+        return csv_path
 
     # UCI dataset includes multiple files; select processed Cleveland data
-    target_file = config.TARGET_DATA_FILE
-    extracted_files = os.listdir(OUTPUT_DIR)
-
-    if target_file in extracted_files:
-        # Read the data - it has no header
-        df = pd.read_csv(os.path.join(OUTPUT_DIR, target_file), header=None)
-        df.to_csv(CSV_PATH, index=False, header=False)  # Keep it raw, preprocessing will add headers
-        print(f"Successfully extracted {target_file}")
-    else:
-        # Fallback if specific file not found (unlikely with correct zip)
-        print(f"Warning: {target_file} not found. Searching for .data files...")
-        for file in extracted_files:
-            if file.endswith(".data"):
-                df = pd.read_csv(os.path.join(OUTPUT_DIR, file), header=None)
-                df.to_csv(CSV_PATH, index=False, header=False)
-                print(f"Used fallback file: {file}")
-                break
-
-    print(f"Dataset saved at {CSV_PATH}")
-    return CSV_PATH
+    member = extract_member(zip_path, config.TARGET_DATA_FILE, csv_path)
+    print(f"Successfully extracted {member}")
+    meta["extracted"] = {"target": config.TARGET_DATA_FILE, "member": member, "csv_sha256": _sha256(csv_path)}
+    _save_meta(meta_path, meta)
+
+    print(f"Dataset saved at {csv_path}")
+    return csv_path
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     download_dataset()
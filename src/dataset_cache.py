@@ -0,0 +1,141 @@
+"""
+Content-addressed cache of the cleaned training dataset.
+
+train.py, experiment_tracking.py and model_packaging.py all train on the same
+cleaned CSV. load_training_data() cleans it once and stores the result under
+DATASET_CACHE_DIR/<key>/, where the key hashes the raw file's bytes, the
+preprocessing version and the cleaning code itself. A changed input file or a
+changed preprocessing.py therefore maps to a new entry, never to stale data.
+
+Each entry holds:
+    features.npy   float64 (rows, 13) in FEATURE_COLUMNS order
+    target.npy     int64 (rows,)
+    index.npy      int64 (rows,) row labels of the cleaned frame
+    meta.json      fitted preprocessor, source file and row count
+
+Arrays are memory-mapped read-only on load, so each stage gets its DataFrame
+without parsing or copying the data.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import preprocessing
+from config import config
+from preprocessing import FEATURE_COLUMNS, PREPROCESSING_VERSION, HeartDiseasePreprocessor
+
+logger = logging.getLogger(__name__)
+
+_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_key(path):
+    """Key of the cleaned form of path: raw bytes + cleaning version, code and schema."""
+    digest = hashlib.sha256()
+    digest.update(file_digest(path).encode())
+    digest.update(str(PREPROCESSING_VERSION).encode())
+    for module_path in (preprocessing.__file__, __file__):
+        with open(module_path, "rb") as f:
+            digest.update(f.read())
+    digest.update(json.dumps([config.COLUMN_NAMES, config.CATEGORICAL_COLUMNS]).encode())
+    return digest.hexdigest()[:32]
+
+
+def _clean(path):
+    # Read exactly as the training scripts always have
+    df = pd.read_csv(path)
+    preprocessor = HeartDiseasePreprocessor()
+    return preprocessor.fit_transform(df), preprocessor
+
+
+def _write_entry(cache_dir, key, clean, preprocessor, source):
+    """Writes the entry to a temporary directory and renames it into place."""
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=f".{key}-", dir=cache_dir)
+    try:
+        np.save(os.path.join(tmp, "features.npy"),
+                np.ascontiguousarray(clean[FEATURE_COLUMNS].to_numpy(dtype=np.float64)))
+        np.save(os.path.join(tmp, "target.npy"), clean["target"].to_numpy(dtype=np.int64))
+        np.save(os.path.join(tmp, "index.npy"), clean.index.to_numpy(dtype=np.int64))
+        with open(os.path.join(tmp, "meta.json"), "w") as f:
+            json.dump({
+                "source": source,
+                "rows": len(clean),
+                "preprocessor": preprocessor.to_dict(),
+            }, f)
+        os.rename(tmp, os.path.join(cache_dir, key))
+    except OSError:
+        # Another process stored the same entry first; theirs is identical
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not os.path.isdir(os.path.join(cache_dir, key)):
+            raise
+
+
+def _read_entry(entry_dir):
+    with open(os.path.join(entry_dir, "meta.json")) as f:
+        meta = json.load(f)
+    # Plain ndarray views of the read-only mappings
+    features = np.load(os.path.join(entry_dir, "features.npy"), mmap_mode="r").view(np.ndarray)
+    target = np.load(os.path.join(entry_dir, "target.npy"), mmap_mode="r").view(np.ndarray)
+    index = pd.Index(np.load(os.path.join(entry_dir, "index.npy")))
+    X = pd.DataFrame(features, columns=FEATURE_COLUMNS, index=index, copy=False)
+    y = pd.Series(target, index=index, name="target", copy=False)
+    return X, y, HeartDiseasePreprocessor.from_dict(meta["preprocessor"])
+
+
+def _prune(cache_dir, source, keep):
+    """Removes older entries built from the same source file."""
+    for name in os.listdir(cache_dir):
+        entry_dir = os.path.join(cache_dir, name)
+        if name == keep or name.startswith(".") or not os.path.isdir(entry_dir):
+            continue
+        try:
+            with open(os.path.join(entry_dir, "meta.json")) as f:
+                stale = json.load(f)["source"] == source
+        except (OSError, ValueError, KeyError):
+            continue
+        if stale:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+
+def load_training_data(path=None, cache_dir=None):
+    """
+    Cleaned features and target of the raw dataset at path (config.CSV_PATH).
+
+    Returns:
+        (X, y, preprocessor): X is a DataFrame in FEATURE_COLUMNS order, y the
+        binarized target and preprocessor the fitted HeartDiseasePreprocessor.
+        X and y are read-only views of the cached arrays.
+    """
+    path = path or config.CSV_PATH
+    if not config.DATASET_CACHE_ENABLED:
+        clean, preprocessor = _clean(path)
+        return clean[FEATURE_COLUMNS], clean["target"], preprocessor
+
+    cache_dir = cache_dir or config.DATASET_CACHE_DIR
+    key = cache_key(path)
+    entry_dir = os.path.join(cache_dir, key)
+    if os.path.isdir(entry_dir):
+        logger.info(f"Dataset cache hit: {entry_dir}")
+    else:
+        logger.info(f"Dataset cache miss; cleaning {path}")
+        clean, preprocessor = _clean(path)
+        source = os.path.abspath(path)
+        _write_entry(cache_dir, key, clean, preprocessor, source)
+        _prune(cache_dir, source, keep=key)
+    return _read_entry(entry_dir)
@@ -0,0 +1,284 @@
+"""
+Online feature-drift monitoring for the API.
+
+At training time ReferenceProfile.fit() summarizes each of the 13 model
+features on the training rows: decile cut points (numeric features) or the
+observed levels (categorical features), the share of rows per bin, mean and
+standard deviation. The profile is saved in the model's MLmodel metadata next
+to the preprocessor.
+
+At serving time request handlers hand each validated feature row to
+DriftMonitor.observe(), which only appends it to a bounded buffer. A
+background thread drains the buffer in bulk into fixed-size sketches per
+feature (row count, Welford mean/variance, bin counts in the reference
+profile's bins), then exports against the reference:
+
+    api_feature_drift_psi{feature}   population stability index
+    api_feature_drift_ks{feature}    max CDF gap over the bins (KS statistic)
+
+Memory is fixed by the number of bins, whatever the traffic. The sketches
+start over when the serving model (and so its profile) changes.
+"""
+import logging
+import threading
+from collections import deque
+
+import numpy as np
+from prometheus_client import Counter, Gauge
+
+from config import config
+from preprocessing import FEATURE_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+PROFILE_VERSION = 1
+
+# Floor for empty bins, so PSI stays finite
+_EPSILON = 1e-4
+
+FEATURE_DRIFT_PSI = Gauge(
+    "api_feature_drift_psi",
+    "Population stability index of live feature values against the training profile",
+    ["feature"],
+    multiprocess_mode="livemax"
+)
+FEATURE_DRIFT_KS = Gauge(
+    "api_feature_drift_ks",
+    "Largest gap between live and training CDFs over the profile bins",
+    ["feature"],
+    multiprocess_mode="livemax"
+)
+DRIFT_ROWS = Gauge(
+    "api_drift_observed_rows",
+    "Rows summarized since the serving model's profile was loaded",
+    multiprocess_mode="livesum"
+)
+DRIFT_DROPPED = Counter(
+    "api_drift_dropped_rows_total",
+    "Rows not summarized because the drift buffer was full"
+)
+
+
+def _bin_index(cuts, categorical, values):
+    """
+    Numeric: bin i holds values in [cuts[i-1], cuts[i]).
+    Categorical: bin i holds level cuts[i]; unseen levels go to the last bin.
+    """
+    if not categorical:
+        return np.searchsorted(cuts, values, side="right")
+    idx = np.minimum(np.searchsorted(cuts, values), len(cuts) - 1)
+    return np.where(cuts[idx] == values, idx, len(cuts))
+
+
+class ReferenceProfile:
+    """
+    Per-feature training distribution.
+
+    Args:
+        features: {column: {"kind": "numeric" | "categorical", "cuts": [...],
+                  "proportions": [...], "mean": float, "std": float}} for every
+                  column in FEATURE_COLUMNS. Numeric bins are split at cuts;
+                  categorical bins are the levels in cuts plus an "unseen" bin.
+        rows: Training rows the profile was computed from.
+    """
+
+    def __init__(self, features, rows):
+        self.features = features
+        self.rows = rows
+        self._cuts = [np.asarray(features[col]["cuts"], dtype=np.float64) for col in FEATURE_COLUMNS]
+        self._categorical = [features[col]["kind"] == "categorical" for col in FEATURE_COLUMNS]
+        self.proportions = [np.asarray(features[col]["proportions"], dtype=np.float64) for col in FEATURE_COLUMNS]
+        self.mean = np.array([features[col]["mean"] for col in FEATURE_COLUMNS])
+        self.std = np.array([features[col]["std"] for col in FEATURE_COLUMNS])
+
+    @property
+    def n_bins(self):
+        return [len(cuts) + 1 for cuts in self._cuts]
+
+    def bin_index(self, j, values):
+        """Bin of each value of feature j."""
+        return _bin_index(self._cuts[j], self._categorical[j], values)
+
+    @classmethod
+    def fit(cls, X, bins=None, categorical_columns=None):
+        """Profile of a feature frame (or array) in FEATURE_COLUMNS order."""
+        bins = bins or config.DRIFT_BINS
+        categorical_columns = config.CATEGORICAL_COLUMNS if categorical_columns is None else categorical_columns
+        values = np.asarray(X, dtype=np.float64)
+        features = {}
+        for j, col in enumerate(FEATURE_COLUMNS):
+            column = values[:, j]
+            categorical = col in categorical_columns
+            if categorical:
+                cuts = np.unique(column)
+            else:
+                cuts = np.unique(np.quantile(column, np.linspace(0, 1, bins + 1)[1:-1]))
+            counts = np.bincount(_bin_index(cuts, categorical, column), minlength=len(cuts) + 1)
+            features[col] = {
+                "kind": "categorical" if categorical else "numeric",
+                "cuts": cuts.tolist(),
+                "proportions": (counts / len(column)).tolist(),
+                "mean": float(column.mean()),
+                "std": float(column.std()),
+            }
+        return cls(features, len(values))
+
+    def to_dict(self):
+        return {"version": PROFILE_VERSION, "rows": self.rows, "features": self.features}
+
+    @classmethod
+    def from_dict(cls, state):
+        if state.get("version") != PROFILE_VERSION:
+            raise ValueError(f"Drift profile version {state.get('version')} does not match {PROFILE_VERSION}")
+        return cls(state["features"], state["rows"])
+
+    def to_metadata(self):
+        """MLmodel metadata entry; pass as log_model/save_model(metadata=...)."""
+        return {"drift_profile": self.to_dict()}
+
+    @classmethod
+    def from_metadata(cls, metadata):
+        """The profile saved in a model's metadata, or None for older models."""
+        if not metadata or "drift_profile" not in metadata:
+            return None
+        return cls.from_dict(metadata["drift_profile"])
+
+
+def psi(live, reference):
+    """Population stability index of two bin-share vectors."""
+    live = np.maximum(live, _EPSILON)
+    reference = np.maximum(reference, _EPSILON)
+    return float(np.sum((live - reference) * np.log(live / reference)))
+
+
+def ks(live, reference):
+    """Largest absolute difference of the cumulative bin shares."""
+    return float(np.max(np.abs(np.cumsum(live) - np.cumsum(reference))))
+
+
+class DriftMonitor:
+    """
+    Buffered, fixed-memory summaries of live feature values.
+
+    Args:
+        profile_source: Callable returning the serving model's ReferenceProfile
+                        (or None); read on every flush.
+        buffer_size: Rows held before new ones are dropped.
+        flush_interval: Seconds between background flushes.
+    """
+
+    def __init__(self, profile_source, buffer_size=100000, flush_interval=5.0):
+        self.profile_source = profile_source
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._buffer = deque()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._psi_gauges = [FEATURE_DRIFT_PSI.labels(feature=col) for col in FEATURE_COLUMNS]
+        self._ks_gauges = [FEATURE_DRIFT_KS.labels(feature=col) for col in FEATURE_COLUMNS]
+        self._reset(None)
+
+    def _reset(self, profile):
+        self.profile = profile
+        self.count = 0
+        self._mean = np.zeros(len(FEATURE_COLUMNS))
+        self._m2 = np.zeros(len(FEATURE_COLUMNS))
+        self._counts = [np.zeros(n, dtype=np.int64) for n in profile.n_bins] if profile is not None else []
+
+    def observe(self, features):
+        """
+        Hot path: one append, no computation. features is a validated input
+        dict or a list in FEATURE_COLUMNS order and must not be mutated afterwards.
+        """
+        if len(self._buffer) >= self.buffer_size:
+            DRIFT_DROPPED.inc()
+            return
+        self._buffer.append(features)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="drift-monitor", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:  # keep summarizing; a bad batch must not stop monitoring
+                logger.error(f"Drift monitor flush failed: {e}")
+
+    def flush(self):
+        """Folds buffered rows into the sketches and updates the gauges; returns the rows taken."""
+        with self._lock:
+            n = len(self._buffer)
+            rows = [self._buffer.popleft() for _ in range(n)]
+            profile = self.profile_source()
+            if profile is not self.profile:
+                self._reset(profile)
+            if profile is None or not rows:
+                return n
+
+            X = np.array([[row[col] for col in FEATURE_COLUMNS] if isinstance(row, dict) else row
+                          for row in rows], dtype=np.float64)
+            X = X[np.isfinite(X).all(axis=1)]
+            if len(X):
+                self._update(X)
+                self._export()
+            return n
+
+    def _update(self, X):
+        # Chan et al.'s pairwise combination of Welford running moments
+        k = len(X)
+        batch_mean = X.mean(axis=0)
+        batch_m2 = ((X - batch_mean) ** 2).sum(axis=0)
+        total = self.count + k
+        delta = batch_mean - self._mean
+        self._mean += delta * k / total
+        self._m2 += batch_m2 + delta ** 2 * self.count * k / total
+        self.count = total
+        for j, counts in enumerate(self._counts):
+            counts += np.bincount(self.profile.bin_index(j, X[:, j]), minlength=len(counts))
+
+    def _scores(self):
+        for j, counts in enumerate(self._counts):
+            live = counts / self.count
+            reference = self.profile.proportions[j]
+            yield j, psi(live, reference), ks(live, reference)
+
+    def _export(self):
+        for j, psi_score, ks_score in self._scores():
+            self._psi_gauges[j].set(psi_score)
+            self._ks_gauges[j].set(ks_score)
+        DRIFT_ROWS.set(self.count)
+
+    def snapshot(self):
+        """Live statistics and drift scores per feature, next to the reference."""
+        with self._lock:
+            if self.profile is None:
+                return {"rows": self.count, "features": {}}
+            std = np.sqrt(self._m2 / self.count) if self.count else np.full(len(FEATURE_COLUMNS), np.nan)
+            scores = {j: (p, k) for j, p, k in self._scores()} if self.count else {}
+            return {
+                "rows": self.count,
+                "reference_rows": self.profile.rows,
+                "features": {
+                    col: {
+                        "mean": float(self._mean[j]) if self.count else None,
+                        "std": float(std[j]) if self.count else None,
+                        "reference_mean": float(self.profile.mean[j]),
+                        "reference_std": float(self.profile.std[j]),
+                        "psi": scores[j][0] if scores else None,
+                        "ks": scores[j][1] if scores else None,
+                    }
+                    for j, col in enumerate(FEATURE_COLUMNS)
+                },
+            }
+
+    def close(self):
+        """Stops the background thread and summarizes whatever is still buffered."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
@@ -1,6 +1,11 @@
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
 import mlflow
 import mlflow.sklearn
-import pandas as pd
+from mlflow.tracking import MlflowClient
 
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
@@ -9,95 +14,26 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
 
 from config import config
-from preprocessing import clean_dataset
+from dataset_cache import load_training_data
+from drift_monitor import ReferenceProfile
+from model_registry import ModelRegistry
 from model_utils import get_model_metrics
+from tracking_logger import RunLogger
 
 
-def run_experiment():
-    """
-    Runs an MLflow experiment training both Logistic Regression and Random Forest on the cleaned Heart Disease dataset.
-    Logs:
-    - Parameters
-    - Metrics
-    - Models
-    - Artifacts (comparison CSV)
-    """
-
-    # Load dataset
-    df = pd.read_csv(config.CSV_PATH)
-    df = clean_dataset(df)
-
-    X = df.drop("target", axis=1)
-    y = df["target"]
-
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE
-    )
+CANDIDATES = ["logistic_regression", "random_forest"]
 
-    # ==========================================================
-    # MLflow experiment
-    # ==========================================================
-    import os
-    # Determine the absolute path to the project root (one level up from src/) since this file is in src/
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(current_dir)
-    mlflow.set_tracking_uri(config.MLFLOW_TRACKING_URI)
-    mlflow.set_experiment(config.EXPERIMENT_NAME)
-
-    # Helper to log plots
-    import matplotlib.pyplot as plt
-    from sklearn.metrics import ConfusionMatrixDisplay, RocCurveDisplay
 
-    def log_plots(model, X_test, y_test, model_name):
-        # Confusion Matrix
-        plt.figure(figsize=(6, 6))
-        ConfusionMatrixDisplay.from_estimator(model, X_test, y_test, cmap='Blues')
-        plt.title(f"Confusion Matrix: {model_name}")
-        cm_path = f"{model_name}_confusion_matrix.png"
-        plt.savefig(cm_path)
-        mlflow.log_artifact(cm_path)
-        plt.close()
-
-        # ROC Curve
-        plt.figure(figsize=(6, 6))
-        RocCurveDisplay.from_estimator(model, X_test, y_test)
-        plt.title(f"ROC Curve: {model_name}")
-        roc_path = f"{model_name}_roc_curve.png"
-        plt.savefig(roc_path)
-        mlflow.log_artifact(roc_path)
-        plt.close()
-
-    # ----- 1. Logistic Regression -----
-    with mlflow.start_run(run_name="logistic_regression_run"):
-        log_reg = Pipeline([
+def build_candidate(name):
+    """Untrained pipeline for a candidate model and the parameters logged with it."""
+    if name == "logistic_regression":
+        model = Pipeline([
             ("scaler", StandardScaler()),
             ("clf", LogisticRegression(max_iter=config.LOGREG_MAX_ITER))
         ])
-        log_reg.fit(X_train, y_train)
-
-        metrics = get_model_metrics(log_reg, X_test, y_test)
-
-        # Log parameters
-        mlflow.log_params({
-            "model": "Logistic Regression",
-            "scaler": "StandardScaler",
-            "max_iter": 1000
-        })
-
-        # Log metrics
-        mlflow.log_metrics(metrics)
-
-        # Log plots
-        log_plots(log_reg, X_test, y_test, "logistic_regression")
-
-        # Log model
-        mlflow.sklearn.log_model(log_reg, "logistic_regression")
-        print(f"Logistic Regression Run ID: {mlflow.active_run().info.run_id}")
-        print(f"Artifact URI: {mlflow.get_artifact_uri()}")
-
-    # ----- 2. Random Forest -----
-    with mlflow.start_run(run_name="random_forest_run"):
-        rf = Pipeline([
+        return model, {"model": "Logistic Regression", "scaler": "StandardScaler", "max_iter": 1000}
+    if name == "random_forest":
+        model = Pipeline([
             ("scaler", StandardScaler()),
             ("clf", RandomForestClassifier(
                 n_estimators=config.RF_N_ESTIMATORS,
@@ -105,31 +41,142 @@ def run_experiment():
                 random_state=config.RANDOM_STATE
             ))
         ])
-        rf.fit(X_train, y_train)
+        return model, {"model": "RandomForest", "n_estimators": 200, "max_depth": 6}
+    raise ValueError(f"Unknown candidate model: {name}")
+
+
+def train_candidate(name, data, metadata, tracking_uri, experiment_id):
+    """
+    Trains one candidate in its own MLflow run and logs parameters, metrics
+    and the model. Runs in a worker process; returns the fitted model for plotting.
+    """
+    X_train, X_test, y_train, y_test = data
+    mlflow.set_tracking_uri(tracking_uri)
+    model, params = build_candidate(name)
+
+    with mlflow.start_run(experiment_id=experiment_id, run_name=f"{name}_run") as run, \
+            RunLogger(run.info.run_id, MlflowClient(tracking_uri)) as tracker:
+        # Buffered: sent in the background while the model trains
+        tracker.log_params(params)
+        model.fit(X_train, y_train)
+        metrics = get_model_metrics(model, X_test, y_test)
+        tracker.log_metrics(metrics)
+        # Synchronous: the returned URI is the result of this function
+        model_info = mlflow.sklearn.log_model(model, name, metadata=metadata)
+        artifact_uri = mlflow.get_artifact_uri()
+        model_location = mlflow.get_logged_model(model_info.model_id).artifact_location
+
+    return {
+        "name": name,
+        "model": model,
+        "run_id": run.info.run_id,
+        "artifact_uri": artifact_uri,
+        "model_uri": model_info.model_uri,
+        "model_location": model_location,
+        "metrics": metrics,
+    }
+
+
+def log_plots(model, X_test, y_test, model_name, tracker):
+    """
+    Renders the confusion matrix and ROC curve and uploads them through tracker.
+    Uses Figure objects rather than pyplot's global state, so it is safe on a
+    background thread; files go to a private temporary directory.
+    """
+    from matplotlib.figure import Figure
+    from sklearn.metrics import ConfusionMatrixDisplay, RocCurveDisplay
 
-        metrics = get_model_metrics(rf, X_test, y_test)
+    plots = [
+        ("confusion_matrix", f"Confusion Matrix: {model_name}",
+         lambda ax: ConfusionMatrixDisplay.from_estimator(model, X_test, y_test, cmap='Blues', ax=ax)),
+        ("roc_curve", f"ROC Curve: {model_name}",
+         lambda ax: RocCurveDisplay.from_estimator(model, X_test, y_test, ax=ax)),
+    ]
+    with tempfile.TemporaryDirectory(prefix=f"{model_name}-plots-") as tmp:
+        for kind, title, draw in plots:
+            fig = Figure(figsize=(6, 6))
+            ax = fig.subplots()
+            draw(ax)
+            ax.set_title(title)
+            path = os.path.join(tmp, f"{model_name}_{kind}.png")
+            fig.savefig(path)
+            tracker.log_artifact(path)
+        # The files must exist until uploaded
+        tracker.flush()
 
-        # Log parameters
-        mlflow.log_params({
-            "model": "RandomForest",
-            "n_estimators": 200,
-            "max_depth": 6
-        })
 
-        # Log metrics
-        mlflow.log_metrics(metrics)
+def run_experiment():
+    """
+    Runs an MLflow experiment training both Logistic Regression and Random Forest on the cleaned Heart Disease dataset.
+    The candidates train concurrently in worker processes, each in its own run;
+    plots are rendered and uploaded on background threads.
+    Logs:
+    - Parameters
+    - Metrics
+    - Models
+    - Artifacts (confusion matrix and ROC curve plots)
+    Every model is added to the model registry; the Random Forest becomes its
+    "candidate" alias. Returns the Random Forest model URI.
+    """
 
-        # Log plots
-        log_plots(rf, X_test, y_test, "random_forest")
+    # Load dataset
+    X, y, preprocessor = load_training_data()
 
-        # Log model
-        model_info = mlflow.sklearn.log_model(rf, "random_forest")
-        print(f"Random Forest Run ID: {mlflow.active_run().info.run_id}")
-        print(f"Artifact URI: {mlflow.get_artifact_uri()}")
-        print(f"Model URI: {model_info.model_uri}")
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE
+    )
 
+    # ==========================================================
+    # MLflow experiment
+    # ==========================================================
+    tracking_uri = config.MLFLOW_TRACKING_URI
+    mlflow.set_tracking_uri(tracking_uri)
+    experiment_id = mlflow.set_experiment(config.EXPERIMENT_NAME).experiment_id
+
+    data = (X_train, X_test, y_train, y_test)
+    # Saved with every model: the fitted encoding and the training feature profile for drift monitoring
+    metadata = {**preprocessor.to_metadata(), **ReferenceProfile.fit(X_train).to_metadata()}
+    args = (data, metadata, tracking_uri, experiment_id)
+    workers = config.EXPERIMENT_WORKERS or min(len(CANDIDATES), os.cpu_count() or 1)
+    model_uris = {}
+    registry = ModelRegistry()
+
+    with ThreadPoolExecutor(max_workers=len(CANDIDATES), thread_name_prefix="plots") as plotter:
+        plot_jobs = []
+        trackers = []
+
+        def on_trained(result):
+            print(f"{result['name']} Run ID: {result['run_id']}")
+            print(f"Artifact URI: {result['artifact_uri']}")
+            model_uris[result["name"]] = result["model_uri"]
+            registry.register(result["name"], result["model_location"], result["metrics"], result["run_id"],
+                              aliases=["candidate"] if result["name"] == "random_forest" else [])
+            tracker = RunLogger(result["run_id"], MlflowClient(tracking_uri))
+            trackers.append(tracker)
+            plot_jobs.append(plotter.submit(log_plots, result["model"], X_test, y_test, result["name"], tracker))
+
+        if workers == 1:
+            for name in CANDIDATES:
+                on_trained(train_candidate(name, *args))
+        else:
+            # spawn: this may be called from threads (pipeline runner, API auto-training),
+            # where forking could copy held locks into the children
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [pool.submit(train_candidate, name, *args) for name in CANDIDATES]
+                for future in as_completed(futures):
+                    on_trained(future.result())
+
+        try:
+            for job in plot_jobs:
+                job.result()
+        finally:
+            for tracker in trackers:
+                tracker.close()
+
+    print(f"Model URI: {model_uris['random_forest']}")
     print("MLflow experiment completed. Run 'mlflow ui' to view results.")
-    return model_info.model_uri
+    return model_uris["random_forest"]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+"""
+Compiles a fitted scikit-learn Pipeline (StandardScaler + RandomForestClassifier)
+into flat NumPy node arrays, and evaluates all trees for a batch of rows with
+vectorized gathers instead of per-estimator Python dispatch.
+"""
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+
+class CompiledForest:
+    """
+    Flattened random forest.
+
+    All trees share contiguous node arrays (feature, threshold, left, right,
+    value). Child indices are global, and leaves point back to themselves so
+    every row can take exactly max_depth steps without masking.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth,
+                 classes, mean=None, scale=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.mean = mean
+        self.scale = scale
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def predict_proba(self, X):
+        """
+        Class probabilities for a 2D array of rows in training column order.
+        Mirrors sklearn: scale in float64, compare in float32, average
+        normalized leaf values over trees.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if self.mean is not None:
+            X = X - self.mean
+        if self.scale is not None:
+            X = X / self.scale
+        X = X.astype(np.float32)
+
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.repeat(self.roots[None, :], X.shape[0], axis=0)
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        return self.value[node].mean(axis=1)
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+
+def _split_pipeline(model):
+    """Returns (scaler or None, forest) for a supported model."""
+    if isinstance(model, Pipeline):
+        *transforms, (_, forest) = model.steps
+        transforms = [step for _, step in transforms if step not in (None, "passthrough")]
+        if len(transforms) > 1 or (transforms and not isinstance(transforms[0], StandardScaler)):
+            raise TypeError("Only a single StandardScaler step is supported before the forest")
+        scaler = transforms[0] if transforms else None
+    else:
+        scaler, forest = None, model
+
+    if not isinstance(forest, RandomForestClassifier):
+        raise TypeError(f"Expected RandomForestClassifier, got {type(forest).__name__}")
+    if not hasattr(forest, "estimators_"):
+        raise ValueError("Forest is not fitted")
+    return scaler, forest
+
+
+def float32_thresholds(threshold):
+    """
+    Float32 copy of float64 split thresholds, rounded down.
+
+    Features are compared as float32, and for any float32 x, x <= t holds
+    exactly when x <= the largest float32 not above t. The result therefore
+    sends every row down the same branches at half the memory.
+    """
+    threshold = np.asarray(threshold, dtype=np.float64)
+    rounded = threshold.astype(np.float32)
+    above = rounded.astype(np.float64) > threshold
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def compile_pipeline(model):
+    """
+    Flattens a fitted Pipeline (optional StandardScaler + RandomForestClassifier)
+    or a bare RandomForestClassifier into a CompiledForest.
+    """
+    scaler, forest = _split_pipeline(model)
+
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        n = tree.node_count
+        is_leaf = tree.children_left == -1
+        own_index = np.arange(offset, offset + n)
+
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(np.where(is_leaf, np.inf, tree.threshold))
+        lefts.append(np.where(is_leaf, own_index, tree.children_left + offset))
+        rights.append(np.where(is_leaf, own_index, tree.children_right + offset))
+
+        # Older sklearn stores weighted counts; normalize to per-leaf class fractions
+        leaf_value = tree.value[:, 0, :]
+        totals = leaf_value.sum(axis=1, keepdims=True)
+        values.append(np.divide(leaf_value, totals, out=np.zeros_like(leaf_value), where=totals > 0))
+
+        roots.append(offset)
+        max_depth = max(max_depth, tree.max_depth)
+        offset += n
+
+    mean = scale = None
+    if scaler is not None:
+        mean = scaler.mean_ if scaler.with_mean else None
+        scale = scaler.scale_ if scaler.with_std else None
+
+    return CompiledForest(
+        feature=np.ascontiguousarray(np.concatenate(features), dtype=np.intp),
+        threshold=np.ascontiguousarray(float32_thresholds(np.concatenate(thresholds))),
+        left=np.ascontiguousarray(np.concatenate(lefts), dtype=np.intp),
+        right=np.ascontiguousarray(np.concatenate(rights), dtype=np.intp),
+        value=np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+        roots=np.asarray(roots, dtype=np.intp),
+        max_depth=max_depth,
+        classes=forest.classes_,
+        mean=mean,
+        scale=scale,
+    )
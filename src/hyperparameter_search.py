@@ -0,0 +1,221 @@
+"""
+Budget-aware successive-halving hyperparameter search.
+
+An exhaustive grid fits every combination with the full resource on every CV
+fold. Successive halving instead scores all candidates with a small resource
+(few trees, or a fraction of the rows), keeps the best 1/factor of them,
+multiplies the resource by factor, and repeats until the last rung runs at the
+full resource. Most of the poor candidates are discarded after cheap fits.
+
+The search can also stop on a fit count or a wall-clock budget. The best
+candidate is then taken from the highest rung reached, where all candidates
+were scored with the same resource.
+
+SuccessiveHalvingSearch mirrors the parts of GridSearchCV that train.py uses:
+fit(), best_params_, best_score_, best_index_, best_estimator_ and
+cv_results_. summary_ reports fits and seconds spent against an estimate for
+the exhaustive grid.
+"""
+import logging
+import math
+import time
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, cross_val_score
+
+logger = logging.getLogger(__name__)
+
+N_SAMPLES = "n_samples"
+
+
+def _stratified_order(y, rng):
+    """Row order in which every prefix has (nearly) the class balance of y."""
+    y = np.asarray(y)
+    keys = np.empty(len(y))
+    for cls in np.unique(y):
+        idx = np.flatnonzero(y == cls)
+        rng.shuffle(idx)
+        keys[idx] = (np.arange(len(idx)) + 0.5) / len(idx)
+    return np.argsort(keys, kind="stable")
+
+
+def _take(data, rows):
+    return data.iloc[rows] if hasattr(data, "iloc") else np.asarray(data)[rows]
+
+
+class SuccessiveHalvingSearch:
+    """
+    Args:
+        estimator: Estimator or Pipeline to tune.
+        param_grid: Dict of parameter lists, as for GridSearchCV.
+        resource: "n_samples" (training rows), or the name of an integer
+                  estimator parameter such as "model__n_estimators". A resource
+                  parameter is removed from the candidates; its largest grid
+                  value is the full resource.
+        factor: Candidates kept per rung is 1/factor; the resource grows by factor.
+        min_resource: Resource of the first rung (default: small enough that
+                      halving can narrow the candidates down to one).
+        n_candidates: Candidates sampled from the grid when sampling="random".
+        sampling: "grid" (every combination) or "random".
+        max_fits: Stop before exceeding this many fits, the final refit included
+                  (0/None: no limit).
+        max_seconds: Stop starting new evaluations after this many seconds.
+        cv, scoring, n_jobs: Passed to cross_val_score.
+        random_state: Seed for candidate sampling and row subsampling.
+    """
+
+    def __init__(self, estimator, param_grid, resource=N_SAMPLES, factor=3, min_resource=None,
+                 n_candidates=None, sampling="grid", max_fits=None, max_seconds=None,
+                 cv=5, scoring="accuracy", n_jobs=None, random_state=None):
+        if factor < 2:
+            raise ValueError("factor must be at least 2")
+        if sampling not in ("grid", "random"):
+            raise ValueError(f"Unknown sampling: {sampling}")
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.resource = resource
+        self.factor = factor
+        self.min_resource = min_resource
+        self.n_candidates = n_candidates
+        self.sampling = sampling
+        self.max_fits = max_fits
+        self.max_seconds = max_seconds
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+    def _candidates(self, rng):
+        grid = {name: values for name, values in self.param_grid.items() if name != self.resource}
+        candidates = list(ParameterGrid(grid))
+        if self.sampling == "random" and self.n_candidates and self.n_candidates < len(candidates):
+            picked = rng.choice(len(candidates), self.n_candidates, replace=False)
+            candidates = [candidates[i] for i in sorted(picked)]
+        return candidates
+
+    def _max_resource(self, X):
+        if self.resource == N_SAMPLES:
+            return len(X)
+        if self.resource in self.param_grid:
+            return max(self.param_grid[self.resource])
+        return self.estimator.get_params()[self.resource]
+
+    def _schedule(self, n_candidates, max_resource, n_classes):
+        """Resource of each rung, smallest first; the last one is max_resource."""
+        needed = 1 + math.ceil(math.log(n_candidates, self.factor)) if n_candidates > 1 else 1
+        min_resource = self.min_resource
+        if not min_resource:
+            # Enough rows for every class in every fold; at least one tree
+            floor = 2 * self.cv * n_classes if self.resource == N_SAMPLES else 1
+            min_resource = max(floor, max_resource // self.factor ** (needed - 1))
+        possible = 1 + int(math.floor(math.log(max(max_resource / min_resource, 1), self.factor)))
+        n_rungs = max(1, min(needed, possible))
+        return [max(1, int(max_resource / self.factor ** (n_rungs - 1 - i))) for i in range(n_rungs)]
+
+    def _exhaustive_units(self, X):
+        """Resource units the exhaustive grid would spend, counting cv fits per combination."""
+        if self.resource == N_SAMPLES or self.resource not in self.param_grid:
+            return len(ParameterGrid(self.param_grid)) * self.cv * self._max_resource(X)
+        return sum(params[self.resource] for params in ParameterGrid(self.param_grid)) * self.cv
+
+    def _evaluate(self, params, resource, X, y, rows):
+        estimator = clone(self.estimator).set_params(**params)
+        if self.resource == N_SAMPLES:
+            X, y = _take(X, rows[:resource]), _take(y, rows[:resource])
+        else:
+            estimator.set_params(**{self.resource: resource})
+        return cross_val_score(estimator, X, y, cv=self.cv, scoring=self.scoring, n_jobs=self.n_jobs)
+
+    def fit(self, X, y):
+        rng = np.random.RandomState(self.random_state)
+        start = time.perf_counter()
+        candidates = self._candidates(rng)
+        max_resource = self._max_resource(X)
+        resources = self._schedule(len(candidates), max_resource, len(np.unique(y)))
+
+        rows = _stratified_order(y, rng) if self.resource == N_SAMPLES else None
+
+        results = {"params": [], "rung": [], "resource": [], "mean_test_score": [], "std_test_score": []}
+        fits = 0
+        units = 0
+        fit_seconds = 0.0
+        exhausted = False
+        survivors = list(range(len(candidates)))
+        last_rung = -1
+
+        for rung, resource in enumerate(resources):
+            scores = {}
+            for i in survivors:
+                elapsed = time.perf_counter() - start
+                # One fit stays reserved for the final refit
+                if (self.max_fits and fits + self.cv + 1 > self.max_fits) or \
+                        (self.max_seconds and elapsed >= self.max_seconds):
+                    exhausted = True
+                    break
+                eval_start = time.perf_counter()
+                fold_scores = self._evaluate(candidates[i], resource, X, y, rows)
+                fit_seconds += time.perf_counter() - eval_start
+                fits += self.cv
+                units += self.cv * resource
+                scores[i] = fold_scores.mean()
+
+                results["params"].append(candidates[i])
+                results["rung"].append(rung)
+                results["resource"].append(resource)
+                results["mean_test_score"].append(fold_scores.mean())
+                results["std_test_score"].append(fold_scores.std())
+
+            if scores:
+                last_rung = rung
+                # Stable ranking: ties keep grid order
+                ranked = sorted(scores, key=lambda i: -scores[i])
+                best_index = ranked[0]
+                best_score = scores[best_index]
+                # Row of the winner in cv_results_
+                best_result = len(results["params"]) - len(scores) + list(scores).index(best_index)
+                keep = max(1, math.ceil(len(survivors) / self.factor))
+                survivors = ranked[:keep]
+            # A single survivor needs no more scoring, only the final refit
+            if exhausted or len(survivors) == 1:
+                break
+
+        if last_rung < 0:
+            raise RuntimeError("Search budget too small to score a single candidate")
+        if exhausted:
+            logger.info(f"Search budget reached during rung {last_rung + 1} of {len(resources)}")
+
+        self.best_params_ = dict(candidates[best_index])
+        if self.resource != N_SAMPLES:
+            self.best_params_[self.resource] = max_resource
+        self.best_score_ = best_score
+        self.best_index_ = best_result
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y)
+        fits += 1
+        self.cv_results_ = {key: np.asarray(values) if key != "params" else values
+                            for key, values in results.items()}
+
+        seconds = time.perf_counter() - start
+        exhaustive_fits = len(ParameterGrid(self.param_grid)) * self.cv + 1
+        seconds_per_unit = fit_seconds / units if units else 0.0
+        exhaustive_seconds = seconds_per_unit * self._exhaustive_units(X) + (seconds - fit_seconds)
+        self.summary_ = {
+            "candidates": len(candidates),
+            "rungs": last_rung + 1,
+            "resources": resources[:last_rung + 1],
+            "budget_exhausted": exhausted,
+            "fits": fits,
+            "exhaustive_fits": exhaustive_fits,
+            "fits_saved": exhaustive_fits - fits,
+            "seconds": round(seconds, 3),
+            "exhaustive_seconds_estimate": round(exhaustive_seconds, 3),
+            "seconds_saved_estimate": round(exhaustive_seconds - seconds, 3),
+        }
+        return self
+
+    def describe(self):
+        s = self.summary_
+        return (f"Successive halving: {s['candidates']} candidates over {s['rungs']} rungs "
+                f"(resources {s['resources']}), {s['fits']} fits in {s['seconds']:.1f}s; "
+                f"exhaustive grid: {s['exhaustive_fits']} fits, ~{s['exhaustive_seconds_estimate']:.1f}s. "
+                f"Saved {s['fits_saved']} fits, ~{s['seconds_saved_estimate']:.1f}s")
@@ -1,69 +1,51 @@
+import copy
+import joblib
 import mlflow
+import mlflow.sklearn
+import numpy as np
 import pandas as pd
 import os
 import logging
+import threading
+import time
+
+from mlflow.models import Model
+from sklearn.pipeline import Pipeline
+
+from config import config
+from drift_monitor import ReferenceProfile
+from forest_compiler import compile_pipeline
+from metrics import FEATURE_ASSEMBLY_STAGE, INFERENCE_STAGE
+from model_registry import get_latest_model_uri
+from preprocessing import FEATURE_COLUMNS, HeartDiseasePreprocessor
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-def get_latest_model_uri():
+def _without_feature_names(estimator):
     """
-    Finds the latest model artifact in the mlruns directory.
-    Returns the model URI or None if not found.
+    Shallow copy of a fitted estimator (or Pipeline of them) that forgets the
+    column names it was fitted with. The fast path feeds ndarrays in an order
+    verified once at load time; sklearn would otherwise warn on every call
+    that X has no feature names. Fitted arrays are shared, not copied.
     """
-    try:
-        # Determine project root (one level up from src/)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(current_dir)
-        
-        # Set MLflow tracking URI
-        mlflow.set_tracking_uri(f"file:///{os.path.join(project_root, 'mlruns')}")
-        
-        # Get experiment by name
-        experiment_name = "heart-disease-experiment"
-        experiment = mlflow.get_experiment_by_name(experiment_name)
-        
-        if not experiment:
-            logger.warning(f"Experiment '{experiment_name}' not found")
-            return None
-            
-        experiment_id = experiment.experiment_id
-        models_dir = os.path.join(project_root, "mlruns", experiment_id, "models")
-        
-        # Check if models directory exists
-        if not os.path.exists(models_dir):
-            logger.warning(f"Models directory not found: {models_dir}")
-            return None
-        
-        # Get all subdirectories in the models folder
-        subdirs = [
-            os.path.join(models_dir, d) 
-            for d in os.listdir(models_dir) 
-            if os.path.isdir(os.path.join(models_dir, d))
-        ]
-        
-        if not subdirs:
-            logger.warning(f"No model directories found in {models_dir}")
-            return None
-        
-        # Sort by modification time (latest first)
-        latest_model_dir = max(subdirs, key=os.path.getmtime)
-        
-        # Construct path to artifacts
-        artifact_path = os.path.join(latest_model_dir, "artifacts")
-        
-        if os.name == 'nt':  # Windows
-            artifact_path = artifact_path.replace("\\", "/")
-            
-        model_uri = f"file:///{artifact_path}"
-        logger.info(f"Found latest model: {model_uri}")
-        return model_uri
-        
-    except Exception as e:
-        logger.error(f"Error finding latest model: {e}")
-        return None
+    if isinstance(estimator, Pipeline):
+        return Pipeline([(name, _without_feature_names(step)) for name, step in estimator.steps])
+    unnamed = copy.copy(estimator)
+    if "feature_names_in_" in vars(unnamed):
+        del unnamed.feature_names_in_
+    return unnamed
+
+
+def load_model_metadata(model_path):
+    """
+    MLmodel metadata of a local model directory: the fitted preprocessor
+    (HeartDiseasePreprocessor.from_metadata) and drift profile
+    (ReferenceProfile.from_metadata), when the model was saved with them.
+    """
+    return Model.load(model_path).metadata
 
 
 class HeartDiseaseInference:
@@ -72,14 +54,16 @@ class HeartDiseaseInference:
     and generating predictions from incoming JSON.
     """
 
-    def __init__(self, model_uri=None):
+    def __init__(self, model_uri=None, backend=None):
         """
         Initialize inference pipeline with MLflow model.
         
         Args:
             model_uri: URI to the MLflow model. If None, will try to load from:
-                      1. Latest model from mlruns directory (dynamic discovery)
+                      1. The MODEL_ALIAS registry entry, or the latest model in mlruns
                       2. MLFLOW_MODEL_URI environment variable
+            backend: "sklearn" or "compiled" (flat-array forest evaluator).
+                     Defaults to config.INFERENCE_BACKEND.
         
         Examples:
             - runs:/ab1234cdef/model
@@ -104,14 +88,122 @@ class HeartDiseaseInference:
             )
         
         logger.info(f"Loading model from: {model_uri}")
-        self.model = mlflow.sklearn.load_model(model_uri)
+        # Local copy (a no-op for local paths) read for both the model and its metadata
+        model_path = mlflow.artifacts.download_artifacts(artifact_uri=model_uri)
+        self.model = mlflow.sklearn.load_model(model_path)
+        self.model_uri = model_uri
+        metadata = load_model_metadata(model_path)
+        # Raw-data encoding fitted at training time; None for older models.
+        # API inputs arrive already encoded: their categorical values are
+        # checked against the codes this encoding produces.
+        self.preprocessor = HeartDiseasePreprocessor.from_metadata(metadata)
+        self._code_limits = [] if self.preprocessor is None else [
+            (FEATURE_COLUMNS.index(col), col, len(self.preprocessor.categories_[col]))
+            for col in config.CATEGORICAL_COLUMNS
+        ]
+        # Training feature distribution for drift monitoring; None for older models
+        self.drift_profile = ReferenceProfile.from_metadata(metadata)
+        # Content hash of the fitted model: changes whenever the model does
+        self.model_version = joblib.hash(self.model)[:12]
+        logger.info(f"Model version: {self.model_version}")
+
+        # Fast path: ndarray input in FEATURE_COLUMNS order, one predict_proba call.
+        # Only enabled when the model was fitted on exactly those columns.
+        fitted_columns = getattr(self.model, "feature_names_in_", None)
+        self.fast_path = (
+            hasattr(self.model, "predict_proba")
+            and hasattr(self.model, "classes_")
+            and fitted_columns is not None
+            and list(fitted_columns) == FEATURE_COLUMNS
+        )
+        if self.fast_path:
+            self._classes = self.model.classes_
+            self._predict_proba = _without_feature_names(self.model).predict_proba
+        self._buffers = threading.local()
+        logger.info(f"Fast inference path {'enabled' if self.fast_path else 'disabled'}")
+
+        self.backend = backend or config.INFERENCE_BACKEND
+        if self.backend not in ("sklearn", "compiled"):
+            raise ValueError(f"Unknown inference backend: {self.backend}")
+        if self.backend == "compiled":
+            self._use_compiled_backend()
+
+    def _use_compiled_backend(self):
+        """Swaps the fast path's predict_proba for the flat-array forest evaluator."""
+        if not self.fast_path:
+            logger.warning("Compiled backend requires the fast path; falling back to sklearn")
+            self.backend = "sklearn"
+            return
+        try:
+            compiled = compile_pipeline(self.model)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Could not compile model ({e}); falling back to sklearn")
+            self.backend = "sklearn"
+            return
+        self._predict_proba = compiled.predict_proba
+        logger.info(f"Compiled backend: {compiled.n_trees} trees, {compiled.n_nodes} nodes, "
+                    f"max depth {compiled.max_depth}")
+
+    def _row_buffer(self):
+        """Preallocated (1, n_features) float64 row, one per thread."""
+        row = getattr(self._buffers, "row", None)
+        if row is None:
+            row = np.empty((1, len(FEATURE_COLUMNS)), dtype=np.float64)
+            self._buffers.row = row
+        return row
+
+    def check_codes(self, X):
+        """
+        Per row of an encoded matrix: None, or why a categorical value is not a
+        code of the model's training encoding. All None for models saved without it.
+        """
+        if self.preprocessor is None:
+            return [None] * len(X)
+        return self.preprocessor.code_errors(X)
+
+    def _code_error(self, input_dict):
+        for j, col, n in self._code_limits:
+            value = input_dict[col]
+            if not (0 <= value < n and value == int(value)):
+                return {"error": f"Unknown {col} code {value:g}: the model's encoding has codes 0-{n - 1}"}
+        return None
 
     def predict_single(self, input_dict: dict):
         """
         Predicts risk of heart disease for a single JSON input.
-        Returns prediction + probability (confidence).
+        Returns prediction + probability (confidence), or an "error" entry
+        for a categorical code the model's encoding never produces.
+        """
+        error = self._code_error(input_dict)
+        if error is not None:
+            return error
+        if not self.fast_path:
+            return self._predict_single_frame(input_dict)
+
+        start = time.perf_counter()
+        row = self._row_buffer()
+        for j, col in enumerate(FEATURE_COLUMNS):
+            row[0, j] = input_dict[col]
+        assembled = time.perf_counter()
+
+        # One pass through scaler + forest; label derived like predict() does
+        proba = self._predict_proba(row)[0]
+
+        FEATURE_ASSEMBLY_STAGE.observe(assembled - start)
+        INFERENCE_STAGE.observe(time.perf_counter() - assembled)
+        return {
+            "prediction": int(self._classes[proba.argmax()]),
+            "confidence": float(proba[1])
+        }
+
+    def _predict_single_frame(self, input_dict: dict):
+        """
+        Reference single-row path through a pandas DataFrame.
+        Used when the fast path is unavailable for the loaded model.
         """
+        start = time.perf_counter()
         df = pd.DataFrame([input_dict])  # single-row dataframe
+        assembled = time.perf_counter()
 
         # Model pipeline handles scaling + encoding
         pred = self.model.predict(df)[0]
@@ -122,11 +214,85 @@ class HeartDiseaseInference:
         else:
             prob = float("nan")
 
+        FEATURE_ASSEMBLY_STAGE.observe(assembled - start)
+        INFERENCE_STAGE.observe(time.perf_counter() - assembled)
+
         return {
             "prediction": int(pred),
             "confidence": float(prob)
         }
 
+    def predict_batch(self, records: list):
+        """
+        Predicts risk of heart disease for a list of JSON inputs.
+        All valid rows are stacked into one matrix and scored with a
+        single predict_proba call. Returns one result per input, in order;
+        rows that cannot be converted, or carry a categorical code the model's
+        encoding never produces, get an "error" entry instead.
+        """
+        start = time.perf_counter()
+        results = [None] * len(records)
+        rows = []
+        positions = []
+
+        for i, record in enumerate(records):
+            try:
+                rows.append([float(record[col]) for col in FEATURE_COLUMNS])
+                positions.append(i)
+            except KeyError as e:
+                results[i] = {"error": f"Missing feature: {e.args[0]}"}
+            except (TypeError, ValueError) as e:
+                results[i] = {"error": f"Invalid feature value: {e}"}
+
+        if self._code_limits and rows:
+            valid = []
+            for pos, row, error in zip(positions, rows, self.check_codes(rows)):
+                if error is None:
+                    valid.append((pos, row))
+                else:
+                    results[pos] = {"error": error}
+            positions = [pos for pos, _ in valid]
+            rows = [row for _, row in valid]
+
+        if not rows:
+            return results
+
+        X = np.asarray(rows, dtype=np.float64)
+        assembled = time.perf_counter()
+
+        preds, probs = self.predict_matrix(X)
+
+        FEATURE_ASSEMBLY_STAGE.observe(assembled - start)
+        INFERENCE_STAGE.observe(time.perf_counter() - assembled)
+
+        for pos, pred, prob in zip(positions, preds, probs):
+            results[pos] = {
+                "prediction": int(pred),
+                "confidence": float(prob)
+            }
+
+        return results
+
+    def predict_matrix(self, X):
+        """
+        Scores a float64 matrix whose columns are in FEATURE_COLUMNS order.
+        Returns (predictions, confidences) as arrays, one entry per row.
+        """
+        if self.fast_path:
+            proba = self._predict_proba(X)
+            # Same decision rule as predict(): most probable class
+            preds = self._classes.take(np.argmax(proba, axis=1))
+            probs = proba[:, 1]
+        elif hasattr(self.model, "predict_proba"):
+            X = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+            proba = self.model.predict_proba(X)
+            preds = self.model.classes_.take(np.argmax(proba, axis=1))
+            probs = proba[:, 1]
+        else:
+            preds = self.model.predict(pd.DataFrame(X, columns=FEATURE_COLUMNS))
+            probs = np.full(len(X), np.nan)
+        return preds, probs
+
 
 if __name__ == "__main__":
     # Example test - values can be overridden via environment variables
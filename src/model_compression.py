@@ -0,0 +1,191 @@
+"""
+Serving-cost compression of the packaged Random Forest.
+
+The production forest is trained with 100 fully grown trees, which makes the
+pickled artifact, its load time and every prediction's tree traversal larger
+than the accuracy needs. compress_forest() builds smaller variants of the
+fitted pipeline:
+
+    - fewer trees: a prefix of the fitted trees (no refit needed)
+    - depth pruning: refit with max_depth from COMPRESSION_MAX_DEPTHS
+    - cost-complexity pruning: refit with ccp_alpha from COMPRESSION_CCP_ALPHAS
+
+each combined with every tree count in COMPRESSION_TREE_COUNTS, and keeps the
+smallest one (pickled bytes) whose validation ROC AUC is within
+COMPRESSION_AUC_TOLERANCE of the full model. The full model is always a
+candidate, so compression never makes the model worse than the tolerance.
+The validation rows must not be the test rows the packaged model is reported
+on; variant_params() refits the selected variant on all training rows.
+
+Float32 thresholds need no search: scikit-learn's tree node layout fixes
+thresholds at float64, but the compiled backend (forest_compiler) stores them
+as float32, rounded so that every split decision is unchanged.
+
+measure_serving_cost() reports artifact size, load time and prediction latency,
+which model_packaging writes before and after compression.
+"""
+import copy
+import logging
+import os
+import pickle
+import tempfile
+import time
+
+import mlflow.sklearn
+import numpy as np
+import sklearn
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import roc_auc_score
+
+from config import config
+from forest_compiler import compile_pipeline
+from model_registry import artifact_size
+
+logger = logging.getLogger(__name__)
+
+
+def _forest_step(model):
+    """Name of the forest step in the pipeline, and the fitted forest."""
+    name, forest = model.steps[-1]
+    if not isinstance(forest, RandomForestClassifier) or not hasattr(forest, "estimators_"):
+        raise TypeError("Compression needs a Pipeline ending in a fitted RandomForestClassifier")
+    return name, forest
+
+
+def truncate_forest(model, n_trees):
+    """Copy of a fitted pipeline that keeps only its first n_trees trees."""
+    name, forest = _forest_step(model)
+    smaller = copy.copy(forest)
+    smaller.estimators_ = forest.estimators_[:n_trees]
+    smaller.n_estimators = len(smaller.estimators_)
+    return type(model)(model.steps[:-1] + [(name, smaller)])
+
+
+def serialized_size(model):
+    """Bytes of the pickled model."""
+    return len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _forest_shape(model):
+    forest = _forest_step(model)[1]
+    trees = [estimator.tree_ for estimator in forest.estimators_]
+    return {
+        "n_trees": len(trees),
+        "n_nodes": int(sum(tree.node_count for tree in trees)),
+        "max_depth": int(max(tree.max_depth for tree in trees)),
+    }
+
+
+def _refits(model, X_train, y_train, max_depths, ccp_alphas):
+    """(variant, fitted pipeline) for the full model and every pruning setting."""
+    name = _forest_step(model)[0]
+    yield {"pruning": "none"}, model
+    for depth in max_depths:
+        yield ({"pruning": "max_depth", "max_depth": depth},
+               clone(model).set_params(**{f"{name}__max_depth": depth}).fit(X_train, y_train))
+    for alpha in ccp_alphas:
+        yield ({"pruning": "ccp_alpha", "ccp_alpha": alpha},
+               clone(model).set_params(**{f"{name}__ccp_alpha": alpha}).fit(X_train, y_train))
+
+
+def compress_forest(model, X_train, y_train, X_val, y_val, tolerance=None,
+                    tree_counts=None, max_depths=None, ccp_alphas=None):
+    """
+    Smallest variant of a fitted forest pipeline within tolerance of its validation ROC AUC.
+
+    Args:
+        model: Fitted Pipeline ending in a RandomForestClassifier.
+        X_train, y_train: Data the pruned variants are refitted on.
+        X_val, y_val: Data the variants are compared on.
+        tolerance: Largest allowed ROC AUC drop (config.COMPRESSION_AUC_TOLERANCE).
+        tree_counts, max_depths, ccp_alphas: Search space (config.COMPRESSION_*).
+
+    Returns:
+        (selected model, summary dict with the baseline, the selected variant
+        and every candidate tried).
+    """
+    tolerance = config.COMPRESSION_AUC_TOLERANCE if tolerance is None else tolerance
+    tree_counts = config.COMPRESSION_TREE_COUNTS if tree_counts is None else tree_counts
+    max_depths = config.COMPRESSION_MAX_DEPTHS if max_depths is None else max_depths
+    ccp_alphas = config.COMPRESSION_CCP_ALPHAS if ccp_alphas is None else ccp_alphas
+
+    full_trees = _forest_step(model)[1].n_estimators
+    counts = sorted({n for n in tree_counts if 0 < n < full_trees} | {full_trees})
+
+    variants = []
+    for variant, fitted in _refits(model, X_train, y_train, max_depths, ccp_alphas):
+        for n_trees in counts:
+            candidate = truncate_forest(fitted, n_trees) if n_trees < full_trees else fitted
+            entry = {
+                **variant,
+                "n_trees": n_trees,
+                "roc_auc": float(roc_auc_score(y_val, candidate.predict_proba(X_val)[:, 1])),
+                "bytes": serialized_size(candidate),
+            }
+            variants.append((entry, candidate))
+
+    # The unpruned full forest comes last in the first group
+    baseline = variants[len(counts) - 1][0]
+    eligible = [(entry, candidate) for entry, candidate in variants
+                if entry["roc_auc"] >= baseline["roc_auc"] - tolerance]
+    selected, selected_model = min(eligible, key=lambda item: (item[0]["bytes"], -item[0]["roc_auc"]))
+
+    logger.info(f"Compression kept {selected} (baseline ROC AUC {baseline['roc_auc']:.4f}, "
+                f"{baseline['bytes']} bytes)")
+    return selected_model, {
+        "tolerance": tolerance,
+        "baseline": baseline,
+        "selected": selected,
+        "candidates": [entry for entry, _ in variants],
+    }
+
+
+def variant_params(model, variant):
+    """
+    Pipeline parameters that reproduce a compress_forest() variant when the
+    pipeline is refitted. With a fixed random_state the first n trees of a
+    forest are the trees an n-tree forest grows, so truncation refits exactly.
+    """
+    name = _forest_step(model)[0]
+    params = {f"{name}__n_estimators": variant["n_trees"]}
+    if variant["pruning"] != "none":
+        params[f"{name}__{variant['pruning']}"] = variant[variant["pruning"]]
+    return params
+
+
+def measure_serving_cost(model, X_sample, repeats=200, batch_size=256):
+    """
+    Artifact size and load time of the model saved in MLflow format, and
+    median single-row and batch prediction latency (sklearn and compiled backend).
+    """
+    rows = np.asarray(X_sample, dtype=np.float64)
+    batch = X_sample.iloc[np.resize(np.arange(len(X_sample)), batch_size)]
+
+    with tempfile.TemporaryDirectory(prefix="model-cost-") as tmp:
+        path = os.path.join(tmp, "model")
+        # Fixed requirements: inferring them runs a subprocess that would dominate the timing
+        mlflow.sklearn.save_model(model, path, pip_requirements=[f"scikit-learn=={sklearn.__version__}"])
+        size = artifact_size(path)
+        start = time.perf_counter()
+        mlflow.sklearn.load_model(path)
+        load_seconds = time.perf_counter() - start
+
+    def median_ms(fn, n):
+        timings = []
+        for i in range(n):
+            start = time.perf_counter()
+            fn(i)
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings) * 1000)
+
+    compiled = compile_pipeline(model)
+    return {
+        **_forest_shape(model),
+        "artifact_bytes": size,
+        "load_seconds": round(load_seconds, 4),
+        "single_row_ms": median_ms(lambda i: model.predict_proba(X_sample.iloc[[i % len(X_sample)]]), repeats),
+        "batch_ms": median_ms(lambda i: model.predict_proba(batch), max(1, repeats // 10)),
+        "compiled_single_row_ms": median_ms(lambda i: compiled.predict_proba(rows[[i % len(rows)]]), repeats),
+        "compiled_threshold_bytes": int(compiled.threshold.nbytes),
+    }
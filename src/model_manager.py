@@ -0,0 +1,361 @@
+"""
+Model lifecycle for the API: resolving the model URI, loading and warming up
+the inference engine, tracking readiness, and hot-swapping model versions.
+
+Nothing here runs at import time, so the API can bind its port immediately
+and load the model in the background.
+"""
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+
+from prometheus_client import Counter, Gauge
+
+from config import config
+from inference_pipeline import HeartDiseaseInference
+from metrics import MODEL_LOAD_SECONDS
+from model_registry import ModelRegistry, get_latest_model_uri, local_path, path_uri
+
+logger = logging.getLogger(__name__)
+
+STARTUP_PHASE_SECONDS = Gauge(
+    "api_startup_phase_seconds",
+    "Duration of each model startup phase",
+    ["phase"],
+    multiprocess_mode="mostrecent"
+)
+MODEL_READY = Gauge(
+    "api_model_ready",
+    "1 when a model is loaded and warmed up",
+    multiprocess_mode="livemax"
+)
+MODEL_RELOADS = Counter(
+    "api_model_reloads_total",
+    "Model reload attempts by outcome",
+    ["result"]
+)
+
+# Representative record used to exercise the inference paths before serving
+WARMUP_SAMPLE = {
+    "age": 54.0, "sex": 1.0, "cp": 0.0, "trestbps": 130.0, "chol": 246.0,
+    "fbs": 0.0, "restecg": 1.0, "thalach": 150.0, "exang": 0.0,
+    "oldpeak": 1.2, "slope": 2.0, "ca": 0.0, "thal": 2.0
+}
+WARMUP_BATCH_SIZE = 64
+
+
+def _fingerprint(path):
+    """Names, sizes and mtimes of every file under path; None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    entries = []
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                st = os.stat(os.path.join(root, name))
+            except OSError:
+                continue  # Removed while scanning; the next poll will see it
+            entries.append((os.path.relpath(os.path.join(root, name), path), st.st_size, st.st_mtime_ns))
+    return tuple(sorted(entries))
+
+
+def allowed_model_uri(requested, watch_path=None, registry=None):
+    """
+    URI to load for an admin reload request: a registry alias resolves to its
+    version's URI, and a path or file: URI must lie under watch_path
+    (config.MODEL_WATCH_PATH). Anything else could unpickle an arbitrary file.
+
+    Raises:
+        ValueError: requested is neither a registered alias nor under watch_path.
+    """
+    entry = (registry or ModelRegistry()).get(requested)
+    if entry is not None:
+        return entry["uri"]
+
+    watch_path = config.MODEL_WATCH_PATH if watch_path is None else watch_path
+    path = local_path(requested)
+    if watch_path and path is not None:
+        root = os.path.realpath(watch_path)
+        if os.path.commonpath([root, os.path.realpath(path)]) == root:
+            return requested
+    raise ValueError(f"model_uri must be a registry alias or a path under MODEL_WATCH_PATH: {requested}")
+
+
+class ReloadInProgressError(RuntimeError):
+    """Raised when a reload is requested while another one is running."""
+
+
+class ModelManager:
+    """
+    Owns the serving inference engine, its startup state and version history.
+
+    The serving engine is swapped by a single reference assignment, so requests
+    that already hold the previous engine finish on it while new requests see
+    the new one.
+
+    Args:
+        allow_training: Run the training pipeline when no model can be found.
+                        Disabled for background startup so pods never train on boot.
+        history_size: Number of previous engines kept for rollback.
+    """
+
+    def __init__(self, allow_training=False, history_size=None):
+        self.allow_training = allow_training
+        self.engine = None
+        self.phase = "starting"
+        self.error = None
+        self.history = deque(maxlen=history_size if history_size is not None else config.MODEL_HISTORY_SIZE)
+        self._thread = None
+        self._swap_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._stop_watching = threading.Event()
+
+    @property
+    def ready(self):
+        return self.phase == "ready"
+
+    def resolve_model_uri(self, allow_training=None):
+        """MLFLOW_MODEL_URI override, else the registry alias (or latest mlruns model), else (optionally) train one."""
+        if allow_training is None:
+            allow_training = self.allow_training
+        model_uri = os.getenv("MLFLOW_MODEL_URI") or get_latest_model_uri()
+
+        if not model_uri and allow_training:
+            from experiment_tracking import run_experiment
+
+            logger.info("No model found. Starting auto-train pipeline...")
+            model_uri = run_experiment()
+            logger.info(f"Auto-training completed. New Model URI: {model_uri}")
+
+        if not model_uri:
+            raise RuntimeError(
+                "Could not determine MODEL_URI. Please set MLFLOW_MODEL_URI or ensure models exist in mlruns."
+            )
+        return model_uri
+
+    @staticmethod
+    def warm_up(engine):
+        """
+        Runs both inference paths once so the first real request pays no
+        lazy-init cost, and rejects engines that produce unusable output.
+        """
+        single = engine.predict_single(dict(WARMUP_SAMPLE))
+        batch = engine.predict_batch([dict(WARMUP_SAMPLE)] * WARMUP_BATCH_SIZE)
+
+        for result in [single] + list(batch):
+            if "error" in result:
+                raise ValueError(f"Warm-up prediction failed: {result['error']}")
+            confidence = result["confidence"]
+            if not (math.isnan(confidence) or 0.0 <= confidence <= 1.0):
+                raise ValueError(f"Warm-up confidence out of range: {confidence}")
+        if len(batch) != WARMUP_BATCH_SIZE or batch[0]["prediction"] != single["prediction"]:
+            raise ValueError("Warm-up batch and single predictions disagree")
+
+    @staticmethod
+    def _load_engine(model_uri):
+        start = time.perf_counter()
+        engine = HeartDiseaseInference(model_uri)
+        MODEL_LOAD_SECONDS.observe(time.perf_counter() - start)
+        return engine
+
+    def _activate(self, engine):
+        """Makes engine the serving engine, keeping the current one for rollback."""
+        with self._swap_lock:
+            if self.engine is not None:
+                self.history.append(self.engine)
+            self.engine = engine
+
+    def _timed(self, phase, fn, *args):
+        self.phase = phase
+        start = time.perf_counter()
+        result = fn(*args)
+        STARTUP_PHASE_SECONDS.labels(phase=phase).set(time.perf_counter() - start)
+        return result
+
+    def load(self):
+        """Resolves, loads and warms up the model, then makes it the serving engine."""
+        start = time.perf_counter()
+        try:
+            model_uri = self._timed("resolving", self.resolve_model_uri)
+            logger.info(f"Using Model URI: {model_uri}")
+            engine = self._timed("loading", self._load_engine, model_uri)
+            self._timed("warming_up", self.warm_up, engine)
+        except Exception as e:
+            self.phase = "failed"
+            self.error = str(e)
+            logger.error(f"Model startup failed: {e}")
+            raise
+
+        self._activate(engine)
+        self.phase = "ready"
+        MODEL_READY.set(1)
+        STARTUP_PHASE_SECONDS.labels(phase="total").set(time.perf_counter() - start)
+        logger.info(f"Model ready in {time.perf_counter() - start:.2f}s")
+        return engine
+
+    def start_background_load(self):
+        """Loads the model on a daemon thread; readiness flips once it is warmed up."""
+        def _load():
+            try:
+                self.load()
+            except Exception:
+                pass  # Already logged; /ready keeps reporting "failed"
+
+        self._thread = threading.Thread(target=_load, name="model-loader", daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def reload(self, model_uri=None, force=False):
+        """
+        Loads and validates a model, then swaps it in. Never trains.
+        The current engine keeps serving throughout; on any failure it stays active.
+
+        Returns True if the serving engine changed, False if the resolved
+        model has the same version as the current one (unless force is set).
+        """
+        if not self._reload_lock.acquire(blocking=False):
+            raise ReloadInProgressError("A model reload is already in progress")
+        try:
+            start = time.perf_counter()
+            model_uri = model_uri or self.resolve_model_uri(allow_training=False)
+            logger.info(f"Reloading model from: {model_uri}")
+            engine = self._load_engine(model_uri)
+            self.warm_up(engine)
+
+            current = self.engine
+            if not force and current is not None and engine.model_version == current.model_version:
+                MODEL_RELOADS.labels(result="unchanged").inc()
+                logger.info(f"Model version {engine.model_version} already serving; no swap")
+                return False
+
+            self._activate(engine)
+            self.phase = "ready"
+            self.error = None
+            MODEL_READY.set(1)
+            MODEL_RELOADS.labels(result="success").inc()
+            STARTUP_PHASE_SECONDS.labels(phase="reload").set(time.perf_counter() - start)
+            logger.info(f"Swapped in model version {engine.model_version}")
+            return True
+        except Exception as e:
+            MODEL_RELOADS.labels(result="failure").inc()
+            logger.error(f"Model reload failed, keeping current model: {e}")
+            raise
+        finally:
+            self._reload_lock.release()
+
+    def rollback(self):
+        """Swaps the most recent previous engine back in; the current one is discarded."""
+        with self._swap_lock:
+            if not self.history:
+                raise LookupError("No previous model version to roll back to")
+            self.engine = self.history.pop()
+        MODEL_RELOADS.labels(result="rollback").inc()
+        logger.info(f"Rolled back to model version {self.engine.model_version}")
+        return self.engine
+
+    def sync_to(self, model_uri, model_version):
+        """
+        Makes model_version the serving engine: a no-op if it already is, a swap
+        if it is in the history, else a reload from model_uri.
+
+        Returns True if the serving engine changed.
+        """
+        with self._swap_lock:
+            current = self.engine
+            if current is not None and current.model_version == model_version:
+                return False
+            previous = next((e for e in self.history if e.model_version == model_version), None)
+            if previous is not None:
+                self.history.remove(previous)
+                if current is not None:
+                    self.history.append(current)
+                self.engine = previous
+        if previous is None:
+            return self.reload(model_uri, force=True)
+        self.phase = "ready"
+        self.error = None
+        MODEL_READY.set(1)
+        logger.info(f"Switched to model version {model_version} from history")
+        return True
+
+    def publish(self, path):
+        """
+        Records the serving model in path (atomically), for the other worker
+        processes following it (see start_following).
+        """
+        engine = self.engine
+        state = {"model_uri": engine.model_uri, "model_version": engine.model_version, "published_at": time.time()}
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, path)
+
+    def start_following(self, path, interval_seconds):
+        """
+        Polls the file publish() writes and syncs to each model recorded there,
+        so an admin reload or rollback on one worker reaches every worker. A
+        model already recorded when following starts (a restarted worker) is
+        synced to at once.
+        """
+        def _follow():
+            last = None
+            while True:
+                try:
+                    st = os.stat(path)
+                    current = (st.st_size, st.st_mtime_ns)
+                except OSError:
+                    current = None
+                if current is not None and current != last:
+                    try:
+                        with open(path) as f:
+                            state = json.load(f)
+                        self.sync_to(state["model_uri"], state["model_version"])
+                        last = current
+                    except ReloadInProgressError:
+                        pass  # Retry on the next poll
+                    except Exception as e:
+                        last = current  # Already logged by reload(); wait for the next publish
+                        logger.error(f"Could not follow published model {path}: {e}")
+                if self._stop_watching.wait(interval_seconds):
+                    return
+
+        self._stop_watching.clear()
+        follower = threading.Thread(target=_follow, name="model-follower", daemon=True)
+        follower.start()
+        return follower
+
+    def start_watching(self, path, interval_seconds):
+        """
+        Polls path and reloads the model saved there once its contents changed
+        and then stayed unchanged for one interval (so half-written models are
+        not loaded). The model comes from path itself, not from MLFLOW_MODEL_URI.
+        """
+        def _watch():
+            last = _fingerprint(path)
+            pending = None
+            while not self._stop_watching.wait(interval_seconds):
+                current = _fingerprint(path)
+                if current == last or current is None:
+                    pending = None
+                    continue
+                if current != pending:
+                    pending = current
+                    continue
+                last, pending = current, None
+                logger.info(f"Change detected under {path}; reloading model")
+                try:
+                    self.reload(path_uri(path))
+                except Exception:
+                    pass  # Already logged and counted; keep watching
+
+        self._stop_watching.clear()
+        watcher = threading.Thread(target=_watch, name="model-watcher", daemon=True)
+        watcher.start()
+        return watcher
+
+    def stop_watching(self):
+        self._stop_watching.set()
@@ -1,25 +1,59 @@
 import mlflow
 import mlflow.sklearn
-import pandas as pd
+import json
 import shutil
 import os
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier
 from config import config
-from preprocessing import clean_dataset
+from dataset_cache import load_training_data
+from drift_monitor import ReferenceProfile
+from model_compression import compress_forest, measure_serving_cost, variant_params
+from model_registry import ModelRegistry, path_uri
+from model_utils import get_model_metrics
+
+
+COMPRESSION_REPORT = "compression_report.json"
+
+
+def compress_model(model, X_train, y_train):
+    """
+    Compression stage: picks the smallest forest variant within the ROC AUC
+    tolerance on a validation split of the training rows, refits it on all of
+    them, and measures serving cost before and after. The test split stays
+    untouched for the packaged model's metrics.
+    Returns (model to package, report dict).
+    """
+    print("Compressing model...")
+    X_fit, X_val, y_fit, y_val = train_test_split(
+        X_train, y_train, test_size=config.COMPRESSION_VALIDATION_SIZE,
+        random_state=config.RANDOM_STATE, stratify=y_train
+    )
+    _, search = compress_forest(clone(model).fit(X_fit, y_fit), X_fit, y_fit, X_val, y_val)
+    if search["selected"] == search["baseline"]:
+        compressed = model
+    else:
+        compressed = clone(model).set_params(**variant_params(model, search["selected"])).fit(X_train, y_train)
+    before = measure_serving_cost(model, X_val)
+    after = before if compressed is model else measure_serving_cost(compressed, X_val)
+
+    print(f"{'':<24}{'before':>14}{'after':>14}")
+    for key in ("n_trees", "n_nodes", "max_depth", "artifact_bytes", "load_seconds",
+                "single_row_ms", "batch_ms", "compiled_single_row_ms"):
+        print(f"{key:<24}{before[key]:>14.6g}{after[key]:>14.6g}")
+    print(f"Validation ROC AUC: {search['baseline']['roc_auc']:.4f} -> {search['selected']['roc_auc']:.4f} "
+          f"(tolerance {search['tolerance']})")
+    return compressed, {**search, "before": before, "after": after}
 
 
 def save_final_model():
     """Trains final model and saves it to a static directory 'models/production_model' for easy containerization."""
     # 1. Train Model
     print("Training production model...")
-    df = pd.read_csv(config.CSV_PATH)
-    df = clean_dataset(df)
-
-    X = df.drop("target", axis=1)
-    y = df["target"]
+    X, y, preprocessor = load_training_data()
 
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE
@@ -37,15 +71,36 @@ def save_final_model():
 
     model.fit(X_train, y_train)
 
+    report = None
+    if config.MODEL_COMPRESSION:
+        model, report = compress_model(model, X_train, y_train)
+    # Held-out metrics of the model that gets packaged; X_test played no part in choosing it
+    test_metrics = get_model_metrics(model, X_test, y_test)
+
     # 2. Save using standard MLflow format but to a fixed path
     output_path = config.PRODUCTION_MODEL_DIR
     # Clean up existing
     if os.path.exists(output_path):
         shutil.rmtree(output_path)
     print(f"Saving model to {output_path}...")
-    mlflow.sklearn.save_model(model, output_path)
+    # The fitted encoding (for raw-data scoring) and the training feature profile
+    # (for drift monitoring) travel in the MLmodel metadata
+    metadata = {**preprocessor.to_metadata(), **ReferenceProfile.fit(X_train).to_metadata()}
+    mlflow.sklearn.save_model(model, output_path, metadata=metadata)
 
+    if report is not None:
+        report["test_metrics"] = test_metrics
+        report_path = os.path.join(output_path, COMPRESSION_REPORT)
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Compression report written to {report_path}")
     print(f"Model saved successfully to {output_path}")
+
+    # 3. Index it so the API can resolve MODEL_ALIAS=production in one lookup
+    version = ModelRegistry().register(
+        "production_model", path_uri(output_path), test_metrics, aliases=["production"]
+    )
+    print(f"Registered as model version {version} (alias: production)")
     print("This directory can now be copied into Docker image.")
 
 
@@ -0,0 +1,233 @@
+"""
+Local index of trained models, so the serving side resolves a model with one lookup.
+
+run_experiment() and save_final_model() register every model they produce in a
+small SQLite database (MODEL_REGISTRY_PATH): a version number, the artifact URI,
+the run, test metrics and the artifact size. Aliases point at versions:
+"candidate" is the Random Forest of the latest experiment, "production" the
+packaged model, and "latest" always means the highest version.
+
+get_latest_model_uri() resolves MODEL_ALIAS with a primary-key lookup instead of
+listing mlruns/<experiment>/models and stat-ing every model directory. When the
+index has no usable entry (an mlruns directory from before the registry, or a
+database copied from another machine) it falls back to that directory scan.
+"""
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+import mlflow
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+LATEST = "latest"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    uri TEXT NOT NULL,
+    run_id TEXT,
+    metrics TEXT NOT NULL,
+    artifact_bytes INTEGER,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    version INTEGER NOT NULL REFERENCES models(version),
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def local_path(uri):
+    """Filesystem path of a file: URI or plain path; None for remote URIs."""
+    scheme = urlparse(uri).scheme
+    if scheme == "file":
+        # MLflow's file store hands out file://dir/..., file:///dir/... and file:////dir/...
+        path = unquote(uri[len("file:"):]).lstrip("/")
+        return path if os.name == "nt" else "/" + path
+    if scheme == "" or (len(scheme) == 1 and os.name == "nt"):  # drive letter
+        return uri
+    return None
+
+
+def artifact_size(uri):
+    """Total bytes of the model's files; None when they are not on local disk."""
+    path = local_path(uri)
+    if path is None or not os.path.exists(path):
+        return None
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(path) for name in files)
+
+
+def path_uri(path):
+    """file:// URI of a local path."""
+    return Path(os.path.abspath(path)).as_uri()
+
+
+class ModelRegistry:
+    """
+    SQLite-backed model index.
+
+    Args:
+        path: Database file (default: config.MODEL_REGISTRY_PATH). Readers never
+              create it; the first register() does.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or config.MODEL_REGISTRY_PATH
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        return connection
+
+    def register(self, name, uri, metrics=None, run_id=None, aliases=()):
+        """
+        Adds a model version and points aliases at it.
+
+        Returns:
+            The new version number.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        path = local_path(uri)
+        if path is not None:
+            uri = path_uri(path)
+        now = time.time()
+        size = artifact_size(uri)
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(_SCHEMA)
+            version = connection.execute(
+                "INSERT INTO models (name, uri, run_id, metrics, artifact_bytes, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (name, uri, run_id, json.dumps(metrics or {}), size, now),
+            ).lastrowid
+            for alias in aliases:
+                self._set_alias(connection, alias, version, now)
+        logger.info(f"Registered {name} as version {version} ({', '.join(aliases) or 'no aliases'}): {uri}")
+        return version
+
+    @staticmethod
+    def _set_alias(connection, alias, version, now):
+        if alias == LATEST:
+            raise ValueError(f"'{LATEST}' always refers to the newest version and cannot be assigned")
+        connection.execute(
+            "INSERT INTO aliases (alias, version, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(alias) DO UPDATE SET version = excluded.version, updated_at = excluded.updated_at",
+            (alias, version, now),
+        )
+
+    def set_alias(self, alias, version):
+        """Points alias at an existing version."""
+        with closing(self._connect()) as connection, connection:
+            connection.executescript(_SCHEMA)
+            if connection.execute("SELECT 1 FROM models WHERE version = ?", (version,)).fetchone() is None:
+                raise KeyError(f"Unknown model version: {version}")
+            self._set_alias(connection, alias, version, time.time())
+
+    @staticmethod
+    def _row(row, aliases):
+        entry = dict(row)
+        entry["metrics"] = json.loads(entry["metrics"])
+        entry["aliases"] = aliases
+        return entry
+
+    def get(self, alias=LATEST):
+        """Entry dict of the version alias points to ("latest": newest); None if there is none."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with closing(self._connect()) as connection:
+                if alias == LATEST:
+                    row = connection.execute("SELECT * FROM models ORDER BY version DESC LIMIT 1").fetchone()
+                else:
+                    row = connection.execute(
+                        "SELECT models.* FROM aliases JOIN models USING (version) WHERE alias = ?", (alias,)
+                    ).fetchone()
+                if row is None:
+                    return None
+                aliases = [r[0] for r in connection.execute(
+                    "SELECT alias FROM aliases WHERE version = ? ORDER BY alias", (row["version"],))]
+        except sqlite3.OperationalError as e:  # an empty file, or not a registry
+            logger.warning(f"Model registry {self.path} unreadable: {e}")
+            return None
+        return self._row(row, aliases)
+
+    def versions(self):
+        """All entries, newest first."""
+        if not os.path.exists(self.path):
+            return []
+        with closing(self._connect()) as connection:
+            aliases = {}
+            for alias, version in connection.execute("SELECT alias, version FROM aliases ORDER BY alias"):
+                aliases.setdefault(version, []).append(alias)
+            rows = connection.execute("SELECT * FROM models ORDER BY version DESC").fetchall()
+        return [self._row(row, aliases.get(row["version"], [])) for row in rows]
+
+
+def scan_latest_model_uri():
+    """
+    Newest model directory of the configured experiment, by modification time.
+    Lists every model of the experiment; only used when the registry cannot answer.
+    """
+    try:
+        mlflow.set_tracking_uri(config.MLFLOW_TRACKING_URI)
+        experiment = mlflow.get_experiment_by_name(config.EXPERIMENT_NAME)
+        if not experiment:
+            logger.warning(f"Experiment '{config.EXPERIMENT_NAME}' not found")
+            return None
+
+        # Same location config.MLFLOW_TRACKING_URI points at by default
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        models_dir = os.path.join(project_root, config.MLRUNS_DIR, experiment.experiment_id, "models")
+        if not os.path.exists(models_dir):
+            logger.warning(f"Models directory not found: {models_dir}")
+            return None
+
+        subdirs = [os.path.join(models_dir, d) for d in os.listdir(models_dir)
+                   if os.path.isdir(os.path.join(models_dir, d))]
+        if not subdirs:
+            logger.warning(f"No model directories found in {models_dir}")
+            return None
+
+        latest_model_dir = max(subdirs, key=os.path.getmtime)
+        artifact_path = os.path.join(latest_model_dir, "artifacts")
+        if os.name == 'nt':
+            artifact_path = artifact_path.replace("\\", "/")
+        return f"file:///{artifact_path}"
+
+    except Exception as e:
+        logger.error(f"Error finding latest model: {e}")
+        return None
+
+
+def get_latest_model_uri(alias=None, registry=None):
+    """
+    URI of the model to serve: the registry entry for alias (config.MODEL_ALIAS),
+    else the newest model directory of the experiment. None if neither exists.
+    """
+    alias = alias or config.MODEL_ALIAS
+    entry = (registry or ModelRegistry()).get(alias)
+    if entry is not None:
+        path = local_path(entry["uri"])
+        if path is None or os.path.exists(path):
+            logger.info(f"Resolved model '{alias}' to version {entry['version']}: {entry['uri']}")
+            return entry["uri"]
+        logger.warning(f"Registered model '{alias}' (version {entry['version']}) is missing at {path}")
+
+    model_uri = scan_latest_model_uri()
+    if model_uri:
+        logger.info(f"Found latest model: {model_uri}")
+    return model_uri
@@ -1,37 +1,61 @@
+import numpy as np
 from sklearn.model_selection import cross_val_score
 from sklearn.metrics import accuracy_score, precision_score, recall_score, roc_auc_score
 import pandas as pd
 from config import config
 
 
-def get_model_metrics(model, X_test, y_test):
+def scores_and_predictions(model, X):
     """
-    Returns a dict of evaluation metrics.
+    One scoring pass over X: returns (positive-class score, predicted labels).
+    Labels are derived from the scores with the same rule the model's
+    predict() uses, so predict() is never called separately.
     """
-    y_pred = model.predict(X_test)
     if hasattr(model, "predict_proba"):
-        y_prob = model.predict_proba(X_test)[:, 1]
-    else:
-        y_prob = model.decision_function(X_test)
+        proba = model.predict_proba(X)
+        return proba[:, 1], model.classes_.take(np.argmax(proba, axis=1))
+    decision = model.decision_function(X)
+    return decision, model.classes_.take((decision > 0).astype(int))
+
 
+def metrics_from_scores(y_true, y_pred, y_score):
     return {
-        "accuracy": accuracy_score(y_test, y_pred),
-        "precision": precision_score(y_test, y_pred),
-        "recall": recall_score(y_test, y_pred),
-        "roc_auc": roc_auc_score(y_test, y_prob)
+        "accuracy": accuracy_score(y_true, y_pred),
+        "precision": precision_score(y_true, y_pred),
+        "recall": recall_score(y_true, y_pred),
+        "roc_auc": roc_auc_score(y_true, y_score)
     }
 
 
-def run_cross_validation(model, X, y, cv=None):
+def get_model_metrics(model, X_test, y_test):
     """
-    Computes CV accuracy scores.
+    Returns a dict of evaluation metrics, from a single pass over X_test.
+    """
+    y_score, y_pred = scores_and_predictions(model, X_test)
+    return metrics_from_scores(y_test, y_pred, y_score)
+
+
+def run_cross_validation(model, X, y, cv=None, n_jobs=None):
+    """
+    Computes CV accuracy scores; folds are fitted in parallel.
     """
     if cv is None:
         cv = config.CV_FOLDS
-    scores = cross_val_score(model, X, y, cv=cv, scoring="accuracy")
+    if n_jobs is None:
+        n_jobs = config.GRID_N_JOBS
+    scores = cross_val_score(model, X, y, cv=cv, scoring="accuracy", n_jobs=n_jobs)
     return scores.mean()
 
 
+def search_cv_accuracy(search):
+    """
+    CV accuracy of a fitted search's best candidate, read from its cv_results_
+    (GridSearchCV or SuccessiveHalvingSearch scored with accuracy), so the
+    winner is not refitted on another set of folds.
+    """
+    return float(search.cv_results_["mean_test_score"][search.best_index_])
+
+
 def comparison_table(results_dict):
     """
     Converts model metric results into a single table.
@@ -0,0 +1,202 @@
+"""
+Incremental, parallel runner for the local ML pipeline.
+
+Stages are declared with the files they read (inputs), the paths they produce
+(outputs) and the stages they depend on. Before a stage runs, its signature is
+computed from the SHA-256 of every input file (directories are hashed file by
+file) plus a snapshot of the configuration. If the signature matches the last
+successful run and all outputs still exist, the stage is skipped, as make would
+do with content hashes instead of timestamps. An upstream stage that reruns but
+writes byte-identical outputs therefore does not trigger its dependents.
+
+Stages whose dependencies are satisfied run concurrently on a thread pool, in
+this process, so imported libraries and warm caches are shared. The wall time
+of every stage is recorded in the state file next to its signature.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+_BLOCK_SIZE = 1024 * 1024
+_SKIP_DIRS = {"__pycache__", ".pytest_cache"}
+
+
+class Stage:
+    """One pipeline step: func() is called with no arguments."""
+
+    def __init__(self, name, func, inputs=(), outputs=(), deps=()):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+
+
+class StageFailedError(RuntimeError):
+    """Raised by run_pipeline when a stage raised; dependents were not run."""
+
+
+def _file_digest(path, digest):
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b""):
+            digest.update(block)
+
+
+def path_digest(path):
+    """SHA-256 of a file, or of every file under a directory (with relative names); None if missing."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    if os.path.isfile(path):
+        _file_digest(path, digest)
+        return digest.hexdigest()
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(d for d in dirs if d not in _SKIP_DIRS)
+        for name in sorted(files):
+            if name.endswith(".pyc"):
+                continue
+            file_path = os.path.join(root, name)
+            digest.update(os.path.relpath(file_path, path).replace(os.sep, "/").encode())
+            _file_digest(file_path, digest)
+    return digest.hexdigest()
+
+
+def config_snapshot():
+    """Public configuration values, so changed settings invalidate stages too."""
+    return {
+        name: getattr(config, name)
+        for name in sorted(dir(config))
+        if name.isupper()
+    }
+
+
+def stage_signature(stage, params=None):
+    payload = {
+        "inputs": {path: path_digest(path) for path in stage.inputs},
+        "params": params if params is not None else config_snapshot(),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _validate(stages):
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Stage names must be unique")
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise ValueError(f"Stage {stage.name} depends on unknown stage {dep}")
+
+    # Kahn's algorithm: every stage must be reachable without a cycle
+    remaining = {stage.name: set(stage.deps) for stage in stages}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return by_name
+
+
+def load_state(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(path, state):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def run_pipeline(stages, state_path, max_workers=None, force=False, params=None):
+    """
+    Runs stages in dependency order, in parallel where possible.
+
+    Args:
+        stages: List of Stage.
+        state_path: JSON file holding each stage's last signature and timing.
+        max_workers: Stages run at the same time (default: number of stages).
+        force: Run every stage even if its inputs are unchanged.
+        params: Extra signature payload; defaults to config_snapshot().
+
+    Returns:
+        {stage name: {"status": "ran" | "skipped", "seconds": wall time}} in completion order.
+
+    Raises:
+        StageFailedError: A stage raised. Stages already running are allowed to
+        finish, nothing new is started, and the state of successful stages is kept.
+    """
+    by_name = _validate(stages)
+    state = load_state(state_path)
+    state_lock = threading.Lock()
+    results = {}
+    done = set()
+    started = set()
+    failures = []
+
+    def execute(stage):
+        signature = stage_signature(stage, params)
+        previous = state.get(stage.name, {})
+        outputs_exist = all(os.path.exists(path) for path in stage.outputs)
+        if not force and previous.get("signature") == signature and outputs_exist:
+            logger.info(f"[{stage.name}] inputs unchanged, skipping")
+            return "skipped", 0.0
+
+        logger.info(f"[{stage.name}] running")
+        start = time.perf_counter()
+        stage.func()
+        seconds = time.perf_counter() - start
+        logger.info(f"[{stage.name}] finished in {seconds:.2f}s")
+
+        with state_lock:
+            state[stage.name] = {
+                "signature": signature,
+                "seconds": round(seconds, 3),
+                "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            _save_state(state_path, state)
+        return "ran", seconds
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(stages), thread_name_prefix="stage") as pool:
+        running = {}
+        while True:
+            if not failures:
+                for stage in stages:
+                    if stage.name not in started and all(dep in done for dep in stage.deps):
+                        started.add(stage.name)
+                        running[pool.submit(execute, by_name[stage.name])] = stage.name
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    status, seconds = future.result()
+                except Exception as e:
+                    logger.error(f"[{name}] failed: {e}")
+                    failures.append((name, e))
+                    continue
+                results[name] = {"status": status, "seconds": round(seconds, 3)}
+                done.add(name)
+
+    if failures:
+        name, error = failures[0]
+        raise StageFailedError(f"Stage {name} failed: {error}") from error
+    return results
@@ -0,0 +1,106 @@
+"""
+Bounded cache of prediction results for repeated patient payloads.
+
+Entries are keyed on the canonical feature vector (FEATURE_COLUMNS order, as
+floats) and belong to one model version; the cache empties itself as soon as
+it is used with a different version. Eviction is LRU with an optional TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from prometheus_client import Counter, Gauge
+
+from preprocessing import FEATURE_COLUMNS
+
+CACHE_HITS = Counter(
+    "prediction_cache_hits_total",
+    "Predictions served from the result cache"
+)
+CACHE_MISSES = Counter(
+    "prediction_cache_misses_total",
+    "Predictions not found in the result cache"
+)
+CACHE_EVICTIONS = Counter(
+    "prediction_cache_evictions_total",
+    "Entries removed from the result cache",
+    ["reason"]
+)
+CACHE_SIZE = Gauge(
+    "prediction_cache_entries",
+    "Entries currently held in the result cache",
+    multiprocess_mode="livesum"
+)
+
+
+class PredictionCache:
+    """
+    LRU cache of prediction results with optional TTL.
+
+    Args:
+        max_size: Maximum number of entries kept.
+        ttl_seconds: Entry lifetime in seconds; 0 or None keeps entries until evicted.
+    """
+
+    def __init__(self, max_size, ttl_seconds=None):
+        self.max_size = max_size
+        self.ttl = ttl_seconds or None
+        self._entries = OrderedDict()
+        self._model_version = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(record: dict):
+        """Canonical key: feature values as floats in training column order."""
+        return tuple(float(record[col]) for col in FEATURE_COLUMNS)
+
+    def _check_model(self, model_version):
+        # Called with the lock held
+        if model_version != self._model_version:
+            if self._entries:
+                CACHE_EVICTIONS.labels(reason="model_change").inc(len(self._entries))
+                self._entries.clear()
+                CACHE_SIZE.set(0)
+            self._model_version = model_version
+
+    def get(self, model_version, record: dict):
+        """Returns the cached result for record under model_version, or None."""
+        key = self.make_key(record)
+        with self._lock:
+            self._check_model(model_version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                result, expires_at = entry
+                if expires_at is not None and time.monotonic() >= expires_at:
+                    del self._entries[key]
+                    CACHE_EVICTIONS.labels(reason="ttl").inc()
+                    CACHE_SIZE.set(len(self._entries))
+                else:
+                    self._entries.move_to_end(key)
+                    CACHE_HITS.inc()
+                    return dict(result)
+        CACHE_MISSES.inc()
+        return None
+
+    def put(self, model_version, record: dict, result: dict):
+        """Stores a successful result; error results are never cached."""
+        if "error" in result:
+            return
+        key = self.make_key(record)
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._check_model(model_version)
+            self._entries[key] = (dict(result), expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                CACHE_EVICTIONS.labels(reason="lru").inc()
+            CACHE_SIZE.set(len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            CACHE_SIZE.set(0)
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,32 +1,164 @@
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder
 from config import config
 
 
-def clean_dataset(df: pd.DataFrame) -> pd.DataFrame:
+FEATURE_COLUMNS = [col for col in config.COLUMN_NAMES if col != "target"]
+
+# Bump when HeartDiseasePreprocessor's output changes for the same input,
+# so anything saved with an older encoding is not reused.
+PREPROCESSING_VERSION = 1
+
+
+def _level_order(value):
+    """Sort key giving the order LabelEncoder assigns to str(value)."""
+    return str(value)
+
+
+class HeartDiseasePreprocessor:
     """
-    Cleans Heart Disease dataset:
-    - Replace '?' with NaN
-    - Drop rows with missing values
-    - Encode categorical variables
+    Fitted, vectorized form of the dataset cleaning rules:
+    - '?' (or any other non-numeric value) is missing; incomplete rows are dropped
+    - categorical columns get the codes LabelEncoder would give their values
+    - the target, if present, is binarized: 0 = No Disease, 1-4 = Disease
+
+    fit() learns the categorical levels; transform() applies them with one
+    numeric conversion per column and one searchsorted per categorical column,
+    so data cleaned later (e.g. by batch scoring) is encoded exactly like the
+    training data. Values not seen during fit are treated as missing.
+    The fitted levels are saved with the model, see to_metadata().
+
+    Input may have named columns, or 14 (features + target) / 13 (features)
+    positional ones. The input index is kept so rows can be traced back.
     """
-    df.replace("?", pd.NA, inplace=True)
-    df.dropna(inplace=True)
 
-    # UCI column documentation has 14+ columns; enforce consistent names
-    df.columns = config.COLUMN_NAMES
+    def __init__(self, categories=None):
+        # {column: [level, ...]} with the list position being the code
+        self.categories_ = categories
+
+    @staticmethod
+    def _parse(df):
+        """Float64 matrix of df, its column names and its index."""
+        if all(col in df.columns for col in FEATURE_COLUMNS):
+            columns = config.COLUMN_NAMES if "target" in df.columns else FEATURE_COLUMNS
+            df = df[columns]
+        elif df.shape[1] == len(config.COLUMN_NAMES):
+            columns = config.COLUMN_NAMES
+        elif df.shape[1] == len(FEATURE_COLUMNS):
+            columns = FEATURE_COLUMNS
+        else:
+            raise ValueError(
+                f"Expected {len(FEATURE_COLUMNS)} or {len(config.COLUMN_NAMES)} columns, got {df.shape[1]}"
+            )
+
+        values = np.empty((len(df), len(columns)), dtype=np.float64)
+        for j in range(len(columns)):
+            values[:, j] = pd.to_numeric(df.iloc[:, j], errors="coerce")
+        return values, list(columns), df.index
+
+    def _fit(self, values, columns, merge=False):
+        complete = values[~np.isnan(values).any(axis=1)]
+        categories = {}
+        for col in config.CATEGORICAL_COLUMNS:
+            levels = set(np.unique(complete[:, columns.index(col)]).tolist())
+            if merge and self.categories_:
+                levels.update(self.categories_[col])
+            categories[col] = sorted(levels, key=_level_order)
+        self.categories_ = categories
+
+    def _transform(self, values, columns, index):
+        if self.categories_ is None:
+            raise ValueError("HeartDiseasePreprocessor is not fitted")
+        keep = ~np.isnan(values).any(axis=1)
+        for col in config.CATEGORICAL_COLUMNS:
+            j = columns.index(col)
+            levels = np.asarray(self.categories_[col], dtype=np.float64)
+            if not len(levels):
+                keep[:] = False
+                continue
+            sorter = np.argsort(levels)
+            pos = np.searchsorted(levels, values[:, j], sorter=sorter).clip(max=len(levels) - 1)
+            codes = sorter[pos]
+            keep &= levels[codes] == values[:, j]
+            values[:, j] = codes
 
-    categorical_cols = config.CATEGORICAL_COLUMNS
+        has_target = columns[-1] == "target"
+        if has_target:
+            values[:, -1] = values[:, -1] > 0
 
-    for col in categorical_cols:
-        df[col] = LabelEncoder().fit_transform(df[col].astype(str))
+        out = pd.DataFrame(values[keep], columns=columns, index=index[keep])
+        if has_target:
+            out["target"] = out["target"].astype(int)
+        return out
 
-    df = df.astype(float)
+    def fit(self, df: pd.DataFrame):
+        self._fit(*self._parse(df)[:2])
+        return self
 
-    # Binarize target: 0 = No Disease, 1-4 = Disease
-    df['target'] = df['target'].apply(lambda x: 1 if x > 0 else 0)
+    def partial_fit(self, df: pd.DataFrame):
+        """Adds the levels seen in df, for fitting on a file chunk by chunk."""
+        self._fit(*self._parse(df)[:2], merge=True)
+        return self
 
-    return df
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self._transform(*self._parse(df))
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """fit + transform with a single conversion of df."""
+        values, columns, index = self._parse(df)
+        self._fit(values, columns)
+        return self._transform(values, columns, index)
+
+    def code_errors(self, X):
+        """
+        Checks an already encoded feature matrix (FEATURE_COLUMNS order), as the
+        API receives it, against the fitted levels. Returns one entry per row:
+        None, or why a categorical value is not a code transform() produces.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        errors = [None] * len(X)
+        for col in config.CATEGORICAL_COLUMNS:
+            values = X[:, FEATURE_COLUMNS.index(col)]
+            n = len(self.categories_[col])
+            bad = ~((values >= 0) & (values < n) & (values == np.floor(values)))
+            for i in np.flatnonzero(bad).tolist():
+                if errors[i] is None:
+                    errors[i] = f"Unknown {col} code {values[i]:g}: the model's encoding has codes 0-{n - 1}"
+        return errors
+
+    def to_dict(self):
+        return {"version": PREPROCESSING_VERSION, "categories": self.categories_}
+
+    @classmethod
+    def from_dict(cls, state):
+        if state.get("version") != PREPROCESSING_VERSION:
+            raise ValueError(
+                f"Preprocessor version {state.get('version')} does not match {PREPROCESSING_VERSION}"
+            )
+        return cls(categories={col: list(levels) for col, levels in state["categories"].items()})
+
+    def to_metadata(self):
+        """MLmodel metadata entry; pass as log_model/save_model(metadata=...)."""
+        return {"preprocessor": self.to_dict()}
+
+    @classmethod
+    def from_metadata(cls, metadata):
+        """The preprocessor saved in a model's metadata, or None for older models."""
+        if not metadata or "preprocessor" not in metadata:
+            return None
+        return cls.from_dict(metadata["preprocessor"])
+
+
+def clean_dataset(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cleans Heart Disease dataset:
+    - Replace '?' with NaN
+    - Drop rows with missing values
+    - Encode categorical variables
+    To keep the fitted encoding (e.g. to save it with a model), use
+    HeartDiseasePreprocessor().fit_transform(df) instead.
+    """
+    return HeartDiseasePreprocessor().fit_transform(df)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,214 @@
+"""
+Entry point for serving the API with one or more worker processes.
+
+With a single worker this is plain uvicorn. With several, the parent binds the
+port, loads and warms up the model once, then forks the workers so they share
+the model's memory pages copy-on-write instead of each loading a copy. While
+the parent loads, a startup worker answers on the port: /healthz is 200 and
+/ready is 503. If the load fails, the workers start anyway and /ready keeps
+reporting the failure until a reload succeeds.
+
+Admin reloads and rollbacks are published to MODEL_SYNC_FILE, which every
+worker follows. Prometheus metrics are kept in PROMETHEUS_MULTIPROC_DIR, so a
+scrape of /metrics on any worker reports totals across all of them. Workers
+that die are restarted (and catch up with the published model); SIGTERM/SIGINT
+stop all workers gracefully.
+
+Usage:
+    python src/serve.py [--workers N] [--host 0.0.0.0] [--port 8000]
+
+Multi-worker mode relies on os.fork and is meant for Linux containers.
+"""
+import argparse
+import glob
+import logging
+import math
+import os
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+import uvicorn
+
+from config import config
+
+logger = logging.getLogger("serve")
+
+STARTUP_WORKER = "startup"
+
+
+def _cgroup_cpu_quota():
+    """CPU limit imposed by the container runtime (cgroup v2 or v1), or None."""
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def available_cpus():
+    """CPUs this process may run on: its affinity mask, capped by any cgroup CPU limit."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+
+def prepare_multiproc_dir():
+    """
+    Points prometheus_client at a clean shared directory. Must run before
+    prometheus_client is imported anywhere in this process.
+    """
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or tempfile.mkdtemp(prefix="prometheus-multiproc-")
+    os.makedirs(path, exist_ok=True)
+    for stale in glob.glob(os.path.join(path, "*.db")):
+        os.remove(stale)
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
+    return path
+
+
+def prepare_sync_file():
+    """Points workers at a fresh file for sharing admin model changes."""
+    if not config.MODEL_SYNC_FILE:
+        config.MODEL_SYNC_FILE = os.path.join(tempfile.mkdtemp(prefix="model-sync-"), "model.json")
+    if os.path.exists(config.MODEL_SYNC_FILE):
+        os.remove(config.MODEL_SYNC_FILE)
+    return config.MODEL_SYNC_FILE
+
+
+def bind_socket(host, port):
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app_module, sock, worker_id):
+    """Body of a forked worker: serve on the inherited socket until told to stop."""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if app_module.audit_log is not None:
+        app_module.audit_log.use_worker_file(worker_id)
+    server = uvicorn.Server(uvicorn.Config(app_module.app, log_level=config.LOG_LEVEL.lower()))
+    server.run(sockets=[sock])
+
+
+def serve_forked(host, port, workers):
+    prepare_multiproc_dir()
+    import app as app_module
+    from prometheus_client import multiprocess
+
+    prepare_sync_file()
+    sock = bind_socket(host, port)
+    model_manager = app_module.model_manager
+
+    children = {}
+    stopping = False
+
+    def spawn(worker_id):
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                run_worker(app_module, sock, worker_id)
+            except BaseException:
+                logger.exception(f"Worker {worker_id} crashed")
+                code = 1
+            finally:
+                os._exit(code)
+        children[pid] = worker_id
+        logger.info(f"Started worker {worker_id} (pid {pid})")
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # Serves /healthz (and a 503 /ready) while the model loads below
+    model_manager.phase = "loading"
+    spawn(STARTUP_WORKER)
+
+    # Loaded once here; workers inherit it. STARTUP_MODE only decides whether
+    # a missing model may be trained.
+    try:
+        model_manager.load()
+    except Exception:
+        logger.error("Model load failed; starting workers that report it on /ready until a reload succeeds")
+
+    if not stopping:
+        for worker_id in range(workers):
+            spawn(worker_id)
+        startup_pid = next(pid for pid, worker_id in children.items() if worker_id == STARTUP_WORKER)
+        # Graceful: requests it already accepted finish
+        os.kill(startup_pid, signal.SIGTERM)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        worker_id = children.pop(pid, None)
+        if worker_id is None:
+            continue
+        # Drops the dead worker's live gauges from the aggregate
+        multiprocess.mark_process_dead(pid)
+        if not stopping and worker_id != STARTUP_WORKER:
+            logger.warning(f"Worker {worker_id} (pid {pid}) exited with status {status}; restarting")
+            time.sleep(1)
+            spawn(worker_id)
+
+    logger.info("All workers stopped")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=config.API_HOST)
+    parser.add_argument("--port", type=int, default=config.API_PORT)
+    parser.add_argument("--workers", type=int, default=config.API_WORKERS,
+                        help="Worker processes (0 = one per available CPU)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, config.LOG_LEVEL), format=config.LOG_FORMAT)
+    workers = args.workers or available_cpus()
+
+    if workers == 1:
+        uvicorn.run("app:app", host=args.host, port=args.port, log_level=config.LOG_LEVEL.lower())
+        return
+
+    if not hasattr(os, "fork"):
+        sys.exit("Multiple workers need os.fork; use --workers 1 on this platform")
+    logger.info(f"Serving on {args.host}:{args.port} with {workers} workers")
+    serve_forked(args.host, args.port, workers)
+
+
+if __name__ == "__main__":
+    main()
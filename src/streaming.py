@@ -0,0 +1,67 @@
+"""
+Helpers for streaming NDJSON request and response bodies.
+
+The response body is produced while the request body is still being read, so
+memory stays bounded by one scoring batch regardless of upload size, and a
+slow reader on either side naturally throttles the other.
+"""
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+
+
+class FullDuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse whose body iterator may itself consume the request body.
+
+    The stock implementation (ASGI spec < 2.4) listens for disconnects by
+    calling receive() concurrently, which would swallow request body chunks.
+    Here receive() is left entirely to the iterator; a disconnect surfaces as
+    ClientDisconnect from request.stream() instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_lines(chunks, max_line_bytes):
+    """
+    Splits an async iterator of byte chunks into lines.
+
+    Yields (line_number, line) with 1-based physical line numbers. A line
+    longer than max_line_bytes is discarded as it arrives and yielded as None,
+    so an unterminated line cannot grow memory without bound.
+    """
+    buffer = bytearray()
+    overflow = False
+    line_number = 0
+
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                if not overflow:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        overflow = True
+                        buffer.clear()
+                break
+
+            line_number += 1
+            if not overflow:
+                buffer += chunk[start:end]
+            if overflow or len(buffer) > max_line_bytes:
+                yield line_number, None
+            else:
+                yield line_number, bytes(buffer)
+            buffer.clear()
+            overflow = False
+            start = end + 1
+
+    if buffer or overflow:
+        yield line_number + 1, None if overflow else bytes(buffer)
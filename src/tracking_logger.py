@@ -0,0 +1,174 @@
+"""
+Write-behind MLflow logging for training runs.
+
+Training code hands params, metrics, tags and artifact files to a RunLogger,
+which only appends them to an in-memory buffer. A background thread drains the
+buffer on a schedule and sends params/metrics/tags in bulk with
+MlflowClient.log_batch (chunked to MLflow's per-request limits), then uploads
+artifacts. Failed requests are retried with exponential backoff, which matters
+when the tracking store is a remote server rather than the local mlruns
+directory.
+
+Use it as a context manager inside the MLflow run: leaving the block flushes
+everything, so the run only ends once all of its data is stored.
+
+    with mlflow.start_run() as run, RunLogger(run.info.run_id) as tracker:
+        tracker.log_params({...})
+        model.fit(...)
+        tracker.log_metrics({...})
+
+Metric timestamps are taken when a metric is logged, not when it is flushed.
+With MLFLOW_ASYNC_LOGGING=false every call is sent immediately instead.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.exceptions import MlflowException
+from mlflow.tracking import MlflowClient
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# MLflow's log_batch limits per request
+_MAX_METRICS = 1000
+_MAX_PARAMS_TAGS = 100
+
+# Errors that a retry cannot fix
+_PERMANENT_ERRORS = {"INVALID_PARAMETER_VALUE", "RESOURCE_ALREADY_EXISTS", "RESOURCE_DOES_NOT_EXIST", "BAD_REQUEST"}
+
+
+def _is_transient(error):
+    return not (isinstance(error, MlflowException) and error.error_code in _PERMANENT_ERRORS)
+
+
+class RunLogger:
+    """
+    Buffered logger for one MLflow run.
+
+    Args:
+        run_id: Run to log to.
+        client: MlflowClient (default: one for config.MLFLOW_TRACKING_URI).
+        asynchronous: Buffer and flush in the background (config.MLFLOW_ASYNC_LOGGING).
+        flush_interval: Seconds between background flushes.
+        max_retries: Retries per request after the first attempt.
+        retry_backoff: Seconds before the first retry; doubles on each retry.
+    """
+
+    def __init__(self, run_id, client=None, asynchronous=None, flush_interval=None,
+                 max_retries=None, retry_backoff=None):
+        self.run_id = run_id
+        self.client = client or MlflowClient(config.MLFLOW_TRACKING_URI)
+        self.asynchronous = config.MLFLOW_ASYNC_LOGGING if asynchronous is None else asynchronous
+        self.flush_interval = config.MLFLOW_LOG_FLUSH_INTERVAL_SECONDS if flush_interval is None else flush_interval
+        self.max_retries = config.MLFLOW_LOG_MAX_RETRIES if max_retries is None else max_retries
+        self.retry_backoff = config.MLFLOW_LOG_RETRY_BACKOFF_SECONDS if retry_backoff is None else retry_backoff
+        self._metrics = deque()
+        self._params = deque()
+        self._tags = deque()
+        self._artifacts = deque()
+        self._errors = []
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        if self.asynchronous:
+            self._thread = threading.Thread(target=self._run, name="mlflow-logger", daemon=True)
+            self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(raise_errors=exc_type is None)
+
+    # ---- buffering (called by training code) ----
+
+    def log_params(self, params):
+        self._params.extend(Param(key, str(value)) for key, value in params.items())
+        self._maybe_flush()
+
+    def log_metrics(self, metrics, step=0):
+        timestamp = int(time.time() * 1000)
+        self._metrics.extend(Metric(key, float(value), timestamp, step) for key, value in metrics.items())
+        self._maybe_flush()
+
+    def set_tags(self, tags):
+        self._tags.extend(RunTag(key, str(value)) for key, value in tags.items())
+        self._maybe_flush()
+
+    def log_artifact(self, local_path, artifact_path=None):
+        """Queues a file or directory upload; it must exist until flush() returns."""
+        self._artifacts.append((local_path, artifact_path))
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if not self.asynchronous:
+            self.flush()
+
+    # ---- draining (background thread, flush(), close()) ----
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self._drain()
+            except Exception as e:  # keep the writer alive; errors are reported on close
+                logger.error(f"MLflow background flush failed: {e}")
+
+    def _call(self, description, fn, *args, **kwargs):
+        """Runs one tracking request with retries; records the error if it never succeeds."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                fn(*args, **kwargs)
+                return
+            except Exception as e:
+                if attempt == self.max_retries or not _is_transient(e):
+                    logger.error(f"MLflow {description} for run {self.run_id} failed: {e}")
+                    self._errors.append(e)
+                    return
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning(f"MLflow {description} failed ({e}); retrying in {delay:.2f}s")
+                time.sleep(delay)
+
+    @staticmethod
+    def _take(buffer, limit):
+        return [buffer.popleft() for _ in range(min(limit, len(buffer)))]
+
+    def _drain(self):
+        with self._flush_lock:
+            while self._metrics or self._params or self._tags:
+                metrics = self._take(self._metrics, _MAX_METRICS)
+                params = self._take(self._params, _MAX_PARAMS_TAGS)
+                tags = self._take(self._tags, _MAX_PARAMS_TAGS)
+                self._call("log_batch", self.client.log_batch, self.run_id,
+                           metrics=metrics, params=params, tags=tags)
+            while self._artifacts:
+                local_path, artifact_path = self._artifacts.popleft()
+                upload = self.client.log_artifacts if os.path.isdir(local_path) else self.client.log_artifact
+                self._call(f"upload of {local_path}", upload, self.run_id, local_path, artifact_path)
+
+    def flush(self):
+        """
+        Sends everything buffered so far, from the calling thread.
+        Raises RuntimeError if any request failed for good since the last check.
+        """
+        self._drain()
+        self._raise_errors()
+
+    def _raise_errors(self):
+        if self._errors:
+            errors, self._errors = self._errors, []
+            raise RuntimeError(f"{len(errors)} MLflow logging request(s) failed for run {self.run_id}: {errors[0]}")
+
+    def close(self, raise_errors=True):
+        """Stops the background thread and flushes the rest."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._drain()
+        if raise_errors:
+            self._raise_errors()
@@ -1,5 +1,3 @@
-import pandas as pd
-
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.ensemble import RandomForestClassifier
@@ -10,10 +8,12 @@ from config import config
 from model_utils import (
     get_model_metrics,
     run_cross_validation,
+    search_cv_accuracy,
     comparison_table
 )
 
-from preprocessing import clean_dataset
+from dataset_cache import load_training_data
+from hyperparameter_search import SuccessiveHalvingSearch
 
 
 def train_models():
@@ -27,11 +27,7 @@ def train_models():
     """
 
     # Load data
-    df = pd.read_csv(config.CSV_PATH)
-    df = clean_dataset(df)
-
-    X = df.drop("target", axis=1)
-    y = df["target"]
+    X, y, preprocessor = load_training_data()
 
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=config.TEST_SIZE, random_state=config.RANDOM_STATE
@@ -48,7 +44,8 @@ def train_models():
     log_reg_pipe.fit(X_train, y_train)
 
     log_reg_metrics = get_model_metrics(log_reg_pipe, X_test, y_test)
-    log_reg_cv = run_cross_validation(log_reg_pipe, X, y)
+    # Same rows as the forest search, so the two cv_accuracy figures compare
+    log_reg_cv = run_cross_validation(log_reg_pipe, X_train, y_train)
 
     # ------------------------
     # 2. Random Forest (with Tuning)
@@ -65,15 +62,34 @@ def train_models():
         'model__min_samples_split': config.GRID_MIN_SAMPLES_SPLIT
     }
 
-    from sklearn.model_selection import GridSearchCV
-    grid_search = GridSearchCV(rf_pipe, param_grid, cv=config.CV_FOLDS, scoring='accuracy', n_jobs=config.GRID_N_JOBS)
+    if config.HPARAM_SEARCH == "halving":
+        resource = "n_samples" if config.HALVING_RESOURCE == "n_samples" else f"model__{config.HALVING_RESOURCE}"
+        grid_search = SuccessiveHalvingSearch(
+            rf_pipe, param_grid,
+            resource=resource,
+            factor=config.HALVING_FACTOR,
+            sampling=config.HALVING_SAMPLING,
+            n_candidates=config.HALVING_N_CANDIDATES,
+            max_fits=config.HALVING_MAX_FITS,
+            max_seconds=config.HALVING_MAX_SECONDS,
+            cv=config.CV_FOLDS, scoring='accuracy', n_jobs=config.GRID_N_JOBS,
+            random_state=config.RANDOM_STATE
+        )
+    else:
+        from sklearn.model_selection import GridSearchCV
+        grid_search = GridSearchCV(
+            rf_pipe, param_grid, cv=config.CV_FOLDS, scoring='accuracy', n_jobs=config.GRID_N_JOBS
+        )
     grid_search.fit(X_train, y_train)
 
     best_rf_model = grid_search.best_estimator_
     print(f"Best RF Params: {grid_search.best_params_}")
+    if config.HPARAM_SEARCH == "halving":
+        print(grid_search.describe())
 
     rf_metrics = get_model_metrics(best_rf_model, X_test, y_test)
-    rf_cv = run_cross_validation(best_rf_model, X, y)
+    # The search already cross-validated the winner
+    rf_cv = search_cv_accuracy(grid_search)
 
     # ------------------------
     # Comparison Table
@@ -96,6 +112,7 @@ def train_models():
     return {
         "log_reg_model": log_reg_pipe,
         "random_forest_model": best_rf_model,
+        "preprocessor": preprocessor,
         "comparison_table": table
     }
 
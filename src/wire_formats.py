@@ -0,0 +1,147 @@
+"""
+Compact request and response encodings for the prediction endpoints.
+
+Besides the default per-record JSON, the API accepts and returns:
+
+    application/vnd.columnar+json   {"columns": [...], "data": [[...], ...]}
+    application/octet-stream        raw little-endian float32 matrix, row-major
+
+Requests decode straight into a float64 NumPy array in FEATURE_COLUMNS order,
+without building a pydantic model or dict per row. Binary requests carry the
+13 features per row in FEATURE_COLUMNS order; binary responses carry
+(prediction, confidence) per row, with NaN for rows that could not be scored.
+"""
+import json
+
+import numpy as np
+
+from preprocessing import FEATURE_COLUMNS
+
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.columnar+json"
+FLOAT32_MATRIX = "application/octet-stream"
+
+COMPACT_TYPES = (COLUMNAR_JSON, FLOAT32_MATRIX)
+RESPONSE_TYPES = (JSON, COLUMNAR_JSON, FLOAT32_MATRIX)
+
+RESPONSE_COLUMNS = ["prediction", "confidence"]
+_ROW_BYTES = len(FEATURE_COLUMNS) * 4
+_LE_FLOAT32 = np.dtype("<f4")
+
+
+class WireFormatError(ValueError):
+    """Raised when a compact request body cannot be decoded."""
+
+
+def media_type(content_type):
+    """Bare, lower-cased media type of a Content-Type header value."""
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def negotiate(accept):
+    """
+    Picks the response media type for an Accept header. Missing or wildcard
+    headers get JSON; returns None if nothing acceptable is supported.
+    """
+    if not accept:
+        return JSON
+    candidates = []
+    for position, part in enumerate(accept.split(",")):
+        fields = part.split(";")
+        mtype = fields[0].strip().lower()
+        q = 1.0
+        for param in fields[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            candidates.append((-q, position, mtype))
+    for _, _, mtype in sorted(candidates):
+        if mtype in RESPONSE_TYPES:
+            return mtype
+        if mtype in ("*/*", "application/*"):
+            return JSON
+    return None
+
+
+def decode_columnar(body):
+    """Decodes {"columns": [...], "data": [[...]]}; columns may come in any order."""
+    try:
+        payload = json.loads(body)
+        columns = payload["columns"]
+        data = payload["data"]
+    except (ValueError, TypeError, KeyError):
+        raise WireFormatError('Body must be a JSON object with "columns" and "data"')
+
+    missing = [col for col in FEATURE_COLUMNS if col not in columns]
+    if missing:
+        raise WireFormatError(f"Missing columns: {', '.join(missing)}")
+    try:
+        matrix = np.asarray(data, dtype=np.float64)
+    except (ValueError, TypeError):
+        raise WireFormatError('"data" must be a list of numeric rows')
+    if matrix.size == 0:
+        return np.empty((0, len(FEATURE_COLUMNS)))
+    if matrix.ndim != 2 or matrix.shape[1] != len(columns):
+        raise WireFormatError(f'Every row of "data" must have {len(columns)} values')
+
+    order = [columns.index(col) for col in FEATURE_COLUMNS]
+    return matrix[:, order]
+
+
+def decode_float32_matrix(body):
+    """Decodes a raw little-endian float32 matrix with one 13-feature row per 52 bytes."""
+    if len(body) % _ROW_BYTES:
+        raise WireFormatError(
+            f"Body length {len(body)} is not a multiple of {_ROW_BYTES} bytes "
+            f"({len(FEATURE_COLUMNS)} float32 features per row)"
+        )
+    return np.frombuffer(body, dtype=_LE_FLOAT32).reshape(-1, len(FEATURE_COLUMNS)).astype(np.float64)
+
+
+def decode(content_type, body):
+    if content_type == COLUMNAR_JSON:
+        return decode_columnar(body)
+    return decode_float32_matrix(body)
+
+
+def results_to_columns(results):
+    """(predictions, confidences, errors) arrays from per-row result dicts."""
+    n = len(results)
+    preds = np.full(n, np.nan)
+    probs = np.full(n, np.nan)
+    errors = [None] * n
+    for i, result in enumerate(results):
+        if "error" in result:
+            errors[i] = result["error"]
+        else:
+            preds[i] = result["prediction"]
+            probs[i] = result["confidence"]
+    return preds, probs, errors
+
+
+def columns_to_results(preds, probs, errors):
+    """Per-row result dicts, as returned by the JSON endpoints."""
+    return [
+        {"error": error} if error is not None else {"prediction": int(pred), "confidence": float(prob)}
+        for pred, prob, error in zip(preds.tolist(), probs.tolist(), errors)
+    ]
+
+
+def encode(media, preds, probs, errors):
+    """Renders columnar JSON or float32 bytes; an "error" column is added only when needed."""
+    if media == FLOAT32_MATRIX:
+        return np.column_stack([preds, probs]).astype(_LE_FLOAT32).tobytes()
+
+    has_errors = any(error is not None for error in errors)
+    columns = RESPONSE_COLUMNS + (["error"] if has_errors else [])
+    data = []
+    for pred, prob, error in zip(preds.tolist(), probs.tolist(), errors):
+        row = [None, None] if error is not None else [int(pred), prob]
+        if has_errors:
+            row.append(error)
+        data.append(row)
+    return json.dumps({"columns": columns, "data": data}, separators=(",", ":")).encode("utf-8")
@@ -1,17 +1,31 @@
 from fastapi.testclient import TestClient
 from unittest.mock import patch
+import json
+import numpy as np
 import sys
 import os
 
 # Add src to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 
-# Mock the inference engine BEFORE importing app
-with patch('inference_pipeline.HeartDiseaseInference') as MockEngine:
+# Importing app has no side effects; load the model with a mocked inference
+# engine and a fixed URI so nothing is discovered or trained
+with patch('model_manager.HeartDiseaseInference') as MockEngine, \
+        patch.dict(os.environ, {"MLFLOW_MODEL_URI": "mock://model"}):
     mock_instance = MockEngine.return_value
+    mock_instance.model_version = "mock-version"
     mock_instance.predict_single.return_value = {"prediction": 1, "confidence": 0.85}
+    mock_instance.predict_batch.side_effect = lambda records: [
+        {"prediction": 1, "confidence": 0.85} for _ in records
+    ]
+    mock_instance.predict_matrix.side_effect = lambda X: (
+        np.ones(len(X)), np.full(len(X), 0.85)
+    )
+    mock_instance.check_codes.side_effect = lambda X: [None] * len(X)
 
-    from app import app  # noqa: E402
+    from app import app, model_manager  # noqa: E402
+    from config import config  # noqa: E402
+    model_manager.load()
     client = TestClient(app)
 
 
@@ -45,3 +59,247 @@ def test_prediction_response_schema():
     assert "prediction" in response.json()
     assert "confidence" in response.json()
 
+
+def test_predict_batch_endpoint():
+    payload = {
+        "age": 50, "sex": 1, "cp": 0, "trestbps": 130,
+        "chol": 250, "fbs": 0, "restecg": 1,
+        "thalach": 160, "exang": 0, "oldpeak": 1.0,
+        "slope": 2, "ca": 0, "thal": 2
+    }
+    bad_payload = {**payload, "chol": "not-a-number"}
+
+    response = client.post("/predict/batch", json={"records": [payload, bad_payload, payload]})
+    assert response.status_code == 200
+
+    predictions = response.json()["predictions"]
+    assert len(predictions) == 3
+    assert predictions[0] == {"prediction": 1, "confidence": 0.85}
+    assert predictions[1]["field"] == "chol"
+    assert "error" in predictions[1]
+    assert predictions[2] == {"prediction": 1, "confidence": 0.85}
+
+
+def test_predict_batch_rejects_oversized_batch():
+    from config import config
+
+    records = [{}] * (config.MAX_BATCH_SIZE + 1)
+    response = client.post("/predict/batch", json={"records": records})
+    assert response.status_code == 413
+
+
+def test_metrics_expose_prediction_cache_counters():
+    payload = {
+        "age": 51, "sex": 0, "cp": 1, "trestbps": 120,
+        "chol": 210, "fbs": 0, "restecg": 0,
+        "thalach": 150, "exang": 0, "oldpeak": 0.5,
+        "slope": 1, "ca": 0, "thal": 3
+    }
+    client.post("/predict", json=payload)
+    client.post("/predict", json=payload)
+
+    body = client.get("/metrics").text
+    assert "prediction_cache_hits_total" in body
+    assert "prediction_cache_misses_total" in body
+    assert "prediction_cache_evictions_total" in body
+
+
+def test_liveness_and_readiness():
+    assert client.get("/healthz").json() == {"status": "ok"}
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json() == {"status": "ready", "model_version": "mock-version"}
+
+    body = client.get("/metrics").text
+    assert 'api_startup_phase_seconds{phase="loading"}' in body
+    assert "api_model_ready 1.0" in body
+
+
+def test_background_startup_never_trains():
+    from model_manager import ModelManager
+
+    manager = ModelManager(allow_training=False)
+    with patch('model_manager.get_latest_model_uri', return_value=None), \
+            patch.dict(os.environ, {"MLFLOW_MODEL_URI": ""}), \
+            patch('experiment_tracking.run_experiment') as run_experiment:
+        manager.start_background_load().join(timeout=10)
+
+    run_experiment.assert_not_called()
+    assert manager.phase == "failed"
+    assert manager.engine is None
+
+
+ADMIN_HEADERS = {"X-Admin-Token": "test-token"}
+
+
+@patch.object(config, "ADMIN_TOKEN", "test-token")
+def test_admin_models_and_rollback_without_history():
+    response = client.get("/admin/models", headers=ADMIN_HEADERS)
+    assert response.status_code == 200
+    assert response.json()["current"]["model_version"] == "mock-version"
+
+    response = client.post("/admin/rollback", headers=ADMIN_HEADERS)
+    assert response.status_code == 409
+
+
+def test_admin_api_is_disabled_without_token():
+    with patch.object(config, "ADMIN_TOKEN", ""):
+        assert client.get("/admin/models").status_code == 403
+        assert client.post("/admin/reload", json={"model_uri": "/tmp/evil"}).status_code == 403
+    with patch.object(config, "ADMIN_TOKEN", "test-token"):
+        assert client.get("/admin/models", headers={"X-Admin-Token": "wrong"}).status_code == 401
+        assert client.get("/admin/models").status_code == 401
+
+
+@patch.object(config, "ADMIN_TOKEN", "test-token")
+def test_admin_reload_rejects_arbitrary_model_uri(tmp_path):
+    with patch.object(config, "MODEL_WATCH_PATH", str(tmp_path / "models")), \
+            patch.object(config, "MODEL_REGISTRY_PATH", str(tmp_path / "registry.db")), \
+            patch.object(model_manager, "reload") as reload:
+        response = client.post("/admin/reload", json={"model_uri": "file:///tmp/evil.pkl"}, headers=ADMIN_HEADERS)
+        assert response.status_code == 400
+        response = client.post("/admin/reload", json={"model_uri": str(tmp_path / "models" / ".." / "evil")},
+                               headers=ADMIN_HEADERS)
+        assert response.status_code == 400
+        reload.assert_not_called()
+
+
+def test_predict_validation_error_keeps_422_contract():
+    response = client.post("/predict", json={"age": 50})
+    assert response.status_code == 422
+    assert isinstance(response.json()["detail"], list)
+
+    response = client.post("/predict", content=b"not json", headers={"Content-Type": "application/json"})
+    assert response.status_code == 422
+
+
+def test_metrics_expose_latency_and_saturation():
+    payload = {
+        "age": 50, "sex": 1, "cp": 0, "trestbps": 130,
+        "chol": 250, "fbs": 0, "restecg": 1,
+        "thalach": 160, "exang": 0, "oldpeak": 1.0,
+        "slope": 2, "ca": 0, "thal": 2
+    }
+    client.post("/predict", json=payload)
+    client.post("/predict", json={"age": "old"})
+
+    body = client.get("/metrics").text
+    assert 'api_request_latency_seconds_count{endpoint="/predict"}' in body
+    for stage in ("validation", "serialization"):
+        assert f'api_stage_latency_seconds_count{{stage="{stage}"}}' in body
+    assert "api_requests_in_flight" in body
+    assert 'api_prediction_errors_total{model_version="mock-version",stage="validation"}' in body
+
+
+def test_openapi_documents_predict_body():
+    schema = client.get("/openapi.json").json()
+    body = schema["paths"]["/predict"]["post"]["requestBody"]["content"]["application/json"]["schema"]
+    assert "age" in body["properties"]
+
+
+def test_predict_stream_scores_ndjson_and_reports_bad_lines():
+    payload = {
+        "age": 50, "sex": 1, "cp": 0, "trestbps": 130,
+        "chol": 250, "fbs": 0, "restecg": 1,
+        "thalach": 160, "exang": 0, "oldpeak": 1.0,
+        "slope": 2, "ca": 0, "thal": 2
+    }
+    body = "\n".join([
+        json.dumps(payload),
+        "{not json",
+        "",
+        json.dumps({**payload, "chol": "high"}),
+        json.dumps(payload),
+    ]) + "\n"
+
+    response = client.post(
+        "/predict/stream", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["line"] for line in lines] == [1, 2, 4, 5]
+    assert lines[0] == {"line": 1, "prediction": 1, "confidence": 0.85}
+    assert "error" in lines[1]
+    assert lines[2]["field"] == "chol"
+    assert lines[3]["prediction"] == 1
+
+
+def test_predict_batch_accepts_columnar_json_and_returns_float32():
+    from inference_pipeline import FEATURE_COLUMNS
+
+    payload = {
+        "age": 50, "sex": 1, "cp": 0, "trestbps": 130,
+        "chol": 250, "fbs": 0, "restecg": 1,
+        "thalach": 160, "exang": 0, "oldpeak": 1.0,
+        "slope": 2, "ca": 0, "thal": 2
+    }
+    columns = list(reversed(FEATURE_COLUMNS))
+    body = {"columns": columns, "data": [[payload[c] for c in columns], [None] * len(columns)]}
+
+    response = client.post(
+        "/predict/batch",
+        content=json.dumps(body),
+        headers={"Content-Type": "application/vnd.columnar+json", "Accept": "application/octet-stream"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+
+    matrix = np.frombuffer(response.content, dtype="<f4").reshape(-1, 2)
+    assert matrix[0].tolist() == [1.0, np.float32(0.85)]
+    assert np.isnan(matrix[1]).all()
+
+
+def test_predict_accepts_float32_body_and_negotiates_response():
+    row = np.arange(13, dtype="<f4").tobytes()
+
+    response = client.post(
+        "/predict", content=row,
+        headers={"Content-Type": "application/octet-stream", "Accept": "application/vnd.columnar+json"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"columns": ["prediction", "confidence"], "data": [[1, 0.85]]}
+
+    binary = {"Content-Type": "application/octet-stream"}
+    assert client.post("/predict", content=row[:-4], headers=binary).status_code == 422
+    assert client.post("/predict", content=row, headers={**binary, "Accept": "text/csv"}).status_code == 406
+
+
+@patch.object(config, "ADMIN_TOKEN", "test-token")
+def test_admin_drift_summarizes_served_rows():
+    from drift_monitor import ReferenceProfile
+    rng = np.random.RandomState(0)
+    mock_instance.drift_profile = ReferenceProfile.fit(rng.randint(0, 3, size=(200, 13)).astype(float))
+    payload = {
+        "age": 50, "sex": 1, "cp": 0, "trestbps": 130,
+        "chol": 250, "fbs": 0, "restecg": 1,
+        "thalach": 160, "exang": 0, "oldpeak": 1.0,
+        "slope": 2, "ca": 0, "thal": 2
+    }
+    try:
+        before = client.get("/admin/drift", headers=ADMIN_HEADERS).json()["rows"]
+        client.post("/predict", json=payload)
+        client.post("/predict", json=payload)  # served from the cache, still observed
+
+        snapshot = client.get("/admin/drift", headers=ADMIN_HEADERS).json()
+        assert snapshot["rows"] == before + 2
+        assert snapshot["features"]["age"]["psi"] > 1.0
+
+        body = client.get("/metrics").text
+        assert 'api_feature_drift_psi{feature="age"}' in body
+    finally:
+        mock_instance.drift_profile = None
+
+
+def test_micro_batch_scores_with_the_engine_each_request_started_on():
+    from unittest.mock import MagicMock
+    from app import score_micro_batch
+    old, new = MagicMock(), MagicMock()
+    old.predict_batch.side_effect = lambda records: [{"model": "old"} for _ in records]
+    new.predict_batch.side_effect = lambda records: [{"model": "new"} for _ in records]
+
+    results = score_micro_batch([(old, {"x": 1}), (new, {"x": 2}), (old, {"x": 3})])
+    assert [r["model"] for r in results] == ["old", "new", "old"]
+    old.predict_batch.assert_called_once_with([{"x": 1}, {"x": 3}])
@@ -0,0 +1,66 @@
+import json
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from audit_log import AuditLog, AUDIT_RECORDS  # noqa: E402
+
+PATIENT = {
+    "age": 50.0, "sex": 1.0, "cp": 0.0, "trestbps": 130.0,
+    "chol": 250.0, "fbs": 0.0, "restecg": 1.0,
+    "thalach": 160.0, "exang": 0.0, "oldpeak": 1.0,
+    "slope": 2.0, "ca": 0.0, "thal": 2.0
+}
+RESULT = {"prediction": 1, "confidence": 0.85}
+
+
+def read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records_are_written_in_bulk_on_flush(tmp_path):
+    audit = AuditLog(str(tmp_path))
+    for _ in range(3):
+        audit.record("/predict", "v1", PATIENT, RESULT)
+    assert not os.path.exists(audit.path)  # nothing written on the request path
+
+    assert audit.flush() == 3
+    entries = read_lines(audit.path)
+    assert len(entries) == 3
+    assert entries[0]["model_version"] == "v1"
+    assert entries[0]["features"][0] == 50.0
+    assert entries[0]["prediction"] == 1
+    audit.close()
+
+
+def test_full_buffer_drops_and_counts(tmp_path):
+    dropped = AUDIT_RECORDS.labels(outcome="dropped")
+    before = dropped._value.get()
+
+    audit = AuditLog(str(tmp_path), buffer_size=2)
+    for _ in range(5):
+        audit.record("/predict", "v1", PATIENT, RESULT)
+
+    assert dropped._value.get() - before == 3
+    assert audit.flush() == 2
+    audit.close()
+
+
+def test_sampling(tmp_path):
+    audit = AuditLog(str(tmp_path), sample_rate=0.0)
+    audit.record("/predict", "v1", PATIENT, RESULT)
+    assert audit.flush() == 0
+
+
+def test_background_writer_and_rotation(tmp_path):
+    audit = AuditLog(str(tmp_path), flush_interval=0.01, max_bytes=600, backup_count=2)
+    audit.start()
+    for _ in range(20):
+        audit.record("/predict", "v1", PATIENT, RESULT)
+        audit.flush()
+    audit.close()
+
+    assert os.path.exists(audit.path + ".1")
+    assert os.path.exists(audit.path + ".2")
+    assert not os.path.exists(audit.path + ".3")
+    assert os.path.getsize(audit.path) <= 600
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import batch_scoring  # noqa: E402
+from inference_pipeline import HeartDiseaseInference, FEATURE_COLUMNS  # noqa: E402
+from preprocessing import HeartDiseasePreprocessor, clean_dataset  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def raw_csv(tmp_path_factory):
+    """Headerless UCI-style file with '?' markers, as data_acquisition saves it."""
+    rng = np.random.default_rng(1)
+    n = 230
+    df = pd.DataFrame({
+        "age": rng.integers(30, 80, n).astype(float),
+        "sex": rng.integers(0, 2, n).astype(float),
+        "cp": rng.integers(1, 5, n).astype(float),
+        "trestbps": rng.integers(90, 180, n).astype(float),
+        "chol": rng.integers(150, 400, n).astype(float),
+        "fbs": rng.integers(0, 2, n).astype(float),
+        "restecg": rng.integers(0, 3, n).astype(float),
+        "thalach": rng.integers(80, 200, n).astype(float),
+        "exang": rng.integers(0, 2, n).astype(float),
+        "oldpeak": rng.integers(0, 40, n) / 10,
+        "slope": rng.integers(1, 4, n).astype(float),
+        "ca": rng.integers(0, 4, n).astype(float).astype(object),
+        "thal": rng.choice([3.0, 6.0, 7.0], n).astype(object),
+        "target": rng.integers(0, 5, n),
+    })
+    df.loc[[5, 77, 150], "ca"] = "?"
+    df.loc[[12, 199], "thal"] = "?"
+    path = tmp_path_factory.mktemp("scoring") / "cohort.csv"
+    df.to_csv(path, header=False, index=False)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def model_dir(raw_csv, tmp_path_factory):
+    import mlflow.sklearn
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.ensemble import RandomForestClassifier
+
+    df = clean_dataset(pd.read_csv(raw_csv, header=None))
+    model = Pipeline([
+        ("scaler", StandardScaler()),
+        ("clf", RandomForestClassifier(n_estimators=10, random_state=42))
+    ])
+    model.fit(df[FEATURE_COLUMNS], df["target"])
+
+    path = str(tmp_path_factory.mktemp("model") / "rf")
+    mlflow.sklearn.save_model(model, path)
+    return path
+
+
+def test_chunked_scoring_matches_whole_file_cleaning(raw_csv, model_dir, tmp_path):
+    output = str(tmp_path / "predictions.csv")
+    summary = batch_scoring.score_file(raw_csv, output, model_uri=model_dir, chunk_size=40, workers=1,
+                                       fit_levels=True)
+
+    expected = clean_dataset(pd.read_csv(raw_csv, header=None))
+    engine = HeartDiseaseInference(model_uri=model_dir, backend="sklearn")
+    preds, probs = engine.predict_matrix(expected[FEATURE_COLUMNS].to_numpy())
+
+    scored = pd.read_csv(output)
+    assert summary["rows_read"] == 230
+    assert summary["rows_scored"] == len(expected) == 225
+    assert list(scored["row"]) == list(expected.index)
+    assert list(scored["prediction"]) == list(preds)
+    assert np.allclose(scored["confidence"], probs)
+    assert not os.path.exists(output + ".progress.json")
+
+
+def test_resume_after_crash_produces_identical_output(raw_csv, model_dir, tmp_path, monkeypatch):
+    reference = str(tmp_path / "reference.csv")
+    batch_scoring.score_file(raw_csv, reference, model_uri=model_dir, chunk_size=40, workers=1, fit_levels=True)
+
+    output = str(tmp_path / "predictions.csv")
+    score_chunk = batch_scoring._score_chunk
+    calls = []
+
+    def crash_on_third_chunk(df):
+        calls.append(1)
+        if len(calls) == 3:
+            raise RuntimeError("worker died")
+        return score_chunk(df)
+
+    monkeypatch.setattr(batch_scoring, "_score_chunk", crash_on_third_chunk)
+    with pytest.raises(RuntimeError):
+        batch_scoring.score_file(raw_csv, output, model_uri=model_dir, chunk_size=40, workers=1, fit_levels=True)
+    monkeypatch.setattr(batch_scoring, "_score_chunk", score_chunk)
+
+    summary = batch_scoring.score_file(raw_csv, output, chunk_size=40, workers=1, resume=True)
+
+    assert summary["rows_read"] == 230 - 80
+    with open(reference) as expected, open(output) as actual:
+        assert actual.read() == expected.read()
+
+
+def test_model_with_saved_preprocessor_skips_level_scan(raw_csv, model_dir, tmp_path, monkeypatch):
+    import mlflow.sklearn
+
+    preprocessor = HeartDiseasePreprocessor().fit(pd.read_csv(raw_csv, header=None))
+    path = str(tmp_path / "rf_with_preprocessor")
+    mlflow.sklearn.save_model(mlflow.sklearn.load_model(model_dir), path, metadata=preprocessor.to_metadata())
+    assert HeartDiseaseInference(model_uri=path, backend="sklearn").preprocessor.to_dict() == preprocessor.to_dict()
+
+    def no_scan(self, df):
+        raise AssertionError("levels should come from the model")
+
+    monkeypatch.setattr(HeartDiseasePreprocessor, "partial_fit", no_scan)
+    reference = str(tmp_path / "reference.csv")
+    output = str(tmp_path / "predictions.csv")
+    batch_scoring.score_file(raw_csv, output, model_uri=path, chunk_size=40, workers=1)
+    monkeypatch.undo()
+    batch_scoring.score_file(raw_csv, reference, model_uri=model_dir, chunk_size=40, workers=1, fit_levels=True)
+
+    with open(reference) as expected, open(output) as actual:
+        assert actual.read() == expected.read()
+
+
+def test_model_without_preprocessor_needs_fit_levels(raw_csv, model_dir, tmp_path):
+    output = str(tmp_path / "predictions.csv")
+    with pytest.raises(ValueError, match="--fit-levels"):
+        batch_scoring.score_file(raw_csv, output, model_uri=model_dir, chunk_size=40, workers=1)
+    assert not os.path.exists(output)
+
+
+def test_resume_counts_blank_lines(raw_csv, model_dir, tmp_path, monkeypatch):
+    with open(raw_csv) as f:
+        lines = f.read().splitlines()
+    gappy = str(tmp_path / "gappy.csv")
+    with open(gappy, "w") as f:
+        f.write("\n".join(lines[:10] + [""] * 3 + lines[10:60] + [""] + lines[60:]) + "\n")
+
+    reference = str(tmp_path / "reference.csv")
+    batch_scoring.score_file(gappy, reference, model_uri=model_dir, chunk_size=40, workers=1, fit_levels=True)
+
+    output = str(tmp_path / "predictions.csv")
+    score_chunk = batch_scoring._score_chunk
+    calls = []
+
+    def crash_on_third_chunk(df):
+        calls.append(1)
+        if len(calls) == 3:
+            raise RuntimeError("worker died")
+        return score_chunk(df)
+
+    monkeypatch.setattr(batch_scoring, "_score_chunk", crash_on_third_chunk)
+    with pytest.raises(RuntimeError):
+        batch_scoring.score_file(gappy, output, model_uri=model_dir, chunk_size=40, workers=1, fit_levels=True)
+    monkeypatch.setattr(batch_scoring, "_score_chunk", score_chunk)
+
+    summary = batch_scoring.score_file(gappy, output, chunk_size=40, workers=1, resume=True)
+
+    assert summary["rows_read"] == 230 - 76
+    with open(reference) as expected, open(output) as actual:
+        assert actual.read() == expected.read()
+    assert len(pd.read_csv(reference)) == 225
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from batching import MicroBatcher, QueueFullError  # noqa: E402
+
+
+def test_concurrent_requests_are_batched_in_order():
+    calls = []
+
+    def predict_batch(records):
+        calls.append(len(records))
+        return [{"prediction": r["x"] % 2, "confidence": r["x"] / 100} for r in records]
+
+    async def scenario():
+        batcher = MicroBatcher(predict_batch, max_batch_size=8, max_wait_ms=50)
+        results = await asyncio.gather(*(batcher.submit({"x": i}) for i in range(20)))
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert [r["confidence"] for r in results] == [i / 100 for i in range(20)]
+    assert sum(calls) == 20
+    assert max(calls) <= 8
+    assert len(calls) < 20
+
+
+def test_batch_failure_propagates_to_callers():
+    def predict_batch(records):
+        raise RuntimeError("model unavailable")
+
+    async def scenario():
+        batcher = MicroBatcher(predict_batch, max_batch_size=4, max_wait_ms=1)
+        try:
+            with pytest.raises(RuntimeError):
+                await batcher.submit({"x": 1})
+        finally:
+            await batcher.stop()
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_rejects_instead_of_growing():
+    async def scenario():
+        batcher = MicroBatcher(lambda records: [r["x"] for r in records], max_batch_size=2,
+                               max_wait_ms=50, max_queue_size=3)
+        waiting = [asyncio.ensure_future(batcher.submit({"x": i})) for i in range(3)]
+        await asyncio.sleep(0)  # all three queued, the worker has not taken any yet
+        try:
+            with pytest.raises(QueueFullError):
+                await batcher.submit({"x": 3})
+            return await asyncio.gather(*waiting)
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(scenario()) == [0, 1, 2]
@@ -0,0 +1,33 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+from bench_utils import summarize  # noqa: E402
+from compare import compare  # noqa: E402
+
+
+def test_summarize_percentiles():
+    summary = summarize([i / 1000 for i in range(1, 101)], unit="ms")
+    assert summary["n"] == 100
+    assert summary["p50"] == 50.0
+    assert summary["p95"] == 95.0
+    assert summary["p99"] == 99.0
+
+
+def test_compare_flags_slower_latency_and_lower_throughput():
+    baseline = {"results": {
+        "predict_single": {"p50": 100.0, "p99": 200.0},
+        "overall": {"p50": 1.0, "throughput_rps": 1000.0},
+        "removed": {"p50": 1.0},
+    }}
+    current = {"results": {
+        "predict_single": {"p50": 105.0, "p99": 260.0},
+        "overall": {"p50": 0.5, "throughput_rps": 800.0},
+    }}
+
+    rows = {(case, metric): regressed for case, metric, _, _, _, regressed in compare(baseline, current, 0.10)}
+
+    assert rows[("predict_single", "p50")] is False
+    assert rows[("predict_single", "p99")] is True
+    assert rows[("overall", "p50")] is False
+    assert rows[("overall", "throughput_rps")] is True
+    assert not any(case == "removed" for case, _ in rows)
@@ -1,8 +1,13 @@
+import numpy as np
 import pandas as pd
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-from preprocessing import clean_dataset  # noqa: E402
+from config import config  # noqa: E402
+from preprocessing import HeartDiseasePreprocessor, clean_dataset  # noqa: E402
+
+COLUMN_NAMES = config.COLUMN_NAMES
+CATEGORICAL_COLUMNS = config.CATEGORICAL_COLUMNS
 
 
 def test_clean_dataset():
@@ -39,3 +44,57 @@ def test_clean_dataset():
     })
     df2_clean = clean_dataset(df2)
     assert df2_clean['target'].iloc[0] == 1
+
+
+def _label_encoded_reference(df):
+    """The original per-call LabelEncoder cleaning, kept as the encoding spec."""
+    from sklearn.preprocessing import LabelEncoder
+    df = df.replace("?", pd.NA).dropna()
+    df.columns = COLUMN_NAMES
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = LabelEncoder().fit_transform(df[col].astype(str))
+    df = df.astype(float)
+    df["target"] = df["target"].apply(lambda x: 1 if x > 0 else 0)
+    return df
+
+
+def _raw_frame(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        0: rng.integers(30, 80, n).astype(float), 1: rng.integers(0, 2, n).astype(float),
+        2: rng.integers(1, 5, n).astype(float), 3: rng.integers(90, 180, n).astype(float),
+        4: rng.integers(150, 400, n).astype(float), 5: rng.integers(0, 2, n).astype(float),
+        6: rng.integers(0, 3, n).astype(float), 7: rng.integers(80, 200, n).astype(float),
+        8: rng.integers(0, 2, n).astype(float), 9: rng.integers(0, 40, n) / 10,
+        10: rng.integers(1, 4, n).astype(float), 11: rng.integers(0, 4, n).astype(float).astype(object),
+        12: rng.choice([3.0, 6.0, 7.0], n).astype(object), 13: rng.integers(0, 5, n),
+    })
+    df.loc[[3, 50], 11] = "?"
+    df.loc[[7], 12] = "?"
+    return df
+
+
+def test_preprocessor_matches_label_encoder_cleaning():
+    raw = _raw_frame()
+    expected = _label_encoded_reference(raw.copy())
+    actual = HeartDiseasePreprocessor().fit_transform(raw)
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_fitted_preprocessor_round_trips_and_encodes_new_data_identically():
+    train = _raw_frame(seed=1)
+    preprocessor = HeartDiseasePreprocessor().fit(train)
+    restored = HeartDiseasePreprocessor.from_metadata(preprocessor.to_metadata())
+
+    # A small slice need not contain every level, yet keeps the training codes
+    full = preprocessor.transform(train)
+    pd.testing.assert_frame_equal(restored.transform(train.iloc[:20]), full[full.index < 20])
+    assert HeartDiseasePreprocessor.from_metadata({}) is None
+
+
+def test_preprocessor_drops_unseen_levels():
+    train = _raw_frame()
+    preprocessor = HeartDiseasePreprocessor().fit(train)
+    row = train.iloc[[0]].copy()
+    row[12] = 5.0  # thal is only ever 3, 6 or 7
+    assert preprocessor.transform(row).empty
@@ -0,0 +1,169 @@
+import hashlib
+import os
+import sys
+import zipfile
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import data_acquisition  # noqa: E402
+from config import config  # noqa: E402
+
+CLEVELAND = (b"63.0,1.0,1.0,145.0,233.0,1.0,2.0,150.0,0.0,2.3,3.0,0.0,6.0,0\n"
+             b"67.0,1.0,4.0,160.0,286.0,0.0,2.0,108.0,1.0,1.5,2.0,3.0,?,2\n")
+
+
+def _archive(path, target=CLEVELAND):
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("processed.hungarian.data", b"40,1,2,140,289,0,0,172,0,0,?,?,?,0\n")
+        archive.writestr("processed.cleveland.data", target)
+        archive.writestr("heart-disease.names", b"notes\n")
+    return path
+
+
+@pytest.fixture
+def mirror(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "DATA_SHA256", "")
+    return _archive(tmp_path / "mirror.zip")
+
+
+def test_file_mirror_extracts_only_the_target_file_unchanged(tmp_path, mirror):
+    out = tmp_path / "data"
+    csv_path = data_acquisition.download_dataset(mirror.as_uri(), str(out), str(out / "heart.csv"))
+
+    # Byte for byte, including the '?' markers, and nothing else extracted
+    assert open(csv_path, "rb").read() == CLEVELAND
+    assert sorted(os.listdir(out)) == ["heart.csv", "heart.zip", "heart.zip.meta.json"]
+
+
+def test_repeat_runs_skip_fetch_and_extraction(tmp_path, mirror, monkeypatch):
+    out = tmp_path / "data"
+    args = (mirror.as_uri(), str(out), str(out / "heart.csv"))
+    data_acquisition.download_dataset(*args)
+
+    def fail(*a, **k):
+        raise AssertionError("should not run")
+
+    with monkeypatch.context() as m:
+        m.setattr(data_acquisition, "_write_stream", fail)
+        data_acquisition.download_dataset(*args)
+
+    # A locally modified CSV is restored from the archive
+    (out / "heart.csv").write_bytes(b"edited\n")
+    data_acquisition.download_dataset(*args)
+    assert (out / "heart.csv").read_bytes() == CLEVELAND
+
+    # A changed mirror is fetched again
+    changed = CLEVELAND + b"41.0,0.0,2.0,130.0,204.0,0.0,2.0,172.0,0.0,1.4,1.0,0.0,3.0,0\n"
+    _archive(mirror, changed)
+    stat = os.stat(mirror)
+    os.utime(mirror, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    data_acquisition.download_dataset(*args)
+    assert (out / "heart.csv").read_bytes() == changed
+
+
+def test_checksum_is_verified(tmp_path, mirror, monkeypatch):
+    out = tmp_path / "data"
+    monkeypatch.setattr(config, "DATA_SHA256", "0" * 64)
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        data_acquisition.download_dataset(mirror.as_uri(), str(out), str(out / "heart.csv"))
+    assert not (out / "heart.zip").exists()
+
+    # A local copy with the expected checksum is used even when the source is gone
+    monkeypatch.setattr(config, "DATA_SHA256", hashlib.sha256(mirror.read_bytes()).hexdigest())
+    data_acquisition.download_dataset(mirror.as_uri(), str(out), str(out / "heart.csv"))
+    os.remove(mirror)
+    (out / "heart.csv").unlink()
+    data_acquisition.download_dataset(mirror.as_uri(), str(out), str(out / "heart.csv"))
+    assert (out / "heart.csv").read_bytes() == CLEVELAND
+
+
+def test_checksum_cannot_be_bypassed_by_a_tampered_local_copy(tmp_path, mirror):
+    out = tmp_path / "data"
+    out.mkdir()
+    good = hashlib.sha256(mirror.read_bytes()).hexdigest()
+    dest = str(out / "heart.zip")
+    assert data_acquisition.fetch(mirror.as_uri(), dest) is True
+
+    # Same mirror etag, but the local copy no longer matches: fetched again
+    with open(dest, "ab") as f:
+        f.write(b"tampered")
+    assert data_acquisition.fetch(mirror.as_uri(), dest, expected_sha256=good) is True
+    assert hashlib.sha256(open(dest, "rb").read()).hexdigest() == good
+
+    # A mismatching download leaves the last good archive in place
+    _archive(mirror, b"something else\n")
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        data_acquisition.fetch(mirror.as_uri(), dest, expected_sha256="0" * 64)
+    assert hashlib.sha256(open(dest, "rb").read()).hexdigest() == good
+    assert sorted(os.listdir(out)) == ["heart.zip", "heart.zip.meta.json"]
+
+
+def test_checksum_match_records_the_source(tmp_path, mirror):
+    out = tmp_path / "data"
+    out.mkdir()
+    dest = out / "heart.zip"
+    dest.write_bytes(mirror.read_bytes())
+    good = hashlib.sha256(mirror.read_bytes()).hexdigest()
+
+    assert data_acquisition.fetch(mirror.as_uri(), str(dest), expected_sha256=good) is False
+    meta = data_acquisition._load_meta(f"{dest}.meta.json")
+    assert meta["url"] == mirror.as_uri() and meta["sha256"] == good
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+def test_remote_download_streams_and_revalidates_with_etag(tmp_path, mirror, monkeypatch):
+    body = mirror.read_bytes()
+    calls = []
+
+    def fake_get(url, headers, stream, timeout):
+        calls.append(headers)
+        assert stream
+        if headers.get("If-None-Match") == '"v1"':
+            return FakeResponse(304)
+        return FakeResponse(200, body, {"ETag": '"v1"'})
+
+    monkeypatch.setattr(data_acquisition.requests, "get", fake_get)
+    monkeypatch.setattr(data_acquisition, "CHUNK_SIZE", 64)
+    out = tmp_path / "data"
+    args = ("https://example.org/heart.zip", str(out), str(out / "heart.csv"))
+
+    data_acquisition.download_dataset(*args)
+    data_acquisition.download_dataset(*args)
+
+    assert calls == [{}, {"If-None-Match": '"v1"'}]
+    assert (out / "heart.zip").read_bytes() == body
+    assert (out / "heart.csv").read_bytes() == CLEVELAND
+
+
+def test_not_modified_response_is_still_checked(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_get(url, headers, stream, timeout):
+        calls.append(headers)
+        return FakeResponse(304)
+
+    monkeypatch.setattr(data_acquisition.requests, "get", fake_get)
+    dest = tmp_path / "heart.zip"
+    dest.write_bytes(b"stale")
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        data_acquisition.fetch("https://example.org/heart.zip", str(dest), expected_sha256="0" * 64)
+    assert calls == [{}]  # no conditional headers for a copy that fails the checksum
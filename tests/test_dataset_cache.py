@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import dataset_cache  # noqa: E402
+from preprocessing import HeartDiseasePreprocessor, clean_dataset  # noqa: E402
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    rng = np.random.default_rng(3)
+    n = 120
+    df = pd.DataFrame({
+        "age": rng.integers(30, 80, n), "sex": rng.integers(0, 2, n), "cp": rng.integers(1, 5, n),
+        "trestbps": rng.integers(90, 180, n), "chol": rng.integers(150, 400, n), "fbs": rng.integers(0, 2, n),
+        "restecg": rng.integers(0, 3, n), "thalach": rng.integers(80, 200, n), "exang": rng.integers(0, 2, n),
+        "oldpeak": rng.integers(0, 40, n) / 10, "slope": rng.integers(1, 4, n),
+        "ca": rng.integers(0, 4, n).astype(object), "thal": rng.choice([3, 6, 7], n).astype(object),
+        "target": rng.integers(0, 5, n),
+    }).astype({"age": float, "chol": float})
+    df.loc[[10, 40], "ca"] = "?"
+    path = tmp_path / "heart.csv"
+    df.to_csv(path, header=False, index=False)
+    return str(path)
+
+
+def test_cache_hit_returns_memory_mapped_copy_of_cleaned_data(raw_csv, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    X, y, preprocessor = dataset_cache.load_training_data(raw_csv, cache_dir)
+
+    expected = clean_dataset(pd.read_csv(raw_csv))
+    pd.testing.assert_frame_equal(X, expected.drop("target", axis=1))
+    pd.testing.assert_series_equal(y, expected["target"])
+
+    def no_cleaning(self, df):
+        raise AssertionError("cached dataset should not be cleaned again")
+
+    monkeypatch.setattr(HeartDiseasePreprocessor, "fit_transform", no_cleaning)
+    X2, y2, preprocessor2 = dataset_cache.load_training_data(raw_csv, cache_dir)
+    pd.testing.assert_frame_equal(X2, X)
+    pd.testing.assert_series_equal(y2, y)
+    assert preprocessor2.to_dict() == preprocessor.to_dict()
+    assert not X2.to_numpy().flags.writeable
+
+
+def test_changed_input_gets_new_entry_and_old_one_is_pruned(raw_csv, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    first_key = dataset_cache.cache_key(raw_csv)
+    X, _, _ = dataset_cache.load_training_data(raw_csv, cache_dir)
+
+    with open(raw_csv, "a") as f:
+        f.write("50.0,1,2,140,250.0,0,1,150,0,1.0,2,0,3,1\n")
+    assert dataset_cache.cache_key(raw_csv) != first_key
+
+    X2, _, _ = dataset_cache.load_training_data(raw_csv, cache_dir)
+    assert len(X2) == len(X) + 1
+    assert os.listdir(cache_dir) == [dataset_cache.cache_key(raw_csv)]
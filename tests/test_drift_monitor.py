@@ -0,0 +1,96 @@
+import sys
+import os
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from drift_monitor import DriftMonitor, ReferenceProfile, DRIFT_DROPPED, psi  # noqa: E402
+from preprocessing import FEATURE_COLUMNS  # noqa: E402
+
+
+def make_frame(n=500, seed=0, shift=0.0):
+    rng = np.random.RandomState(seed)
+    data = {col: rng.normal(100 + shift, 10, n) for col in FEATURE_COLUMNS}
+    for col in ["sex", "cp", "fbs", "restecg", "exang", "slope", "ca", "thal"]:
+        data[col] = rng.randint(0, 3, n).astype(float)
+    return pd.DataFrame(data)[FEATURE_COLUMNS]
+
+
+def test_profile_round_trips_through_model_metadata():
+    profile = ReferenceProfile.fit(make_frame())
+    restored = ReferenceProfile.from_metadata(profile.to_metadata())
+
+    assert restored.rows == 500
+    assert restored.features["cp"]["kind"] == "categorical"
+    assert restored.features["cp"]["cuts"] == [0.0, 1.0, 2.0]
+    assert len(restored.features["age"]["cuts"]) == 9
+    assert np.isclose(sum(restored.features["age"]["proportions"]), 1.0)
+    assert ReferenceProfile.from_metadata({"preprocessor": {}}) is None
+
+
+def test_unseen_categorical_levels_go_to_last_bin():
+    profile = ReferenceProfile.fit(make_frame())
+    j = FEATURE_COLUMNS.index("cp")
+    assert profile.bin_index(j, np.array([0.0, 2.0, 7.0, 0.5])).tolist() == [0, 2, 3, 3]
+
+
+def test_sketch_matches_exact_statistics_across_flushes():
+    reference = make_frame(seed=0)
+    profile = ReferenceProfile.fit(reference)
+    live = make_frame(n=300, seed=1)
+    monitor = DriftMonitor(lambda: profile)
+
+    rows = live.to_dict(orient="records")
+    for row in rows[:120]:
+        monitor.observe(row)
+    assert monitor.flush() == 120
+    for row in rows[120:]:
+        monitor.observe(list(row.values()))
+    assert monitor.flush() == 180
+
+    snapshot = monitor.snapshot()
+    assert snapshot["rows"] == 300
+    for col in FEATURE_COLUMNS:
+        assert np.isclose(snapshot["features"][col]["mean"], live[col].mean())
+        assert np.isclose(snapshot["features"][col]["std"], live[col].std(ddof=0))
+    # Same distribution: little drift
+    assert snapshot["features"]["age"]["psi"] < 0.1
+
+
+def test_shifted_feature_shows_drift():
+    profile = ReferenceProfile.fit(make_frame(seed=0))
+    monitor = DriftMonitor(lambda: profile)
+    for row in make_frame(n=300, seed=1, shift=15.0).to_dict(orient="records"):
+        monitor.observe(row)
+    monitor.flush()
+
+    features = monitor.snapshot()["features"]
+    assert features["age"]["psi"] > 1.0
+    assert features["age"]["ks"] > 0.5
+    assert features["cp"]["psi"] < 0.1
+    assert psi(np.array([0.5, 0.5]), np.array([0.5, 0.5])) == 0.0
+
+
+def test_full_buffer_drops_and_counts():
+    before = DRIFT_DROPPED._value.get()
+    monitor = DriftMonitor(lambda: None, buffer_size=2)
+    for _ in range(3):
+        monitor.observe([0.0] * len(FEATURE_COLUMNS))
+    assert DRIFT_DROPPED._value.get() == before + 1
+    assert monitor.flush() == 2
+
+
+def test_sketches_restart_when_the_profile_changes():
+    first = ReferenceProfile.fit(make_frame(seed=0))
+    second = ReferenceProfile.fit(make_frame(seed=2))
+    current = {"profile": first}
+    monitor = DriftMonitor(lambda: current["profile"])
+    for row in make_frame(n=50, seed=1).to_dict(orient="records"):
+        monitor.observe(row)
+    monitor.flush()
+    assert monitor.snapshot()["rows"] == 50
+
+    current["profile"] = second
+    monitor.observe(make_frame(n=1, seed=3).iloc[0].to_dict())
+    monitor.flush()
+    assert monitor.snapshot()["rows"] == 1
+    assert monitor.profile is second
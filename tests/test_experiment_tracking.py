@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import experiment_tracking  # noqa: E402
+from config import config  # noqa: E402
+from inference_pipeline import FEATURE_COLUMNS  # noqa: E402
+from model_registry import ModelRegistry  # noqa: E402
+from preprocessing import HeartDiseasePreprocessor  # noqa: E402
+
+
+@pytest.fixture
+def small_dataset(monkeypatch):
+    rng = np.random.default_rng(5)
+    X = pd.DataFrame(rng.integers(0, 3, size=(120, len(FEATURE_COLUMNS))).astype(float), columns=FEATURE_COLUMNS)
+    y = pd.Series((X["cp"] + rng.normal(scale=0.5, size=120) > 1).astype(int), name="target")
+    preprocessor = HeartDiseasePreprocessor(categories={col: [0.0, 1.0, 2.0] for col in config.CATEGORICAL_COLUMNS})
+    monkeypatch.setattr(experiment_tracking, "load_training_data", lambda: (X, y, preprocessor))
+    monkeypatch.setattr(config, "RF_N_ESTIMATORS", 10)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_candidates_get_own_runs_with_plots(small_dataset, tmp_path, monkeypatch, workers):
+    import mlflow
+    import mlflow.sklearn
+
+    tracking_uri = (tmp_path / "mlruns").as_uri()
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", tracking_uri)
+    monkeypatch.setattr(config, "EXPERIMENT_WORKERS", workers)
+    monkeypatch.chdir(tmp_path)
+
+    model_uri = experiment_tracking.run_experiment()
+
+    model = mlflow.sklearn.load_model(model_uri)
+    assert type(model.named_steps["clf"]).__name__ == "RandomForestClassifier"
+
+    mlflow.set_tracking_uri(tracking_uri)
+    runs = mlflow.search_runs(experiment_names=[config.EXPERIMENT_NAME])
+    assert sorted(runs["tags.mlflow.runName"]) == ["logistic_regression_run", "random_forest_run"]
+    assert runs["metrics.accuracy"].notna().all()
+    client = mlflow.tracking.MlflowClient()
+    for run_id in runs["run_id"]:
+        names = {artifact.path for artifact in client.list_artifacts(run_id)}
+        assert any(name.endswith("_confusion_matrix.png") for name in names)
+        assert any(name.endswith("_roc_curve.png") for name in names)
+    # Plots are no longer written to the working directory
+    assert not list(tmp_path.glob("*.png"))
+
+    # Both models are indexed; the Random Forest is the serving candidate
+    registry = ModelRegistry(str(tmp_path / config.MODEL_REGISTRY_PATH))
+    assert sorted(entry["name"] for entry in registry.versions()) == ["logistic_regression", "random_forest"]
+    candidate = registry.get("candidate")
+    assert candidate["name"] == "random_forest"
+    assert candidate["metrics"]["accuracy"] == pytest.approx(runs.set_index("tags.mlflow.runName").loc[
+        "random_forest_run", "metrics.accuracy"])
+    assert candidate["artifact_bytes"] > 0
+    assert type(mlflow.sklearn.load_model(candidate["uri"]).named_steps["clf"]).__name__ == "RandomForestClassifier"
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from hyperparameter_search import SuccessiveHalvingSearch  # noqa: E402
+from sklearn.ensemble import RandomForestClassifier  # noqa: E402
+from sklearn.pipeline import Pipeline  # noqa: E402
+from sklearn.preprocessing import StandardScaler  # noqa: E402
+
+PARAM_GRID = {
+    "model__n_estimators": [9, 27],
+    "model__max_depth": [2, 4, None],
+    "model__min_samples_split": [2, 5, 10],
+}
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 5)), columns=list("abcde"))
+    y = pd.Series((X["a"] + X["b"] + rng.normal(scale=0.5, size=200) > 0).astype(int))
+    return X, y
+
+
+def pipeline():
+    return Pipeline([("scaler", StandardScaler()), ("model", RandomForestClassifier(random_state=0))])
+
+
+def test_halving_over_trees_uses_fewer_fits_than_the_grid(data):
+    X, y = data
+    search = SuccessiveHalvingSearch(pipeline(), PARAM_GRID, resource="model__n_estimators",
+                                     cv=3, random_state=0).fit(X, y)
+
+    assert search.summary_["candidates"] == 9
+    assert search.summary_["exhaustive_fits"] == 18 * 3 + 1
+    assert search.summary_["fits"] < search.summary_["exhaustive_fits"]
+    assert search.summary_["fits_saved"] == search.summary_["exhaustive_fits"] - search.summary_["fits"]
+    # Only the resource grows between rungs; the winner is refit with all trees
+    assert search.best_params_["model__n_estimators"] == 27
+    assert search.best_estimator_.named_steps["model"].n_estimators == 27
+    assert set(search.cv_results_["resource"]) <= {3, 9, 27}
+
+
+def test_halving_over_samples_with_random_candidates(data):
+    X, y = data
+    search = SuccessiveHalvingSearch(pipeline(), PARAM_GRID, resource="n_samples", sampling="random",
+                                     n_candidates=6, cv=3, random_state=0).fit(X, y)
+
+    assert search.summary_["candidates"] == 6
+    assert max(search.cv_results_["resource"]) <= len(X)
+    assert search.cv_results_["resource"][0] < len(X)
+    assert search.best_estimator_.predict(X).shape == (len(X),)
+
+
+def test_fit_budget_is_respected(data):
+    X, y = data
+    search = SuccessiveHalvingSearch(pipeline(), PARAM_GRID, resource="model__n_estimators",
+                                     max_fits=17, cv=3, random_state=0).fit(X, y)
+
+    assert search.summary_["budget_exhausted"]
+    # 5 candidates x 3 folds, plus the final refit; a 6th candidate would need 19
+    assert search.summary_["fits"] == 16
+    assert len(search.cv_results_["params"]) == 5
+
+
+def test_best_index_points_at_the_winner_in_cv_results(data):
+    X, y = data
+    search = SuccessiveHalvingSearch(pipeline(), PARAM_GRID, resource="model__n_estimators",
+                                     cv=3, random_state=0).fit(X, y)
+    assert search.cv_results_["mean_test_score"][search.best_index_] == search.best_score_
+    assert search.cv_results_["rung"][search.best_index_] == search.summary_["rungs"] - 1
@@ -0,0 +1,168 @@
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from inference_pipeline import HeartDiseaseInference, FEATURE_COLUMNS  # noqa: E402
+from forest_compiler import compile_pipeline, float32_thresholds  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def samples():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(120, len(FEATURE_COLUMNS))) * 10 + 50, columns=FEATURE_COLUMNS)
+    y = (X["age"] + rng.normal(scale=5, size=len(X)) > 50).astype(int)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def model_dir(samples, tmp_path_factory):
+    import mlflow.sklearn
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, y = samples
+    model = Pipeline([
+        ("scaler", StandardScaler()),
+        ("clf", RandomForestClassifier(n_estimators=10, random_state=42))
+    ])
+    model.fit(X, y)
+
+    path = str(tmp_path_factory.mktemp("model") / "rf")
+    mlflow.sklearn.save_model(model, path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def engine(model_dir):
+    return HeartDiseaseInference(model_uri=model_dir, backend="sklearn")
+
+
+def test_predict_batch_matches_predict_single(engine, samples):
+    X, _ = samples
+    records = X.head(20).to_dict(orient="records")
+
+    batch = engine.predict_batch(records)
+    single = [engine.predict_single(record) for record in records]
+
+    assert [r["prediction"] for r in batch] == [r["prediction"] for r in single]
+    assert np.allclose([r["confidence"] for r in batch], [r["confidence"] for r in single])
+
+
+def test_predict_batch_reports_row_errors(engine, samples):
+    X, _ = samples
+    good = X.iloc[0].to_dict()
+    missing = {k: v for k, v in good.items() if k != "chol"}
+    invalid = {**good, "age": "abc"}
+
+    results = engine.predict_batch([good, missing, invalid, good])
+
+    assert "prediction" in results[0]
+    assert results[1] == {"error": "Missing feature: chol"}
+    assert "error" in results[2]
+    assert results[3] == results[0]
+
+
+def test_fast_path_matches_dataframe_path(engine, samples):
+    X, _ = samples
+    assert engine.fast_path
+
+    for record in X.head(30).to_dict(orient="records"):
+        fast = engine.predict_single(record)
+        reference = engine._predict_single_frame(record)
+        assert fast["prediction"] == reference["prediction"]
+        assert fast["confidence"] == pytest.approx(reference["confidence"], abs=1e-12)
+
+
+@pytest.mark.parametrize("max_depth", [None, 3])
+def test_compiled_forest_matches_sklearn(samples, max_depth):
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.ensemble import RandomForestClassifier
+
+    X, y = samples
+    model = Pipeline([
+        ("scaler", StandardScaler()),
+        ("clf", RandomForestClassifier(n_estimators=25, max_depth=max_depth, random_state=0))
+    ])
+    model.fit(X, y)
+    compiled = compile_pipeline(model)
+
+    rng = np.random.default_rng(1)
+    X_new = rng.normal(size=(200, len(FEATURE_COLUMNS))) * 12 + 50
+    expected = model.predict_proba(pd.DataFrame(X_new, columns=FEATURE_COLUMNS))
+
+    np.testing.assert_allclose(compiled.predict_proba(X_new), expected, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(compiled.predict(X_new), model.predict(pd.DataFrame(X_new, columns=FEATURE_COLUMNS)))
+
+
+def test_float32_thresholds_keep_every_float32_comparison():
+    rng = np.random.default_rng(3)
+    thresholds = np.concatenate([rng.normal(size=1000) * 100, [0.0, -1.5, np.inf]])
+    rounded = float32_thresholds(thresholds)
+    assert rounded.dtype == np.float32
+
+    # Values right at and around each float32 neighbour of the threshold
+    x = thresholds.astype(np.float32)
+    for candidate in (x, np.nextafter(x, np.float32(np.inf)), np.nextafter(x, np.float32(-np.inf))):
+        np.testing.assert_array_equal(candidate <= rounded, candidate.astype(np.float64) <= thresholds)
+
+
+def test_compile_rejects_unsupported_models(samples):
+    from sklearn.linear_model import LogisticRegression
+
+    X, y = samples
+    with pytest.raises(TypeError):
+        compile_pipeline(LogisticRegression().fit(X, y))
+
+
+def test_compiled_backend_matches_sklearn_backend(engine, model_dir, samples):
+    X, _ = samples
+    compiled_engine = HeartDiseaseInference(model_uri=model_dir, backend="compiled")
+    assert compiled_engine.backend == "compiled"
+
+    records = X.head(25).to_dict(orient="records")
+    for got, expected in zip(compiled_engine.predict_batch(records), engine.predict_batch(records)):
+        assert got["prediction"] == expected["prediction"]
+        assert got["confidence"] == pytest.approx(expected["confidence"], abs=1e-12)
+
+
+def test_codes_outside_the_saved_encoding_are_rejected(tmp_path):
+    import mlflow.sklearn
+    from sklearn.ensemble import RandomForestClassifier
+    from config import config
+    from preprocessing import HeartDiseasePreprocessor
+
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame(rng.normal(size=(60, len(FEATURE_COLUMNS))) * 10 + 50, columns=FEATURE_COLUMNS)
+    for col in config.CATEGORICAL_COLUMNS:
+        X[col] = rng.integers(0, 3, size=len(X)).astype(float)
+    y = (X["age"] > 50).astype(int)
+    preprocessor = HeartDiseasePreprocessor(categories={col: [1.0, 2.0, 3.0] for col in config.CATEGORICAL_COLUMNS})
+    path = str(tmp_path / "rf")
+    mlflow.sklearn.save_model(RandomForestClassifier(n_estimators=5, random_state=0).fit(X, y), path,
+                              metadata=preprocessor.to_metadata())
+    engine = HeartDiseaseInference(model_uri=path, backend="sklearn")
+
+    good = X.iloc[0].to_dict()
+    bad = dict(good, cp=3.0)  # three levels: codes 0-2
+    fractional = dict(good, thal=1.5)
+
+    assert "prediction" in engine.predict_single(good)
+    assert engine.predict_single(bad) == {"error": "Unknown cp code 3: the model's encoding has codes 0-2"}
+    results = engine.predict_batch([good, bad, fractional])
+    assert "prediction" in results[0]
+    assert "cp" in results[1]["error"] and "thal" in results[2]["error"]
+    assert engine.check_codes(np.array([list(bad.values())]))[0] is not None
+
+
+def test_fast_path_is_warning_free_without_a_global_filter(engine, samples):
+    import warnings
+    X, _ = samples
+    assert not any("feature names" in str(f[1] and f[1].pattern) for f in warnings.filters)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        engine.predict_matrix(X.to_numpy(dtype=np.float64))
+        engine.predict_single(X.iloc[0].to_dict())
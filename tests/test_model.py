@@ -2,6 +2,7 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
 from train import train_models  # noqa: E402
+from model_utils import get_model_metrics, search_cv_accuracy  # noqa: E402
 
 
 def test_train_models():
@@ -13,3 +14,54 @@ def test_train_models():
 
     table = output["comparison_table"]
     assert "accuracy" in table.columns
+
+
+def _fitted_forest():
+    import numpy as np
+    from sklearn.ensemble import RandomForestClassifier
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(120, 4))
+    y = (X[:, 0] + rng.normal(scale=0.7, size=120) > 0).astype(int)
+    return RandomForestClassifier(n_estimators=20, random_state=0).fit(X[:80], y[:80]), X[80:], y[80:]
+
+
+def test_model_metrics_come_from_one_probability_pass():
+    from sklearn.metrics import accuracy_score, precision_score, recall_score, roc_auc_score
+    model, X_test, y_test = _fitted_forest()
+
+    class CountingModel:
+        classes_ = model.classes_
+        calls = []
+
+        def predict_proba(self, X):
+            self.calls.append("predict_proba")
+            return model.predict_proba(X)
+
+        def predict(self, X):
+            self.calls.append("predict")
+            return model.predict(X)
+
+    counting = CountingModel()
+    metrics = get_model_metrics(counting, X_test, y_test)
+
+    assert counting.calls == ["predict_proba"]
+    y_pred = model.predict(X_test)
+    assert metrics == {
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred),
+        "recall": recall_score(y_test, y_pred),
+        "roc_auc": roc_auc_score(y_test, model.predict_proba(X_test)[:, 1]),
+    }
+
+
+def test_search_cv_accuracy_reuses_grid_search_results():
+    import numpy as np
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import GridSearchCV
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(90, 3))
+    y = (X[:, 0] > 0).astype(int)
+    search = GridSearchCV(RandomForestClassifier(n_estimators=5, random_state=0),
+                          {"max_depth": [1, 3]}, cv=3, scoring="accuracy").fit(X, y)
+
+    assert search_cv_accuracy(search) == search.best_score_
@@ -0,0 +1,123 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import model_packaging  # noqa: E402
+from config import config  # noqa: E402
+from inference_pipeline import FEATURE_COLUMNS  # noqa: E402
+from model_compression import (  # noqa: E402
+    compress_forest, measure_serving_cost, serialized_size, truncate_forest, variant_params
+)
+from model_registry import ModelRegistry  # noqa: E402
+from preprocessing import HeartDiseasePreprocessor  # noqa: E402
+
+
+def _dataset(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, len(FEATURE_COLUMNS))), columns=FEATURE_COLUMNS)
+    y = pd.Series((X["age"] + X["chol"] + rng.normal(scale=0.7, size=n) > 0).astype(int), name="target")
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    X, y = _dataset()
+    model = Pipeline([
+        ("scaler", StandardScaler()),
+        ("clf", RandomForestClassifier(n_estimators=40, random_state=0)),
+    ]).fit(X[:200], y[:200])
+    return model, X, y
+
+
+def test_truncate_forest_keeps_a_prefix_of_the_trees(fitted):
+    model, X, _ = fitted
+    smaller = truncate_forest(model, 5)
+
+    assert len(smaller.named_steps["clf"].estimators_) == 5
+    assert len(model.named_steps["clf"].estimators_) == 40
+    scaled = model.named_steps["scaler"].transform(X).astype(np.float32)
+    expected = np.mean([tree.predict_proba(scaled) for tree in model.named_steps["clf"].estimators_[:5]], axis=0)
+    np.testing.assert_allclose(smaller.predict_proba(X), expected)
+    assert serialized_size(smaller) < serialized_size(model)
+
+
+def test_compression_stays_within_tolerance(fitted):
+    model, X, y = fitted
+    X_train, y_train, X_val, y_val = X[:200], y[:200], X[200:], y[200:]
+
+    strict, summary = compress_forest(model, X_train, y_train, X_val, y_val, tolerance=0.0,
+                                      tree_counts=[5, 20], max_depths=[3], ccp_alphas=[0.01])
+    assert summary["selected"]["roc_auc"] >= summary["baseline"]["roc_auc"]
+    assert summary["selected"]["bytes"] <= summary["baseline"]["bytes"] == serialized_size(model)
+    # 3 tree counts for the full model and each of the two refits
+    assert len(summary["candidates"]) == 9
+
+    loose, summary = compress_forest(model, X_train, y_train, X_val, y_val, tolerance=1.0,
+                                     tree_counts=[5, 20], max_depths=[3], ccp_alphas=[0.01])
+    assert summary["selected"] == min(summary["candidates"], key=lambda c: c["bytes"])
+    assert serialized_size(loose) < serialized_size(model)
+
+
+def test_variant_params_refit_reproduces_truncation(fitted):
+    from sklearn.base import clone
+    model, X, y = fitted
+    params = variant_params(model, {"pruning": "none", "n_trees": 10})
+    refit = clone(model).set_params(**params).fit(X[:200], y[:200])
+    np.testing.assert_array_equal(refit.predict_proba(X[200:]), truncate_forest(model, 10).predict_proba(X[200:]))
+
+    params = variant_params(model, {"pruning": "max_depth", "max_depth": 4, "n_trees": 10})
+    assert params == {"clf__n_estimators": 10, "clf__max_depth": 4}
+
+
+def test_compression_rejects_other_models():
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+
+    X, y = _dataset(60)
+    model = Pipeline([("clf", LogisticRegression())]).fit(X, y)
+    with pytest.raises(TypeError):
+        compress_forest(model, X, y, X, y)
+
+
+def test_serving_cost_report(fitted):
+    model, X, _ = fitted
+    cost = measure_serving_cost(model, X[200:], repeats=5)
+    assert cost["n_trees"] == 40
+    assert cost["artifact_bytes"] > 0
+    assert cost["load_seconds"] > 0
+    assert cost["single_row_ms"] > 0 and cost["batch_ms"] > 0 and cost["compiled_single_row_ms"] > 0
+
+
+def test_packaging_writes_compression_report(tmp_path, monkeypatch):
+    X, y = _dataset()
+    preprocessor = HeartDiseasePreprocessor(categories={col: [0.0] for col in config.CATEGORICAL_COLUMNS})
+    monkeypatch.setattr(model_packaging, "load_training_data", lambda: (X, y, preprocessor))
+    monkeypatch.setattr(config, "PRODUCTION_MODEL_DIR", str(tmp_path / "production_model"))
+    monkeypatch.setattr(config, "MODEL_REGISTRY_PATH", str(tmp_path / "registry.db"))
+    monkeypatch.setattr(config, "MODEL_COMPRESSION", True)
+    monkeypatch.setattr(config, "COMPRESSION_AUC_TOLERANCE", 1.0)
+    monkeypatch.setattr(config, "COMPRESSION_TREE_COUNTS", [5])
+    monkeypatch.setattr(config, "COMPRESSION_MAX_DEPTHS", [3])
+    monkeypatch.setattr(config, "COMPRESSION_CCP_ALPHAS", [])
+    monkeypatch.setattr(model_packaging, "measure_serving_cost",
+                        lambda model, X_sample: measure_serving_cost(model, X_sample, repeats=5))
+
+    model_packaging.save_final_model()
+
+    with open(tmp_path / "production_model" / model_packaging.COMPRESSION_REPORT) as f:
+        report = json.load(f)
+    assert report["before"]["n_trees"] == 100
+    assert report["after"]["n_trees"] == 5
+    assert report["after"]["artifact_bytes"] < report["before"]["artifact_bytes"]
+
+    production = ModelRegistry(str(tmp_path / "registry.db")).get("production")
+    assert production["artifact_bytes"] < report["before"]["artifact_bytes"]
+    # The variant was chosen on a validation split; the test split only reports on it
+    assert production["metrics"] == report["test_metrics"]
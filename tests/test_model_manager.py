@@ -0,0 +1,134 @@
+import time
+import pytest
+from unittest.mock import patch
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from model_manager import ModelManager, allowed_model_uri  # noqa: E402
+from model_registry import ModelRegistry, path_uri  # noqa: E402
+
+
+class FakeEngine:
+    """Stands in for HeartDiseaseInference; the URI doubles as the model version."""
+
+    def __init__(self, model_uri):
+        if model_uri == "broken":
+            self.confidence = 2.0  # fails warm-up validation
+        else:
+            self.confidence = 0.7
+        self.model_uri = model_uri
+        self.model_version = model_uri
+
+    def predict_single(self, record):
+        return {"prediction": 1, "confidence": self.confidence}
+
+    def predict_batch(self, records):
+        return [self.predict_single(r) for r in records]
+
+
+@pytest.fixture
+def manager():
+    with patch('model_manager.HeartDiseaseInference', FakeEngine), \
+            patch.dict(os.environ, {"MLFLOW_MODEL_URI": "v1"}):
+        manager = ModelManager(history_size=2)
+        manager.load()
+        yield manager
+        manager.stop_watching()
+
+
+def test_reload_swaps_and_keeps_history(manager):
+    in_flight = manager.engine
+
+    assert manager.reload("v2") is True
+    assert manager.engine.model_version == "v2"
+    assert in_flight.model_version == "v1"  # requests holding the old engine are unaffected
+    assert [e.model_version for e in manager.history] == ["v1"]
+
+
+def test_reload_same_version_is_noop(manager):
+    assert manager.reload("v1") is False
+    assert not manager.history
+
+
+def test_failed_validation_keeps_current_model(manager):
+    with pytest.raises(ValueError):
+        manager.reload("broken")
+    assert manager.engine.model_version == "v1"
+    assert manager.ready
+
+
+def test_rollback(manager):
+    manager.reload("v2")
+    manager.reload("v3")
+
+    assert manager.rollback().model_version == "v2"
+    assert manager.rollback().model_version == "v1"
+    with pytest.raises(LookupError):
+        manager.rollback()
+
+
+def test_watcher_reloads_after_directory_change(manager, tmp_path):
+    (tmp_path / "MLmodel").write_text("v1")
+    manager.start_watching(str(tmp_path), interval_seconds=0.05)
+    time.sleep(0.1)
+
+    watched = path_uri(str(tmp_path))
+    with patch.dict(os.environ, {"MLFLOW_MODEL_URI": "v2"}):
+        (tmp_path / "MLmodel").write_text("version two")
+        deadline = time.time() + 5
+        while manager.engine.model_version != watched and time.time() < deadline:
+            time.sleep(0.05)
+
+    # Loaded from the watched directory, not from MLFLOW_MODEL_URI
+    assert manager.engine.model_version == watched
+
+
+def test_sync_to_uses_history_before_reloading(manager):
+    manager.reload("v2")
+    assert manager.sync_to("v1", "v1") is True  # swapped back from history
+    assert [e.model_version for e in manager.history] == ["v2"]
+    assert manager.sync_to("v1", "v1") is False
+    assert manager.sync_to("v3", "v3") is True
+    assert manager.engine.model_version == "v3"
+
+
+def test_followers_switch_to_published_model(manager, tmp_path):
+    sync_file = str(tmp_path / "model.json")
+    with patch('model_manager.HeartDiseaseInference', FakeEngine), \
+            patch.dict(os.environ, {"MLFLOW_MODEL_URI": "v1"}):
+        follower = ModelManager(history_size=2)
+        follower.load()
+        follower.start_following(sync_file, interval_seconds=0.05)
+        try:
+            manager.reload("v2")
+            manager.publish(sync_file)
+            deadline = time.time() + 5
+            while follower.engine.model_version != "v2" and time.time() < deadline:
+                time.sleep(0.05)
+            assert follower.engine.model_version == "v2"
+
+            manager.rollback()
+            manager.publish(sync_file)
+            deadline = time.time() + 5
+            while follower.engine.model_version != "v1" and time.time() < deadline:
+                time.sleep(0.05)
+            assert follower.engine.model_version == "v1"
+        finally:
+            follower.stop_watching()
+
+
+def test_admin_reload_uri_must_be_alias_or_under_watch_path(tmp_path):
+    watched = tmp_path / "models"
+    (watched / "v2").mkdir(parents=True)
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    registry.register("production_model", str(watched / "v2"), aliases=["production"])
+
+    assert allowed_model_uri("production", str(watched), registry).endswith("/models/v2")
+    assert allowed_model_uri(str(watched / "v2"), str(watched), registry) == str(watched / "v2")
+    assert allowed_model_uri((watched / "v2").as_uri(), str(watched), registry) == (watched / "v2").as_uri()
+    for uri in ["/etc/model.pkl", str(watched / ".." / "elsewhere"), "s3://bucket/model", "staging"]:
+        with pytest.raises(ValueError):
+            allowed_model_uri(uri, str(watched), registry)
+    # Without a watched directory only aliases are accepted
+    with pytest.raises(ValueError):
+        allowed_model_uri(str(watched / "v2"), "", registry)
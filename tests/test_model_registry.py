@@ -0,0 +1,97 @@
+import sqlite3
+import sys
+import os
+import pytest
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import model_registry  # noqa: E402
+from model_registry import ModelRegistry, get_latest_model_uri, path_uri  # noqa: E402
+
+
+def _model_dir(tmp_path, name, size=10):
+    path = tmp_path / name
+    path.mkdir()
+    (path / "model.pkl").write_bytes(b"x" * size)
+    return path_uri(path)
+
+
+def test_register_aliases_and_latest(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "sub" / "registry.db"))
+    assert registry.get() is None
+    assert registry.versions() == []
+
+    first = registry.register("random_forest", _model_dir(tmp_path, "rf", size=25), {"accuracy": 0.9},
+                              run_id="r1", aliases=["candidate"])
+    second = registry.register("production_model", _model_dir(tmp_path, "prod"), aliases=["production"])
+    assert (first, second) == (1, 2)
+
+    candidate = registry.get("candidate")
+    assert candidate["name"] == "random_forest"
+    assert candidate["metrics"] == {"accuracy": 0.9}
+    assert candidate["run_id"] == "r1"
+    assert candidate["artifact_bytes"] == 25
+    assert candidate["aliases"] == ["candidate"]
+    assert registry.get()["version"] == second
+    assert registry.get("missing") is None
+
+    # Moving an alias leaves the old version in the history
+    registry.set_alias("candidate", second)
+    assert registry.get("candidate")["aliases"] == ["candidate", "production"]
+    assert [entry["version"] for entry in registry.versions()] == [second, first]
+    assert registry.versions()[1]["aliases"] == []
+
+
+def test_alias_validation(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    version = registry.register("m", _model_dir(tmp_path, "m"))
+    with pytest.raises(KeyError):
+        registry.set_alias("production", version + 1)
+    with pytest.raises(ValueError):
+        registry.set_alias("latest", version)
+
+
+def test_remote_uri_has_no_size(tmp_path):
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    registry.register("m", "s3://bucket/model", aliases=["candidate"])
+    assert registry.get("candidate")["artifact_bytes"] is None
+
+
+def test_resolution_uses_registry_without_scanning(tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    uri = _model_dir(tmp_path, "rf")
+    registry.register("random_forest", uri, aliases=["candidate"])
+
+    def no_scan():
+        raise AssertionError("directory scan should not run")
+
+    monkeypatch.setattr(model_registry, "scan_latest_model_uri", no_scan)
+    assert get_latest_model_uri("candidate", registry) == uri
+
+
+def test_resolution_falls_back_to_scan(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_registry, "scan_latest_model_uri", lambda: "file:///scanned")
+
+    # No registry file at all
+    assert get_latest_model_uri("candidate", ModelRegistry(str(tmp_path / "none.db"))) == "file:///scanned"
+
+    # Entry whose artifacts are gone, e.g. a database copied from another machine
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    registry.register("random_forest", path_uri(tmp_path / "deleted"), aliases=["candidate"])
+    assert get_latest_model_uri("candidate", registry) == "file:///scanned"
+
+    # Not a registry database
+    broken = tmp_path / "broken.db"
+    sqlite3.connect(broken).close()
+    assert get_latest_model_uri("candidate", ModelRegistry(str(broken))) == "file:///scanned"
+
+
+def test_file_uris_are_normalized(tmp_path):
+    path = tmp_path / "rf"
+    uri = _model_dir(tmp_path, "rf")
+    # Forms MLflow's file store produces for the same directory
+    for variant in (f"file:/{path}", f"file://{path}", f"file:///{path}"):
+        assert model_registry.local_path(variant) == str(path)
+
+    registry = ModelRegistry(str(tmp_path / "registry.db"))
+    registry.register("random_forest", f"file:/{path}", aliases=["candidate"])
+    assert registry.get("candidate")["uri"] == uri
+    assert registry.get("candidate")["artifact_bytes"] == 10
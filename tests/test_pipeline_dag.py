@@ -0,0 +1,85 @@
+import threading
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from pipeline_dag import Stage, StageFailedError, load_state, run_pipeline  # noqa: E402
+
+
+def test_unchanged_inputs_are_skipped_and_changes_propagate(tmp_path):
+    raw = tmp_path / "raw.txt"
+    clean = tmp_path / "clean.txt"
+    raw.write_text("a,b\n")
+    calls = []
+
+    def make_clean():
+        calls.append("clean")
+        clean.write_text(raw.read_text().upper())
+
+    def report():
+        calls.append("report")
+
+    stages = [
+        Stage("clean", make_clean, inputs=[str(raw)], outputs=[str(clean)]),
+        Stage("report", report, inputs=[str(clean)], deps=["clean"]),
+    ]
+    state_path = str(tmp_path / "state.json")
+    params = {"setting": 1}
+
+    first = run_pipeline(stages, state_path, params=params)
+    assert calls == ["clean", "report"]
+    assert first["clean"]["status"] == "ran"
+    assert load_state(state_path)["clean"]["seconds"] >= 0
+
+    second = run_pipeline(stages, state_path, params=params)
+    assert calls == ["clean", "report"]
+    assert {result["status"] for result in second.values()} == {"skipped"}
+
+    # Same content after re-cleaning: the dependent stage stays skipped
+    raw.write_text("A,B\n")
+    run_pipeline(stages, state_path, params=params)
+    assert calls == ["clean", "report", "clean"]
+
+    raw.write_text("c,d\n")
+    run_pipeline(stages, state_path, params=params)
+    assert calls[-2:] == ["clean", "report"]
+
+    run_pipeline(stages, state_path, params={"setting": 2})
+    assert calls[-2:] == ["clean", "report"]
+
+
+def test_independent_stages_run_in_parallel(tmp_path):
+    # Both stages must be inside the barrier at once, or it times out
+    barrier = threading.Barrier(2, timeout=10)
+    stages = [
+        Stage("left", barrier.wait),
+        Stage("right", barrier.wait),
+        Stage("join", lambda: None, deps=["left", "right"]),
+    ]
+    results = run_pipeline(stages, str(tmp_path / "state.json"), params={})
+    assert list(results)[-1] == "join"
+    assert all(result["status"] == "ran" for result in results.values())
+
+
+def test_failure_stops_dependents_and_keeps_finished_state(tmp_path):
+    calls = []
+
+    def broken():
+        raise ValueError("bad data")
+
+    stages = [
+        Stage("ok", lambda: calls.append("ok")),
+        Stage("broken", broken),
+        Stage("after", lambda: calls.append("after"), deps=["broken"]),
+    ]
+    state_path = str(tmp_path / "state.json")
+    with pytest.raises(StageFailedError, match="broken"):
+        run_pipeline(stages, state_path, params={})
+    assert "after" not in calls
+    assert set(load_state(state_path)) == {"ok"}
+
+
+def test_cycles_are_rejected(tmp_path):
+    stages = [Stage("a", lambda: None, deps=["b"]), Stage("b", lambda: None, deps=["a"])]
+    with pytest.raises(ValueError, match="cycle"):
+        run_pipeline(stages, str(tmp_path / "state.json"), params={})
@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+import prediction_cache  # noqa: E402
+from prediction_cache import PredictionCache  # noqa: E402
+
+PATIENT = {
+    "age": 50, "sex": 1, "cp": 0, "trestbps": 130,
+    "chol": 250, "fbs": 0, "restecg": 1,
+    "thalach": 160, "exang": 0, "oldpeak": 1.0,
+    "slope": 2, "ca": 0, "thal": 2
+}
+RESULT = {"prediction": 1, "confidence": 0.85}
+
+
+def test_hit_after_put_with_canonical_key():
+    cache = PredictionCache(max_size=10)
+    assert cache.get("v1", PATIENT) is None
+
+    cache.put("v1", PATIENT, RESULT)
+    # Same values, different key order and int/float/str representation
+    reordered = {k: str(float(v)) for k, v in reversed(list(PATIENT.items()))}
+    assert cache.get("v1", reordered) == RESULT
+
+
+def test_lru_eviction():
+    cache = PredictionCache(max_size=2)
+    patients = [{**PATIENT, "age": age} for age in (40, 50, 60)]
+
+    cache.put("v1", patients[0], RESULT)
+    cache.put("v1", patients[1], RESULT)
+    cache.get("v1", patients[0])  # refresh 40, so 50 is least recently used
+    cache.put("v1", patients[2], RESULT)
+
+    assert len(cache) == 2
+    assert cache.get("v1", patients[1]) is None
+    assert cache.get("v1", patients[0]) == RESULT
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(prediction_cache.time, "monotonic", lambda: now[0])
+
+    cache = PredictionCache(max_size=10, ttl_seconds=5)
+    cache.put("v1", PATIENT, RESULT)
+    now[0] += 4
+    assert cache.get("v1", PATIENT) == RESULT
+    now[0] += 2
+    assert cache.get("v1", PATIENT) is None
+
+
+def test_model_change_invalidates_entries():
+    cache = PredictionCache(max_size=10)
+    cache.put("v1", PATIENT, RESULT)
+
+    assert cache.get("v2", PATIENT) is None
+    assert len(cache) == 0
+    assert cache.get("v1", PATIENT) is None
+
+
+def test_error_results_are_not_cached():
+    cache = PredictionCache(max_size=10)
+    cache.put("v1", PATIENT, {"error": "boom"})
+    assert len(cache) == 0
@@ -0,0 +1,65 @@
+import socket
+import subprocess
+import sys
+import os
+import time
+import requests
+SRC = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(SRC)
+from serve import available_cpus  # noqa: E402
+
+
+def test_available_cpus_is_positive():
+    assert available_cpus() >= 1
+
+
+def test_metrics_aggregate_across_worker_processes(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path), "PYTHONPATH": SRC}
+    observe = "from metrics import BATCH_SIZE; BATCH_SIZE.labels(source='batch_endpoint').observe(8)"
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", observe], env=env, check=True)
+
+    scrape = ("from prometheus_client import generate_latest; from metrics import metrics_registry; "
+              "print(generate_latest(metrics_registry()).decode())")
+    output = subprocess.run([sys.executable, "-c", scrape], env=env, check=True,
+                            capture_output=True, text=True).stdout
+
+    assert 'api_batch_size_count{source="batch_endpoint"} 2.0' in output
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url):
+    try:
+        return requests.get(url, timeout=1)
+    except requests.ConnectionError:
+        return None
+
+
+def test_workers_stay_up_and_report_a_failed_model_load(tmp_path):
+    port = _free_port()
+    env = {**os.environ, "PYTHONPATH": SRC, "STARTUP_MODE": "background", "LOG_LEVEL": "WARNING",
+           "MLFLOW_MODEL_URI": f"file://{tmp_path}/missing_model",
+           "PROMETHEUS_MULTIPROC_DIR": str(tmp_path / "metrics"),
+           "MODEL_SYNC_FILE": str(tmp_path / "model.json"), "AUDIT_LOG_DIR": str(tmp_path / "audit")}
+    server = subprocess.Popen([sys.executable, os.path.join(SRC, "serve.py"), "--workers", "2",
+                               "--host", "127.0.0.1", "--port", str(port)], env=env)
+    try:
+        deadline = time.time() + 60
+        ready = None
+        while time.time() < deadline:
+            ready = _get(f"http://127.0.0.1:{port}/ready")
+            if ready is not None and ready.json()["status"] == "failed":
+                break
+            time.sleep(0.2)
+        assert ready is not None and ready.status_code == 503
+        assert ready.json()["status"] == "failed"
+        assert _get(f"http://127.0.0.1:{port}/healthz").status_code == 200
+        assert server.poll() is None
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
@@ -0,0 +1,30 @@
+import asyncio
+import sys
+import os
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from streaming import iter_lines  # noqa: E402
+
+
+def collect(chunks, max_line_bytes=64):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    async def run():
+        return [item async for item in iter_lines(source(), max_line_bytes)]
+
+    return asyncio.run(run())
+
+
+def test_lines_split_across_chunks():
+    assert collect([b'{"a"', b': 1}\n{"b": 2', b"}\n", b"tail"]) == [
+        (1, b'{"a": 1}'), (2, b'{"b": 2}'), (3, b"tail")
+    ]
+
+
+def test_overlong_line_is_reported_and_skipped():
+    result = collect([b"x" * 40, b"x" * 40, b"\nok\n"], max_line_bytes=64)
+    assert result == [(1, None), (2, b"ok")]
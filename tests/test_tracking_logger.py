@@ -0,0 +1,73 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from mlflow.exceptions import MlflowException  # noqa: E402
+from mlflow.protos.databricks_pb2 import INVALID_PARAMETER_VALUE  # noqa: E402
+from tracking_logger import RunLogger  # noqa: E402
+
+
+class StandInClient:
+    """Records log_batch calls; the first `failures` calls raise."""
+
+    def __init__(self, failures=0, error=ConnectionError("tracking server unavailable")):
+        self.failures = failures
+        self.error = error
+        self.batches = []
+        self.artifacts = []
+
+    def log_batch(self, run_id, metrics=(), params=(), tags=()):
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.batches.append((run_id, list(metrics), list(params), list(tags)))
+
+    def log_artifact(self, run_id, local_path, artifact_path=None):
+        self.artifacts.append((run_id, os.path.basename(local_path)))
+
+
+def test_buffers_until_run_end_against_file_store(tmp_path):
+    from mlflow.tracking import MlflowClient
+    client = MlflowClient((tmp_path / "mlruns").as_uri())
+    run_id = client.create_run(client.create_experiment("tracking-logger")).info.run_id
+    artifact = tmp_path / "plot.png"
+    artifact.write_bytes(b"png")
+
+    with RunLogger(run_id, client, asynchronous=True, flush_interval=3600) as tracker:
+        tracker.log_params({"model": "RandomForest", "n_estimators": 200})
+        tracker.log_metrics({"accuracy": 0.9, "recall": 0.8})
+        tracker.log_artifact(str(artifact))
+        # Nothing has been sent yet: the background flush is an hour away
+        assert client.get_run(run_id).data.params == {}
+
+    run = client.get_run(run_id)
+    assert run.data.params == {"model": "RandomForest", "n_estimators": "200"}
+    assert run.data.metrics == {"accuracy": 0.9, "recall": 0.8}
+    assert [a.path for a in client.list_artifacts(run_id)] == ["plot.png"]
+
+
+def test_transient_failures_are_retried():
+    client = StandInClient(failures=2)
+    with RunLogger("run-1", client, asynchronous=False, max_retries=3, retry_backoff=0) as tracker:
+        tracker.log_metrics({"accuracy": 0.9})
+    assert len(client.batches) == 1
+    assert client.batches[0][1][0].key == "accuracy"
+
+
+def test_permanent_failure_is_not_retried_and_surfaces_on_close():
+    client = StandInClient(failures=5, error=MlflowException("bad param", error_code=INVALID_PARAMETER_VALUE))
+    tracker = RunLogger("run-1", client, asynchronous=True, flush_interval=3600, max_retries=3, retry_backoff=0)
+    tracker.log_params({"max_depth": 6})
+    with pytest.raises(RuntimeError, match="1 MLflow logging request"):
+        tracker.close()
+    assert client.failures == 4
+
+
+def test_large_buffers_are_sent_in_batch_sized_chunks():
+    client = StandInClient()
+    with RunLogger("run-1", client, asynchronous=True, flush_interval=3600) as tracker:
+        tracker.log_params({f"p{i}": i for i in range(250)})
+        tracker.log_metrics({f"m{i}": i for i in range(1500)})
+    assert [len(params) for _, _, params, _ in client.batches] == [100, 100, 50]
+    assert sum(len(metrics) for _, metrics, _, _ in client.batches) == 1500
+    assert all(len(metrics) <= 1000 for _, metrics, _, _ in client.batches)
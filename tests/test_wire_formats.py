@@ -0,0 +1,51 @@
+import json
+import numpy as np
+import pytest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+from inference_pipeline import FEATURE_COLUMNS  # noqa: E402
+from wire_formats import (  # noqa: E402
+    COLUMNAR_JSON, FLOAT32_MATRIX, JSON, WireFormatError,
+    decode_columnar, decode_float32_matrix, encode, negotiate
+)
+
+
+def test_negotiate_honours_quality_and_wildcards():
+    assert negotiate(None) == JSON
+    assert negotiate("*/*") == JSON
+    assert negotiate(f"{JSON};q=0.5, {FLOAT32_MATRIX}") == FLOAT32_MATRIX
+    assert negotiate(f"text/html, {COLUMNAR_JSON};q=0.9") == COLUMNAR_JSON
+    assert negotiate("text/csv") is None
+
+
+def test_decode_columnar_reorders_columns_and_ignores_extras():
+    columns = ["target"] + list(reversed(FEATURE_COLUMNS))
+    row = [1] + list(range(len(FEATURE_COLUMNS)))[::-1]
+    X = decode_columnar(json.dumps({"columns": columns, "data": [row]}))
+
+    assert X.dtype == np.float64
+    assert X.tolist() == [list(map(float, range(len(FEATURE_COLUMNS))))]
+
+    with pytest.raises(WireFormatError, match="Missing columns: age"):
+        decode_columnar(json.dumps({"columns": FEATURE_COLUMNS[1:], "data": []}))
+
+
+def test_float32_round_trip():
+    rows = np.random.default_rng(0).normal(size=(3, len(FEATURE_COLUMNS))).astype("<f4")
+    assert np.array_equal(decode_float32_matrix(rows.tobytes()), rows.astype(np.float64))
+
+    with pytest.raises(WireFormatError):
+        decode_float32_matrix(rows.tobytes()[:-1])
+
+    body = encode(FLOAT32_MATRIX, np.array([1.0, np.nan]), np.array([0.25, np.nan]), [None, "bad"])
+    assert np.frombuffer(body, dtype="<f4").reshape(-1, 2)[0].tolist() == [1.0, 0.25]
+
+
+def test_columnar_response_adds_error_column_only_when_needed():
+    ok = json.loads(encode(COLUMNAR_JSON, np.array([0.0]), np.array([0.1]), [None]))
+    assert ok == {"columns": ["prediction", "confidence"], "data": [[0, 0.1]]}
+
+    mixed = json.loads(encode(COLUMNAR_JSON, np.array([1.0, np.nan]), np.array([0.9, np.nan]), [None, "bad"]))
+    assert mixed["columns"] == ["prediction", "confidence", "error"]
+    assert mixed["data"] == [[1, 0.9, None], [None, None, "bad"]]